@@ -1,18 +1,25 @@
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, Request
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.core.database import get_db
-from app.core.deps import get_current_user
+from app.core.cache import cached_json_response
+from app.core.deps import get_current_user, get_read_db
+from app.core.metrics import TimedRoute
 from app.models.user import User
 from app.schemas.discovery import DiscoveryOut
 from app.services import discovery_service
 
-router = APIRouter(prefix="/discovery", tags=["discovery"])
+router = APIRouter(prefix="/discovery", tags=["discovery"], route_class=TimedRoute)
 
 
 @router.get("/", response_model=DiscoveryOut)
 async def get_discovery(
-    db: AsyncSession = Depends(get_db),
+    request: Request,
+    db: AsyncSession = Depends(get_read_db),
     current_user: User = Depends(get_current_user),
 ):
-    return await discovery_service.compute_discovery(db, current_user.id)
+    return await cached_json_response(
+        request,
+        "discovery",
+        current_user.id,
+        lambda: discovery_service.compute_discovery(db, current_user.id),
+    )
@@ -0,0 +1,62 @@
+from collections.abc import AsyncIterator
+
+from fastapi import APIRouter, Depends, Header, HTTPException, Query, status
+from fastapi.responses import StreamingResponse
+
+from app.core.config import settings
+from app.core.deps import get_current_user
+from app.core.feed import FeedEvent, Subscription
+from app.core.metrics import TimedRoute
+from app.models.user import User
+from app.services import feed_service
+
+router = APIRouter(prefix="/feed", tags=["feed"], route_class=TimedRoute)
+
+_HEARTBEAT = b": ping\n\n"
+
+
+async def _event_stream(
+    subscription: Subscription, backlog: list[FeedEvent]
+) -> AsyncIterator[bytes]:
+    # Starlette cancels this generator when the client disconnects
+    try:
+        # Reconnect after 3s; EventSource resends the last id as Last-Event-ID
+        yield b"retry: 3000\n\n" + b"".join(event.frame() for event in backlog)
+        while True:
+            event = await subscription.next(settings.FEED_HEARTBEAT_SECONDS)
+            if event is not None:
+                yield event.frame()
+            elif subscription.closed:
+                return
+            else:
+                yield _HEARTBEAT
+    finally:
+        feed_service.change_feed.unsubscribe(subscription)
+
+
+@router.get("/")
+async def stream_changes(
+    cursor: str | None = Query(
+        default=None, description="Last event id seen, for clients that can't send Last-Event-ID"
+    ),
+    last_event_id: str | None = Header(default=None),
+    current_user: User = Depends(get_current_user),
+):
+    """
+    Server-Sent Events stream of the user's watchlist and platform changes.
+
+    A fresh connection starts with a ``ready`` event; one resuming from a
+    cursor first gets the events it missed, or ``resync`` if they are gone.
+    """
+    feed = feed_service.change_feed
+    if feed.connections(current_user.id) >= settings.FEED_MAX_CONNECTIONS_PER_USER:
+        raise HTTPException(
+            status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+            detail="Too many open feed connections",
+        )
+    subscription, backlog = feed.subscribe(current_user.id, last_event_id or cursor)
+    return StreamingResponse(
+        _event_stream(subscription, backlog),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
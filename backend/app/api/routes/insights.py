@@ -1,18 +1,31 @@
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, Request
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.core.database import get_db
-from app.core.deps import get_current_user
+from app.core.cache import stale_while_revalidate_response
+from app.core.deps import get_current_user, get_read_db
+from app.core.metrics import TimedRoute
 from app.models.user import User
 from app.schemas.insights import InsightsOut
-from app.services import insights_service
+from app.services import precompute_service
 
-router = APIRouter(prefix="/insights", tags=["insights"])
+router = APIRouter(prefix="/insights", tags=["insights"], route_class=TimedRoute)
 
 
 @router.get("/", response_model=InsightsOut)
 async def get_insights(
-    db: AsyncSession = Depends(get_db),
+    request: Request,
+    db: AsyncSession = Depends(get_read_db),
     current_user: User = Depends(get_current_user),
 ):
-    return await insights_service.compute_insights(db, current_user.id)
+    # Imported on first use: NumPy stays out of startup for workers that
+    # never serve insights.
+    from app.services import insights_service
+
+    precompute_service.track_reader(current_user.id)
+    return await stale_while_revalidate_response(
+        request,
+        "insights",
+        current_user.id,
+        lambda: insights_service.compute_insights(db, current_user.id),
+        precompute_service.request_insights_refresh,
+    )
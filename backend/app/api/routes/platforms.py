@@ -3,11 +3,12 @@ from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.core.database import get_db
 from app.core.deps import get_current_user
+from app.core.metrics import TimedRoute
 from app.models.user import User
 from app.schemas.platform import PlatformCreate, PlatformOut, PlatformUpdate
 from app.services import platform_service
 
-router = APIRouter(prefix="/platforms", tags=["platforms"])
+router = APIRouter(prefix="/platforms", tags=["platforms"], route_class=TimedRoute)
 
 
 @router.get("/", response_model=list[PlatformOut])
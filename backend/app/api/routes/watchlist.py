@@ -1,22 +1,186 @@
-from fastapi import APIRouter, Depends, HTTPException, Query, status
+from typing import Literal
+
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response, status
+from fastapi.responses import StreamingResponse
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.core.database import get_db
-from app.core.deps import get_current_user
+from app.core.config import settings
+from app.core.database import AsyncSessionLocal, get_db
+from app.core.deps import get_current_user, get_read_db
+from app.core.metrics import TimedRoute
+from app.core.responses import FastJSONResponse
 from app.models.user import User
-from app.schemas.watchlist import WatchlistItemCreate, WatchlistItemOut, WatchlistItemUpdate
-from app.services import watchlist_service
+from app.schemas.watchlist import (
+    ImportReport,
+    WatchlistBatchCreate,
+    WatchlistBatchDelete,
+    WatchlistBatchResult,
+    WatchlistBatchUpdate,
+    WatchlistChanges,
+    WatchlistItemCreate,
+    WatchlistItemOut,
+    WatchlistItemUpdate,
+)
+from app.services import import_service, sync_service, watchlist_service
 
-router = APIRouter(prefix="/watchlist", tags=["watchlist"])
+router = APIRouter(prefix="/watchlist", tags=["watchlist"], route_class=TimedRoute)
 
 
 @router.get("/", response_model=list[WatchlistItemOut])
 async def list_watchlist(
     status: str | None = Query(default=None),
+    limit: int | None = Query(default=None, ge=1, le=settings.WATCHLIST_PAGE_MAX),
+    cursor: str | None = Query(default=None),
+    fields: str | None = Query(default=None, description="Comma-separated columns"),
+    db: AsyncSession = Depends(get_read_db),
+    current_user: User = Depends(get_current_user),
+):
+    """
+    Newest first.  Pass ``limit`` to page; the next page's cursor comes back
+    in the ``X-Next-Cursor`` header.  ``fields`` returns only those columns
+    (plus ``id`` and ``added_at``).
+    """
+    try:
+        columns = watchlist_service.parse_fields(fields)
+        items, next_cursor = await watchlist_service.get_page(
+            db, current_user.id, status=status, limit=limit, cursor=cursor, fields=columns
+        )
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=str(exc))
+
+    headers = {"X-Next-Cursor": next_cursor} if next_cursor else {}
+    # Rows are selected by WatchlistItemOut's own columns (or a projection of
+    # them), so re-validating through response_model would only cost time.
+    return FastJSONResponse(items, headers=headers)
+
+
+@router.get("/search", response_model=list[WatchlistItemOut])
+async def search_watchlist(
+    q: str = Query(..., min_length=1, max_length=200),
+    status: str | None = Query(default=None),
+    platform: str | None = Query(default=None),
+    limit: int = Query(default=20, ge=1, le=settings.WATCHLIST_PAGE_MAX),
+    cursor: str | None = Query(default=None),
+    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+):
+    """
+    Search titles and notes.  Every word of ``q`` matches as a prefix
+    ("star wa" finds "Star Wars"); best matches come first.  Filter with
+    ``status`` and ``platform`` (case-insensitive); the next page's cursor
+    comes back in ``X-Next-Cursor``.
+    """
+    try:
+        items, next_cursor = await watchlist_service.search(
+            db,
+            current_user.id,
+            q,
+            status=status,
+            platform=platform,
+            limit=limit,
+            cursor=cursor,
+        )
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=str(exc))
+
+    headers = {"X-Next-Cursor": next_cursor} if next_cursor else {}
+    return FastJSONResponse(items, headers=headers)
+
+
+@router.get("/changes", response_model=WatchlistChanges)
+async def watchlist_changes(
+    since: str | None = Query(default=None, description="next_token from the previous sync"),
+    limit: int = Query(
+        default=settings.WATCHLIST_SYNC_PAGE_MAX, ge=1, le=settings.WATCHLIST_SYNC_PAGE_MAX
+    ),
+    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+):
+    """
+    Items created or updated and ids deleted since ``since``; without it, the
+    whole watchlist.  Repeat with ``next_token`` while ``has_more``, then keep
+    the last token for the next sync.  ``reset`` means the token was too old
+    and the pages that follow are a full snapshot.
+    """
+    try:
+        changes = await sync_service.changes(db, current_user.id, since, limit)
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=str(exc))
+    return FastJSONResponse(changes)
+
+
+_EXPORT_MEDIA_TYPES = {"ndjson": "application/x-ndjson", "csv": "text/csv"}
+
+
+@router.get("/export")
+async def export_watchlist(
+    fmt: Literal["ndjson", "csv"] = Query(default="ndjson", alias="format"),
+    current_user: User = Depends(get_current_user),
+):
+    user_id = current_user.id
+
+    # The request-scoped session is closed before a streaming body runs,
+    # so the stream opens its own.
+    async def body():
+        async with AsyncSessionLocal() as db:
+            async for chunk in watchlist_service.export_chunks(db, user_id, fmt):
+                yield chunk
+
+    return StreamingResponse(
+        body(),
+        media_type=_EXPORT_MEDIA_TYPES[fmt],
+        headers={"Content-Disposition": f'attachment; filename="watchlist.{fmt}"'},
+    )
+
+
+@router.post("/import", response_model=ImportReport, status_code=status.HTTP_201_CREATED)
+async def import_watchlist(
+    request: Request,
+    response: Response,
+    fmt: Literal["ndjson", "csv"] = Query(default="csv", alias="format"),
+    background: bool = Query(default=False),
     db: AsyncSession = Depends(get_db),
     current_user: User = Depends(get_current_user),
 ):
-    return await watchlist_service.get_all(db, current_user.id, status=status)
+    """
+    Import a raw CSV (with header) or NDJSON request body.  Rows already in
+    the watchlist (same title, case-insensitive, and type) are skipped.
+
+    With ``background=true`` the upload is spooled and a 202 comes back
+    straight away; poll ``GET /watchlist/import/{job_id}`` for progress.
+    Uploads over ``WATCHLIST_IMPORT_MAX_UPLOAD_BYTES`` get a 413 there.
+    """
+    if background and not settings.WATCHLIST_IMPORT_BACKGROUND:
+        raise HTTPException(
+            status_code=400,
+            detail="Background imports are off on this server; send it without background=true",
+        )
+    if background:
+        try:
+            upload = await import_service.spool(
+                request.stream(), settings.WATCHLIST_IMPORT_MAX_UPLOAD_BYTES
+            )
+        except import_service.UploadTooLarge as exc:
+            raise HTTPException(
+                status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE, detail=str(exc)
+            )
+        report = import_service.new_job(current_user.id, fmt)
+        import_service.start_background_import(current_user.id, upload, report)
+        response.status_code = status.HTTP_202_ACCEPTED
+        return report
+    report = import_service.new_job(current_user.id, fmt)
+    return await import_service.run_import(db, current_user.id, request.stream(), report)
+
+
+@router.get("/import/{job_id}", response_model=ImportReport)
+async def get_import_status(
+    job_id: str,
+    current_user: User = Depends(get_current_user),
+):
+    report = import_service.get_job(job_id, current_user.id)
+    if not report:
+        raise HTTPException(status_code=404, detail="Import not found")
+    return report
 
 
 @router.post("/", response_model=WatchlistItemOut, status_code=status.HTTP_201_CREATED)
@@ -28,6 +192,36 @@ async def add_to_watchlist(
     return await watchlist_service.create(db, data, current_user.id)
 
 
+# Batch routes must be registered before the /{item_id} routes they shadow
+
+
+@router.post("/batch", response_model=WatchlistBatchResult, status_code=status.HTTP_201_CREATED)
+async def batch_add_to_watchlist(
+    data: WatchlistBatchCreate,
+    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+):
+    return await watchlist_service.create_many(db, data.items, current_user.id)
+
+
+@router.patch("/batch", response_model=WatchlistBatchResult)
+async def batch_update_watchlist(
+    data: WatchlistBatchUpdate,
+    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+):
+    return await watchlist_service.update_many(db, data.items, current_user.id)
+
+
+@router.delete("/batch", response_model=WatchlistBatchResult)
+async def batch_remove_from_watchlist(
+    data: WatchlistBatchDelete,
+    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+):
+    return await watchlist_service.delete_many(db, data.ids, current_user.id)
+
+
 @router.patch("/{item_id}", response_model=WatchlistItemOut)
 async def update_watchlist_item(
     item_id: int,
@@ -38,7 +232,10 @@ async def update_watchlist_item(
     item = await watchlist_service.get_by_id(db, item_id)
     if not item or item.user_id != current_user.id:
         raise HTTPException(status_code=404, detail="Item not found")
-    return await watchlist_service.update(db, item, data)
+    item = await watchlist_service.update(db, item, data)
+    if item is None:
+        raise HTTPException(status_code=404, detail="Item not found")
+    return item
 
 
 @router.delete("/{item_id}", status_code=status.HTTP_204_NO_CONTENT)
@@ -50,4 +247,5 @@ async def remove_from_watchlist(
     item = await watchlist_service.get_by_id(db, item_id)
     if not item or item.user_id != current_user.id:
         raise HTTPException(status_code=404, detail="Item not found")
-    await watchlist_service.delete(db, item)
+    if not await watchlist_service.delete(db, item):
+        raise HTTPException(status_code=404, detail="Item not found")
@@ -0,0 +1,200 @@
+"""
+Maintenance commands.
+
+    python -m app.cli insights-batch
+    python -m app.cli rebuild-platform-stats [--user-id N]
+    python -m app.cli import-budget [--max-ms 2000]
+    python -m app.cli prune-tombstones [--days N]
+    python -m app.cli serve [--workers N] [--host H] [--port P]
+"""
+
+import argparse
+import asyncio
+import os
+import subprocess
+import sys
+import time
+from datetime import datetime, timedelta, timezone
+
+from app.core.config import settings
+from app.core.database import AsyncSessionLocal, engine, init_db
+
+
+async def _insights_batch(args: argparse.Namespace) -> None:
+    from app.services import insights_service
+
+    await init_db()
+    started = time.perf_counter()
+    async with AsyncSessionLocal() as db:
+        written = await insights_service.compute_all_insights(db)
+    print(f"Scored {written} platforms in {time.perf_counter() - started:.2f}s")
+
+
+async def _rebuild_platform_stats(args: argparse.Namespace) -> None:
+    from app.services import platform_stats_service
+
+    await init_db()
+    started = time.perf_counter()
+    async with AsyncSessionLocal() as db:
+        written = await platform_stats_service.rebuild(db, args.user_id)
+    print(f"Rebuilt {written} platform_stats rows in {time.perf_counter() - started:.2f}s")
+
+
+def _rebuild_platform_stats_args(parser: argparse.ArgumentParser) -> None:
+    parser.add_argument("--user-id", type=int, help="Only this user (default: everyone)")
+
+
+async def _prune_tombstones(args: argparse.Namespace) -> None:
+    from app.services import sync_service
+
+    await init_db()
+    before = datetime.now(timezone.utc) - timedelta(days=args.days)
+    async with AsyncSessionLocal() as db:
+        deleted = await sync_service.prune_tombstones(db, before)
+    print(f"Pruned {deleted} watchlist tombstones older than {args.days} days")
+
+
+def _prune_tombstones_args(parser: argparse.ArgumentParser) -> None:
+    parser.add_argument(
+        "--days", type=int, default=settings.WATCHLIST_TOMBSTONE_RETENTION_DAYS
+    )
+
+
+_SHARED_CACHE_BACKEND = "app.core.shared_cache:SQLiteCacheBackend"
+
+
+async def _prepare_schema() -> None:
+    await init_db()
+    await engine.dispose()  # the workers open their own connections
+
+
+def _serve(args: argparse.Namespace) -> None:
+    """
+    Set the schema up once, then run uvicorn with ``--workers`` processes.
+
+    Workers share nothing in memory, so with more than one the per-process
+    result cache would serve stale analytics; it is swapped for the shared
+    SQLite backend unless another backend was configured.  The change feed
+    and background import status can't be shared, so they are turned off:
+    a stream would miss other workers' writes and a job would be unknown to
+    every worker but its own.
+    """
+    import uvicorn
+
+    if args.workers > 1:
+        if settings.RESULT_CACHE_BACKEND == "memory":
+            os.environ["RESULT_CACHE_BACKEND"] = _SHARED_CACHE_BACKEND
+            os.environ.setdefault("AUTH_CACHE_SHARED", "true")
+            print(f"{args.workers} workers: result cache -> {_SHARED_CACHE_BACKEND}")
+        os.environ["FEED_ENABLED"] = "false"
+        os.environ["WATCHLIST_IMPORT_BACKGROUND"] = "false"
+        print(f"{args.workers} workers: /feed/ and background imports off")
+    asyncio.run(_prepare_schema())
+    uvicorn.run(
+        "app.main:app",
+        host=args.host,
+        port=args.port,
+        workers=args.workers,
+        access_log=args.access_log,
+        # Open change-feed streams would otherwise hold shutdown forever
+        timeout_graceful_shutdown=args.graceful_timeout,
+    )
+
+
+def _serve_args(parser: argparse.ArgumentParser) -> None:
+    parser.add_argument("--workers", type=int, default=1)
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8000)
+    parser.add_argument("--graceful-timeout", type=int, default=5)
+    parser.add_argument(
+        "--access-log", action=argparse.BooleanOptionalAction, default=True
+    )
+
+
+# Must not be loaded just by importing the app — see app.services.__getattr__
+LAZY_MODULES = ("numpy", "sklearn", "scipy")
+
+
+def measure_import(runs: int = 3) -> tuple[float, list[str]]:
+    """
+    Best wall time (ms) of a cold ``import app.main`` over ``runs`` fresh
+    interpreters, and which of ``LAZY_MODULES`` it loaded.
+    """
+    probe = (
+        "import sys, time\n"
+        "t = time.perf_counter()\n"
+        "import app.main\n"
+        "print((time.perf_counter() - t) * 1000)\n"
+        f"print(','.join(m for m in {LAZY_MODULES!r} if m in sys.modules))\n"
+    )
+    timings = []
+    for _ in range(runs):
+        out = subprocess.run(
+            [sys.executable, "-c", probe], capture_output=True, text=True, check=True
+        ).stdout.split("\n")
+        timings.append(float(out[0]))
+        loaded = [m for m in out[1].split(",") if m]
+    return min(timings), loaded
+
+
+def _import_budget(args: argparse.Namespace) -> None:
+    """Fail if a cold ``import app.main`` is too slow or drags in heavy modules."""
+    best, loaded = measure_import(args.runs)
+    print(f"import app.main: best {best:.0f} ms of {args.runs} (budget {args.max_ms} ms)")
+    if loaded:
+        sys.exit(f"Loaded at startup but should be lazy: {', '.join(loaded)}")
+    if best > args.max_ms:
+        sys.exit(f"Over budget by {best - args.max_ms:.0f} ms — see python -X importtime")
+
+
+def _import_budget_args(parser: argparse.ArgumentParser) -> None:
+    parser.add_argument("--max-ms", type=float, default=2000)
+    parser.add_argument("--runs", type=int, default=3)
+
+
+COMMANDS = {
+    "insights-batch": (
+        _insights_batch,
+        "Recompute platform_recommendations for every user",
+        None,
+    ),
+    "rebuild-platform-stats": (
+        _rebuild_platform_stats,
+        "Recompute the platform_stats summary table from the watchlist",
+        _rebuild_platform_stats_args,
+    ),
+    "prune-tombstones": (
+        _prune_tombstones,
+        "Forget watchlist deletions older than the delta-sync retention window",
+        _prune_tombstones_args,
+    ),
+    "serve": (
+        _serve,
+        "Run the API with N uvicorn worker processes",
+        _serve_args,
+    ),
+    "import-budget": (
+        _import_budget,
+        "Check app startup import time and that heavy modules stay lazy",
+        _import_budget_args,
+    ),
+}
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(prog="python -m app.cli")
+    sub = parser.add_subparsers(dest="command", required=True)
+    for name, (_, help_text, add_args) in COMMANDS.items():
+        command = sub.add_parser(name, help=help_text)
+        if add_args:
+            add_args(command)
+    args = parser.parse_args(argv)
+    handler = COMMANDS[args.command][0]
+    if asyncio.iscoroutinefunction(handler):
+        asyncio.run(handler(args))
+    else:
+        handler(args)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,254 @@
+import hashlib
+import importlib
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable
+
+from fastapi import Request, Response
+from pydantic import BaseModel
+
+from app.core.config import settings
+from app.core.metrics import serialization_timer
+
+
+class TTLCache:
+    """
+    Small in-process LRU cache with a per-entry expiry.
+
+    Not thread-safe — meant to be touched only from the event loop.
+    """
+
+    def __init__(self, max_entries: int):
+        self.max_entries = max_entries
+        self._data: OrderedDict[Any, tuple[Any, float]] = OrderedDict()
+
+    def get(self, key: Any) -> Any | None:
+        entry = self._data.get(key)
+        if entry is None:
+            return None
+        value, expires_at = entry
+        if expires_at <= time.monotonic():
+            del self._data[key]
+            return None
+        self._data.move_to_end(key)
+        return value
+
+    def set(self, key: Any, value: Any, ttl: float) -> None:
+        if ttl <= 0 or self.max_entries <= 0:
+            return
+        self._data[key] = (value, time.monotonic() + ttl)
+        self._data.move_to_end(key)
+        while len(self._data) > self.max_entries:
+            self._data.popitem(last=False)
+
+    def pop(self, key: Any) -> None:
+        self._data.pop(key, None)
+
+    def pop_where(self, predicate) -> None:
+        """Drop every entry whose value matches ``predicate``."""
+        for key in [k for k, (v, _) in self._data.items() if predicate(v)]:
+            del self._data[key]
+
+    def clear(self) -> None:
+        self._data.clear()
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+
+# ---------------------------------------------------------------------------
+# Result cache — serialized analytics responses keyed by (kind, user, version)
+# ---------------------------------------------------------------------------
+
+
+class CacheBackend:
+    """
+    Storage for cached response bodies and per-user data versions.
+
+    Versions must never be evicted: losing one would reset it and could
+    resurrect a body cached under an older write.
+    """
+
+    async def get(self, key: str) -> bytes | None:
+        raise NotImplementedError
+
+    async def set(self, key: str, value: bytes, ttl: float) -> None:
+        raise NotImplementedError
+
+    async def delete(self, key: str) -> None:
+        raise NotImplementedError
+
+    async def get_version(self, user_id: int) -> int:
+        raise NotImplementedError
+
+    async def bump_version(self, user_id: int) -> int:
+        raise NotImplementedError
+
+
+class MemoryCacheBackend(CacheBackend):
+    """Per-process backend — the default for a single worker."""
+
+    def __init__(self, max_entries: int):
+        self._entries = TTLCache(max_entries)
+        self._versions: dict[int, int] = {}
+
+    async def get(self, key: str) -> bytes | None:
+        return self._entries.get(key)
+
+    async def set(self, key: str, value: bytes, ttl: float) -> None:
+        self._entries.set(key, value, ttl)
+
+    async def delete(self, key: str) -> None:
+        self._entries.pop(key)
+
+    async def get_version(self, user_id: int) -> int:
+        return self._versions.get(user_id, 0)
+
+    async def bump_version(self, user_id: int) -> int:
+        self._versions[user_id] = self._versions.get(user_id, 0) + 1
+        return self._versions[user_id]
+
+
+def _load_backend(spec: str) -> CacheBackend:
+    """``"memory"`` or a ``"package.module:ClassName"`` import path."""
+    if spec == "memory":
+        return MemoryCacheBackend(settings.RESULT_CACHE_MAX_ENTRIES)
+    module_name, _, class_name = spec.partition(":")
+    backend_cls = getattr(importlib.import_module(module_name), class_name)
+    return backend_cls()
+
+
+result_cache: CacheBackend = _load_backend(settings.RESULT_CACHE_BACKEND)
+
+
+def set_result_cache_backend(backend: CacheBackend) -> None:
+    global result_cache
+    result_cache = backend
+
+
+_change_listeners: list[Callable[[int], None]] = []
+
+
+def on_data_change(listener: Callable[[int], None]) -> None:
+    """Register a callback run (synchronously) after every version bump."""
+    _change_listeners.append(listener)
+
+
+async def get_data_version(user_id: int) -> int:
+    return await result_cache.get_version(user_id)
+
+
+async def bump_data_version(user_id: int) -> None:
+    """Call after any committed write that can change a user's analytics."""
+    await result_cache.bump_version(user_id)
+    if settings.READ_DATABASE_URL:
+        await result_cache.set(f"primary-pin:{user_id}", b"1", settings.READ_REPLICA_PIN_SECONDS)
+    for listener in _change_listeners:
+        listener(user_id)
+
+
+async def pinned_to_primary(user_id: int) -> bool:
+    """True for READ_REPLICA_PIN_SECONDS after a write, so reads see it."""
+    return await result_cache.get(f"primary-pin:{user_id}") is not None
+
+
+def _etag_matches(request: Request, etag: str) -> bool:
+    header = request.headers.get("if-none-match")
+    if not header:
+        return False
+    candidates = {tag.strip().removeprefix("W/") for tag in header.split(",")}
+    return "*" in candidates or etag in candidates
+
+
+def _json_response(request: Request, body: bytes, headers: dict[str, str]) -> Response:
+    etag = '"' + hashlib.blake2b(body, digest_size=12).hexdigest() + '"'
+    headers = {"ETag": etag, "Cache-Control": "private, no-cache", **headers}
+    if _etag_matches(request, etag):
+        return Response(status_code=304, headers=headers)
+    return Response(content=body, media_type="application/json", headers=headers)
+
+
+async def cached_json_response(
+    request: Request,
+    kind: str,
+    user_id: int,
+    compute: Callable[[], Awaitable[BaseModel]],
+) -> Response:
+    """
+    Serve ``compute()`` from the result cache, with ETag / If-None-Match.
+
+    A cache hit does no database work at all; a matching If-None-Match on a
+    hit returns an empty 304.
+    """
+    version = await result_cache.get_version(user_id)
+    key = f"{kind}:{user_id}:{version}"
+
+    body = await result_cache.get(key)
+    if body is None:
+        result = await compute()
+        with serialization_timer():
+            body = result.model_dump_json().encode()
+        await result_cache.set(key, body, settings.RESULT_CACHE_TTL_SECONDS)
+    return _json_response(request, body, {})
+
+
+# ---------------------------------------------------------------------------
+# Stale-while-revalidate — the last result per user, whatever its version
+# ---------------------------------------------------------------------------
+
+_LATEST_TTL_SECONDS = 7 * 24 * 3600
+
+
+async def store_latest(kind: str, user_id: int, version: int, body: bytes) -> None:
+    """Keep ``body`` as the user's latest result, tagged with the data version it reflects."""
+    header = f"{version} {time.time()}\n".encode()
+    await result_cache.set(f"{kind}:{user_id}:latest", header + body, _LATEST_TTL_SECONDS)
+
+
+async def load_latest(kind: str, user_id: int) -> tuple[int, float, bytes] | None:
+    """Returns (version, stored_at epoch seconds, body) or None."""
+    entry = await result_cache.get(f"{kind}:{user_id}:latest")
+    if entry is None:
+        return None
+    header, _, body = entry.partition(b"\n")
+    version, stored_at = header.split()
+    return int(version), float(stored_at), body
+
+
+async def stale_while_revalidate_response(
+    request: Request,
+    kind: str,
+    user_id: int,
+    compute: Callable[[], Awaitable[BaseModel]],
+    refresh: Callable[[int], bool],
+) -> Response:
+    """
+    Serve the user's latest stored result immediately, even if it is stale.
+
+    Stale means computed before the current data version or older than
+    INSIGHTS_STALE_AFTER_SECONDS; ``refresh(user_id)`` is then asked to
+    recompute in the background.  With nothing stored yet, or when the
+    refresh is refused (scheduler stopped or its queue full), the request
+    computes inline instead — that is the backpressure.  ``Age`` and
+    ``X-Stale`` tell the client how fresh the body is.
+    """
+    version = await result_cache.get_version(user_id)
+    latest = await load_latest(kind, user_id)
+    stale = False
+    if latest is not None:
+        stored_version, stored_at, body = latest
+        age = time.time() - stored_at
+        stale = stored_version != version or age > settings.INSIGHTS_STALE_AFTER_SECONDS
+        if stale and not refresh(user_id):
+            latest = None
+
+    if latest is None:
+        result = await compute()
+        with serialization_timer():
+            body = result.model_dump_json().encode()
+        await store_latest(kind, user_id, version, body)
+        age, stale = 0.0, False
+
+    return _json_response(
+        request, body, {"Age": str(int(age)), "X-Stale": "true" if stale else "false"}
+    )
@@ -1,3 +1,5 @@
+from typing import Literal
+
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
 
@@ -8,6 +10,48 @@ class Settings(BaseSettings):
     API_V1_PREFIX: str = "/api/v1"
     PROJECT_NAME: str = "StreamTracker"
     CORS_ORIGINS: list[str] = ["http://localhost:8081", "http://localhost:3000"]
+    WATCHLIST_PAGE_MAX: int = 500
+    WATCHLIST_BATCH_MAX: int = 5000
+    WATCHLIST_IMPORT_BATCH_SIZE: int = 1000
+    WATCHLIST_IMPORT_MAX_ERRORS: int = 100
+    # Longer import records (e.g. a CSV quote left open) are reported and skipped
+    WATCHLIST_IMPORT_MAX_RECORD_CHARS: int = 65_536
+    # ?background=true imports; job status is per process, so off with several workers
+    WATCHLIST_IMPORT_BACKGROUND: bool = True
+    # Background uploads are spooled to a temp file first; larger ones get a 413
+    WATCHLIST_IMPORT_MAX_UPLOAD_BYTES: int = 100 * 1024 * 1024
+    # Delta sync: older tokens than the retained tombstones get a full snapshot
+    WATCHLIST_SYNC_PAGE_MAX: int = 2000
+    WATCHLIST_TOMBSTONE_RETENTION_DAYS: int = 30
+
+    # SQLite engine profile (file databases only).  One serialized writer
+    # connection plus DB_READ_POOL_SIZE query-only readers.
+    SQLITE_JOURNAL_MODE: str = "WAL"
+    SQLITE_SYNCHRONOUS: str = "NORMAL"
+    SQLITE_BUSY_TIMEOUT_MS: int = 5000
+    SQLITE_CACHE_SIZE_KIB: int = 65536
+    SQLITE_MMAP_SIZE: int = 268435456
+    DB_READ_POOL_SIZE: int = 8
+    # How long a request waits for a pooled connection (every backend)
+    DB_POOL_TIMEOUT_SECONDS: float = 30.0
+
+    # Server databases (PostgreSQL via postgresql+asyncpg://).  Each worker
+    # process holds its own pool, so the server sees up to
+    # workers * (DB_POOL_SIZE + DB_MAX_OVERFLOW) connections.
+    DB_POOL_SIZE: int = 10
+    DB_MAX_OVERFLOW: int = 10
+    DB_POOL_RECYCLE_SECONDS: int = 1800
+    DB_POOL_PRE_PING: bool = False
+    # Prepared statements cached per connection (0 for transaction-mode pgbouncer)
+    DB_STATEMENT_CACHE_SIZE: int = 256
+    # PostgreSQL's JIT costs more than it saves on these short aggregates
+    POSTGRES_JIT: bool = False
+
+    # Optional read replica for /insights, /discovery and GET /watchlist/.
+    # A user who wrote within PIN_SECONDS reads from the primary instead, so
+    # keep it above the replica's worst lag.
+    READ_DATABASE_URL: str | None = None
+    READ_REPLICA_PIN_SECONDS: float = 5.0
 
     # JWT
     SECRET_KEY: str = "dev-secret-change-in-production"
@@ -15,5 +59,51 @@ class Settings(BaseSettings):
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 30
     REFRESH_TOKEN_EXPIRE_DAYS: int = 7
 
+    # Authenticated-principal cache (0 TTL disables it)
+    AUTH_CACHE_TTL_SECONDS: int = 60
+    AUTH_CACHE_MAX_ENTRIES: int = 10_000
+
+    # Share cached principals through the result cache backend (multi-worker)
+    AUTH_CACHE_SHARED: bool = False
+
+    # Versioned cache for /insights and /discovery responses.
+    # Backend is "memory" or a "module:Class" import path; for several
+    # workers on one host, "app.core.shared_cache:SQLiteCacheBackend" keeps
+    # it in the SHARED_CACHE_PATH file.
+    RESULT_CACHE_BACKEND: str = "memory"
+    RESULT_CACHE_TTL_SECONDS: int = 300
+    RESULT_CACHE_MAX_ENTRIES: int = 10_000
+    SHARED_CACHE_PATH: str = "./streamtracker-cache.db"
+
+    # Background insights refresh: writes are debounced per user (at most
+    # MAX_DELAY after the first), results older than STALE_AFTER are served
+    # while a refresh runs.
+    INSIGHTS_REFRESH_DEBOUNCE_SECONDS: float = 2.0
+    INSIGHTS_REFRESH_MAX_DELAY_SECONDS: float = 10.0
+    INSIGHTS_REFRESH_CONCURRENCY: int = 2
+    INSIGHTS_REFRESH_MAX_PENDING: int = 1000
+    INSIGHTS_STALE_AFTER_SECONDS: int = 300
+
+    # Server-Sent Events change feed (GET /feed/).  BUFFER events may queue
+    # per connection before a slow client is told to resync; the last
+    # REPLAY_EVENTS per user are kept for resuming, for REPLAY_TTL after the
+    # user's last connection closes.  In-process only, so off with several workers.
+    FEED_ENABLED: bool = True
+    FEED_SUBSCRIBER_BUFFER: int = 256
+    FEED_REPLAY_EVENTS: int = 500
+    FEED_REPLAY_TTL_SECONDS: int = 300
+    FEED_MAX_USERS: int = 10_000
+    FEED_MAX_CONNECTIONS_PER_USER: int = 5
+    FEED_HEARTBEAT_SECONDS: float = 15.0
+
+    # Instrumentation: GET /metrics (Prometheus text) and Server-Timing headers.
+    # /metrics is unauthenticated: only enable it where the port is private.
+    METRICS_ENABLED: bool = False
+    SERVER_TIMING_ENABLED: bool = False
+
+    # Password hashing — bcrypt runs off the event loop in a bounded pool
+    PASSWORD_HASH_EXECUTOR: Literal["thread", "process"] = "thread"
+    PASSWORD_HASH_WORKERS: int = 4
+
 
 settings = Settings()
@@ -1,22 +1,300 @@
-from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
-from sqlalchemy.orm import DeclarativeBase
+import asyncio
+import os
+import tempfile
+from contextlib import asynccontextmanager
+
+try:
+    import fcntl
+except ImportError:  # Windows: single-worker only, nothing to coordinate
+    fcntl = None
+
+from sqlalchemy import Executable, RowMapping, event, func, select
+from sqlalchemy.engine import URL, make_url
+from sqlalchemy.ext.asyncio import (
+    AsyncEngine,
+    AsyncSession,
+    async_sessionmaker,
+    create_async_engine,
+)
+from sqlalchemy.orm import DeclarativeBase, Session
+from sqlalchemy.pool import AsyncAdaptedQueuePool
+from sqlalchemy.sql.dml import UpdateBase
 
 from app.core.config import settings
 
-engine = create_async_engine(settings.DATABASE_URL, echo=False)
-AsyncSessionLocal = async_sessionmaker(engine, expire_on_commit=False)
+
+def _is_file_sqlite(url: URL) -> bool:
+    return url.get_backend_name() == "sqlite" and url.database not in (None, "", ":memory:")
+
+
+def _is_postgres(url: URL) -> bool:
+    return url.get_backend_name() in ("postgres", "postgresql")
+
+
+def _async_url(url: URL) -> URL:
+    # Hosting providers hand out postgres:// URLs; the app needs the async driver
+    if _is_postgres(url) and "+" not in url.drivername:
+        return url.set(drivername="postgresql+asyncpg")
+    return url
+
+
+def _install_sqlite_pragmas(engine: AsyncEngine, read_only: bool) -> None:
+    @event.listens_for(engine.sync_engine, "connect")
+    def _on_connect(dbapi_connection, _record):
+        cursor = dbapi_connection.cursor()
+        cursor.execute(f"PRAGMA journal_mode={settings.SQLITE_JOURNAL_MODE}")
+        cursor.execute(f"PRAGMA synchronous={settings.SQLITE_SYNCHRONOUS}")
+        cursor.execute(f"PRAGMA busy_timeout={settings.SQLITE_BUSY_TIMEOUT_MS}")
+        cursor.execute(f"PRAGMA cache_size=-{settings.SQLITE_CACHE_SIZE_KIB}")
+        cursor.execute(f"PRAGMA mmap_size={settings.SQLITE_MMAP_SIZE}")
+        if read_only:
+            cursor.execute("PRAGMA query_only=ON")
+        cursor.close()
+
+
+def _create_server_engine(url: URL) -> AsyncEngine:
+    connect_args = {}
+    if url.get_driver_name() == "asyncpg":
+        connect_args = {
+            # Statements are prepared once per pooled connection, then reused
+            "prepared_statement_cache_size": settings.DB_STATEMENT_CACHE_SIZE,
+            "server_settings": {
+                "application_name": settings.PROJECT_NAME,
+                "jit": "on" if settings.POSTGRES_JIT else "off",
+            },
+        }
+    return create_async_engine(
+        url,
+        echo=False,
+        pool_size=settings.DB_POOL_SIZE,
+        max_overflow=settings.DB_MAX_OVERFLOW,
+        pool_timeout=settings.DB_POOL_TIMEOUT_SECONDS,
+        pool_recycle=settings.DB_POOL_RECYCLE_SECONDS,
+        pool_pre_ping=settings.DB_POOL_PRE_PING,
+        connect_args=connect_args,
+    )
+
+
+def _create_engines(database_url: str) -> tuple[AsyncEngine, AsyncEngine]:
+    """
+    Returns (writer, reader).
+
+    File-backed SQLite gets one serialized writer connection — SQLite only
+    admits one writer anyway, so queueing in the pool beats "database is
+    locked" — and a separate pool of query-only readers that WAL lets run
+    alongside it.  PostgreSQL gets one sized pool for both roles: the server
+    runs concurrent writers itself.  In-memory SQLite keeps the defaults.
+    """
+    url = _async_url(make_url(database_url))
+    if _is_postgres(url):
+        writer = _create_server_engine(url)
+        return writer, writer
+    if not _is_file_sqlite(url):
+        writer = create_async_engine(url, echo=False)
+        return writer, writer
+
+    # aiosqlite defaults to NullPool, which reopens the file on every checkout
+    writer = create_async_engine(
+        url,
+        echo=False,
+        poolclass=AsyncAdaptedQueuePool,
+        pool_size=1,
+        max_overflow=0,
+        pool_timeout=settings.DB_POOL_TIMEOUT_SECONDS,
+    )
+    _install_sqlite_pragmas(writer, read_only=False)
+    return writer, _create_sqlite_reader(url)
+
+
+def _create_sqlite_reader(url: URL) -> AsyncEngine:
+    reader = create_async_engine(
+        url,
+        echo=False,
+        poolclass=AsyncAdaptedQueuePool,
+        pool_size=settings.DB_READ_POOL_SIZE,
+        max_overflow=0,
+        pool_timeout=settings.DB_POOL_TIMEOUT_SECONDS,
+    )
+    _install_sqlite_pragmas(reader, read_only=True)
+    return reader
+
+
+def _create_replica_engine(database_url: str | None) -> AsyncEngine:
+    """The READ_DATABASE_URL engine, or the primary's reader when none is set."""
+    if not database_url:
+        return read_engine
+    url = _async_url(make_url(database_url))
+    if _is_postgres(url):
+        return _create_server_engine(url)
+    if _is_file_sqlite(url):
+        return _create_sqlite_reader(url)
+    raise ValueError(f"READ_DATABASE_URL must be PostgreSQL or a SQLite file, not {url}")
+
+
+engine, read_engine = _create_engines(settings.DATABASE_URL)
+# Pure-read routes (get_read_db) only; may lag the primary
+replica_engine = _create_replica_engine(settings.READ_DATABASE_URL)
+
+
+class RoutingSession(Session):
+    """
+    Sends SELECTs to the reader pool and flushes / DML to the writer.
+
+    Once a transaction has touched the writer, every later statement in it
+    stays there so the session reads its own uncommitted changes.
+    """
+
+    _uses_writer = False
+
+    @property
+    def reader(self) -> AsyncEngine:
+        return read_engine
+
+    def get_bind(self, mapper=None, clause=None, **kw):
+        if self._uses_writer or self._flushing or isinstance(clause, UpdateBase):
+            self._uses_writer = True
+            return engine.sync_engine
+        return self.reader.sync_engine
+
+
+class ReplicaSession(RoutingSession):
+    """
+    A RoutingSession whose SELECTs go to the read replica.
+
+    The replica may lag, so only routes that never write use it, and only
+    for users who have not written recently (see ``deps.get_read_db``).
+    """
+
+    @property
+    def reader(self) -> AsyncEngine:
+        return replica_engine
+
+
+@event.listens_for(RoutingSession, "after_transaction_end")
+def _release_writer(session: RoutingSession, transaction) -> None:
+    if transaction.parent is None:
+        session._uses_writer = False
+
+
+AsyncSessionLocal = async_sessionmaker(
+    sync_session_class=RoutingSession, expire_on_commit=False
+)
+ReplicaSessionLocal = async_sessionmaker(
+    sync_session_class=ReplicaSession, expire_on_commit=False
+)
 
 
 class Base(DeclarativeBase):
     pass
 
 
+def _schema_lock_path(url: URL) -> str:
+    if _is_file_sqlite(url):
+        return os.path.abspath(url.database) + ".init.lock"
+    return os.path.join(tempfile.gettempdir(), "streamtracker-init.lock")
+
+
+@asynccontextmanager
+async def _schema_lock():
+    """
+    Exclusive across processes on this host, so when several workers start
+    together one sets the schema up and the rest find it done.
+    """
+    if fcntl is None:
+        yield
+        return
+    with open(_schema_lock_path(engine.url), "a") as lock_file:
+        # Waiting for the lock must not stall the event loop
+        await asyncio.to_thread(fcntl.flock, lock_file, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+
+# pg_advisory_xact_lock key for schema setup ("STRK")
+_SCHEMA_LOCK_KEY = 0x5354524B
+
+
 async def init_db():
-    async with engine.begin() as conn:
-        from app.models import platform, user, watchlist  # noqa: F401 – registers models
+    async with _schema_lock(), engine.begin() as conn:
+        from app.core.migrations import run_migrations
+        from app.models import (  # noqa: F401 – registers models
+            platform,
+            platform_stats,
+            recommendation,
+            user,
+            watchlist,
+            watchlist_event,
+            watchlist_tombstone,
+        )
+        if _is_postgres(engine.url):
+            # Workers on other hosts share the database but not the lock file
+            await conn.execute(select(func.pg_advisory_xact_lock(_SCHEMA_LOCK_KEY)))
         await conn.run_sync(Base.metadata.create_all)
+        await conn.run_sync(run_migrations)
 
 
 async def get_db():
     async with AsyncSessionLocal() as session:
         yield session
+
+
+# Connections promised to fan-outs that are still running, per pool
+_fanout_reserved: dict[int, int] = {}
+
+
+def _reserve_fanout(reader: AsyncEngine, n: int) -> bool:
+    """
+    Claim ``n`` idle reader connections for one fan-out, or none at all.
+
+    A fan-out that waited on a busy pool could deadlock: each waiting
+    request already holds its own session's connection.  Checked and
+    claimed without an await in between, so concurrent fan-outs never
+    over-commit the pool between them.
+    """
+    pool = reader.pool
+    if not hasattr(pool, "checkedout"):
+        return False
+    reserved = _fanout_reserved.get(id(pool), 0)
+    overflow = pool._max_overflow
+    if overflow >= 0 and pool.size() + overflow - pool.checkedout() - reserved < n:
+        return False
+    _fanout_reserved[id(pool)] = reserved + n
+    return True
+
+
+def _release_fanout(reader: AsyncEngine, n: int) -> None:
+    _fanout_reserved[id(reader.pool)] -= n
+
+
+async def fetch_all_concurrently(
+    db: AsyncSession, *statements: Executable
+) -> list[list[RowMapping]]:
+    """
+    Run independent read-only SELECTs and return each one's rows as mappings.
+
+    When the backend can serve several readers at once and the pool has a
+    connection free for every statement, they run in parallel, each on its
+    own; otherwise they run one after another on ``db``.  Run in parallel,
+    each statement reads its own snapshot, so only pass statements whose
+    callers can tolerate results from slightly different moments.
+    """
+    reader = db.sync_session.reader
+    url = reader.url
+    in_memory = url.get_backend_name() == "sqlite" and not _is_file_sqlite(url)
+    if (
+        in_memory
+        or db.sync_session._uses_writer
+        or not _reserve_fanout(reader, len(statements))
+    ):
+        return [(await db.execute(stmt)).mappings().all() for stmt in statements]
+
+    async def _fetch(stmt: Executable) -> list[RowMapping]:
+        async with reader.connect() as conn:
+            return (await conn.execute(stmt)).mappings().all()
+
+    try:
+        return list(await asyncio.gather(*(_fetch(stmt) for stmt in statements)))
+    finally:
+        _release_fanout(reader, len(statements))
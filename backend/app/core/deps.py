@@ -1,10 +1,22 @@
+import time
+
 from fastapi import Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer
 from jose import JWTError
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.core.database import get_db
+from app.core import cache
+from app.core.cache import TTLCache
+from app.core.config import settings
+from app.core.database import (
+    ReplicaSessionLocal,
+    get_db,
+    read_engine,
+    replica_engine,
+)
 from app.core.security import decode_token
+from app.models.user import User
+from app.schemas.auth import UserOut
 
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/api/v1/auth/login")
 
@@ -14,6 +26,45 @@ _CREDENTIALS_EXCEPTION = HTTPException(
     headers={"WWW-Authenticate": "Bearer"},
 )
 
+# Decoded access tokens (token -> payload) and authenticated principals
+# (email -> User).  Both entries live no longer than AUTH_CACHE_TTL_SECONDS
+# and never past the token's own expiry.  With AUTH_CACHE_SHARED, principals
+# go to the result cache backend instead, so every worker sees the same
+# entries and an invalidation reaches all of them; tokens never change, so
+# their cache stays local.
+_token_cache = TTLCache(settings.AUTH_CACHE_MAX_ENTRIES)
+_principal_cache = TTLCache(settings.AUTH_CACHE_MAX_ENTRIES)
+
+
+def _cache_ttl(payload: dict) -> float:
+    remaining = payload.get("exp", 0) - time.time()
+    return min(settings.AUTH_CACHE_TTL_SECONDS, remaining)
+
+
+async def _cached_principal(email: str) -> User | None:
+    if not settings.AUTH_CACHE_SHARED:
+        return _principal_cache.get(email)
+    raw = await cache.result_cache.get(f"principal:{email}")
+    # Only the public columns are shared; the password hash stays in the database
+    return None if raw is None else User(**UserOut.model_validate_json(raw).model_dump())
+
+
+async def _cache_principal(email: str, user: User, ttl: float) -> None:
+    if not settings.AUTH_CACHE_SHARED:
+        _principal_cache.set(email, user, ttl)
+    elif ttl > 0:
+        body = UserOut.model_validate(user).model_dump_json().encode()
+        await cache.result_cache.set(f"principal:{email}", body, ttl)
+
+
+async def invalidate_principal(email: str) -> None:
+    """Forget a cached user and every memoized token issued to them."""
+    email = email.lower()
+    _principal_cache.pop(email)
+    _token_cache.pop_where(lambda payload: payload.get("sub") == email)
+    if settings.AUTH_CACHE_SHARED:
+        await cache.result_cache.delete(f"principal:{email}")
+
 
 async def get_current_user(
     token: str = Depends(oauth2_scheme),
@@ -21,10 +72,13 @@ async def get_current_user(
 ):
     from app.services import user_service  # avoid circular import
 
-    try:
-        payload = decode_token(token)
-    except JWTError:
-        raise _CREDENTIALS_EXCEPTION
+    payload = _token_cache.get(token)
+    if payload is None:
+        try:
+            payload = decode_token(token)
+        except JWTError:
+            raise _CREDENTIALS_EXCEPTION
+        _token_cache.set(token, payload, _cache_ttl(payload))
 
     if payload.get("type") != "access":
         raise _CREDENTIALS_EXCEPTION
@@ -33,8 +87,31 @@ async def get_current_user(
     if not email:
         raise _CREDENTIALS_EXCEPTION
 
-    user = await user_service.get_by_email(db, email)
-    if not user:
-        raise _CREDENTIALS_EXCEPTION
+    user = await _cached_principal(email)
+    if user is None:
+        user = await user_service.get_by_email(db, email)
+        # End the read so the request doesn't hold a pooled connection while
+        # the route runs (expire_on_commit is off, so ``user`` stays loaded)
+        await db.commit()
+        if not user:
+            raise _CREDENTIALS_EXCEPTION
+        await _cache_principal(email, user, _cache_ttl(payload))
 
     return user
+
+
+async def get_read_db(
+    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+):
+    """
+    Session for routes that never write: reads go to the READ_DATABASE_URL
+    replica, except for a user who wrote within READ_REPLICA_PIN_SECONDS,
+    who stays on the primary and so sees their own writes.  Without a
+    replica (or when pinned) this is the request's ``get_db`` session.
+    """
+    if replica_engine is read_engine or await cache.pinned_to_primary(current_user.id):
+        yield db
+        return
+    async with ReplicaSessionLocal() as session:
+        yield session
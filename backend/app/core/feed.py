@@ -0,0 +1,221 @@
+import asyncio
+import itertools
+import secrets
+from collections import deque
+from collections.abc import Hashable
+from dataclasses import dataclass
+
+from app.core.cache import TTLCache
+
+
+@dataclass(frozen=True, slots=True)
+class FeedEvent:
+    id: str
+    seq: int
+    name: str
+    data: bytes  # already-encoded JSON
+
+    def frame(self) -> bytes:
+        """The event as a Server-Sent Events frame."""
+        return b"id: %s\nevent: %s\ndata: %s\n\n" % (
+            self.id.encode(), self.name.encode(), self.data
+        )
+
+
+class _History:
+    """A key's most recent events, plus the newest seq no longer held."""
+
+    __slots__ = ("events", "floor")
+
+    def __init__(self, size: int, floor: int):
+        self.events: deque[FeedEvent] = deque(maxlen=size)
+        # Every event for this key with seq > floor is in ``events``
+        self.floor = floor
+
+    def append(self, event: FeedEvent) -> None:
+        if len(self.events) == self.events.maxlen:
+            self.floor = self.events[0].seq
+        self.events.append(event)
+
+
+class Subscription:
+    """
+    One connected client.  Events wait in a queue of at most ``limit``; a
+    client that falls further behind loses the backlog and gets a single
+    ``resync`` event in its place, then carries on with new events.
+    """
+
+    def __init__(self, feed: "ChangeFeed", key: Hashable, limit: int):
+        self.key = key
+        self._feed = feed
+        self._limit = limit
+        self._pending: deque[FeedEvent] = deque()
+        self._wakeup = asyncio.Event()
+        self.closed = False
+
+    def _push(self, event: FeedEvent) -> None:
+        if self.closed:
+            return
+        if len(self._pending) >= self._limit:
+            self._pending.clear()
+            self._pending.append(self._feed.resync_event("overflow"))
+            self._feed._stats["overflowed"] += 1
+        else:
+            self._pending.append(event)
+        self._wakeup.set()
+
+    def close(self) -> None:
+        self.closed = True
+        self._pending.clear()
+        self._wakeup.set()
+
+    async def next(self, timeout: float) -> FeedEvent | None:
+        """
+        The next event, or None after ``timeout`` idle seconds (send a
+        heartbeat) or once the subscription is closed (check ``closed``).
+        """
+        if not self._pending and not self.closed:
+            self._wakeup.clear()
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout)
+            except asyncio.TimeoutError:
+                self._feed._touch(self.key)
+        return self._pending.popleft() if self._pending else None
+
+
+class ChangeFeed:
+    """
+    In-process pub/sub of per-key change events, for server push.
+
+    Event ids are ``"<epoch>-<seq>"``: ``seq`` grows across all keys and
+    ``epoch`` is random per process, so an id from before a restart is
+    recognised as unknown rather than misread.  While a key has subscribers,
+    and for ``replay_ttl`` seconds after its last one leaves, its newest
+    ``replay_size`` events are kept so a client reconnecting with the last id
+    it saw is sent exactly what it missed; after that it gets ``resync``.
+    Keys nobody listens to cost one dict lookup per publish.
+
+    Not thread-safe, and not shared between worker processes.
+    """
+
+    def __init__(
+        self,
+        *,
+        subscriber_buffer: int,
+        replay_size: int,
+        replay_ttl: float,
+        max_keys: int,
+    ):
+        self._subscriber_buffer = subscriber_buffer
+        self._replay_size = replay_size
+        self._replay_ttl = replay_ttl
+        self._epoch = secrets.token_hex(4)
+        self._seq = itertools.count(1)
+        self._last_seq = 0
+        self._subscribers: dict[Hashable, set[Subscription]] = {}
+        self._histories = TTLCache(max_keys)
+        self._stats = {"published": 0, "delivered": 0, "overflowed": 0, "resumed": 0, "resynced": 0}
+
+    def stats(self) -> dict[str, int]:
+        return {
+            **self._stats,
+            "subscribers": sum(len(s) for s in self._subscribers.values()),
+            "keys": len(self._subscribers),
+        }
+
+    @property
+    def cursor(self) -> str:
+        """Id of the newest event published so far."""
+        return f"{self._epoch}-{self._last_seq}"
+
+    def wants(self, key: Hashable) -> bool:
+        """Whether an event for ``key`` would reach anyone, now or on resume."""
+        return key in self._subscribers or self._histories.get(key) is not None
+
+    def connections(self, key: Hashable) -> int:
+        return len(self._subscribers.get(key, ()))
+
+    def publish(self, key: Hashable, name: str, data: bytes) -> None:
+        history = self._histories.get(key)
+        subscribers = self._subscribers.get(key)
+        if history is None:
+            if not subscribers:
+                return
+            # Evicted while clients are connected: start over from here
+            history = _History(self._replay_size, self._last_seq)
+            self._histories.set(key, history, self._replay_ttl)
+        seq = next(self._seq)
+        self._last_seq = seq
+        event = FeedEvent(f"{self._epoch}-{seq}", seq, name, data)
+        history.append(event)
+        for subscription in subscribers or ():
+            subscription._push(event)
+        self._stats["published"] += 1
+        self._stats["delivered"] += len(subscribers or ())
+
+    def resync_event(self, reason: str) -> FeedEvent:
+        """
+        Tell a client to reload.  Its id is the current cursor, so once
+        reloaded the client is positioned after everything it just fetched.
+        """
+        self._stats["resynced"] += 1
+        return FeedEvent(
+            self.cursor, self._last_seq, "resync", b'{"reason":"%s"}' % reason.encode()
+        )
+
+    def subscribe(
+        self, key: Hashable, last_event_id: str | None = None
+    ) -> tuple[Subscription, list[FeedEvent]]:
+        """
+        Register a subscriber.  Also returns what to send before live events:
+        the missed events after ``last_event_id`` when they are all still
+        held, otherwise a single ``resync`` (or ``ready`` for a fresh client).
+        """
+        history = self._histories.get(key)
+        held = history is not None
+        if not held:
+            history = _History(self._replay_size, self._last_seq)
+        self._histories.set(key, history, self._replay_ttl)
+
+        if last_event_id is None:
+            backlog = [FeedEvent(self.cursor, self._last_seq, "ready", b"{}")]
+        else:
+            seq = self._parse_id(last_event_id)
+            # With no history held, events for this key were dropped unseen
+            # (and may not have advanced the seq): nothing says what was missed
+            if seq is None or not held or seq < history.floor:
+                backlog = [self.resync_event("cursor_expired")]
+            else:
+                backlog = [e for e in history.events if e.seq > seq]
+                self._stats["resumed"] += 1
+
+        subscription = Subscription(self, key, self._subscriber_buffer)
+        self._subscribers.setdefault(key, set()).add(subscription)
+        return subscription, backlog
+
+    def unsubscribe(self, subscription: Subscription) -> None:
+        subscribers = self._subscribers.get(subscription.key)
+        if subscribers is None:
+            return
+        subscribers.discard(subscription)
+        if not subscribers:
+            del self._subscribers[subscription.key]
+        self._touch(subscription.key)
+
+    def close_all(self) -> None:
+        """End every open subscription (shutdown)."""
+        for subscribers in self._subscribers.values():
+            for subscription in subscribers:
+                subscription.close()
+
+    def _touch(self, key: Hashable) -> None:
+        # Restart the replay TTL: it counts from the last sign of a listener
+        history = self._histories.get(key)
+        if history is not None:
+            self._histories.set(key, history, self._replay_ttl)
+
+    def _parse_id(self, event_id: str) -> int | None:
+        epoch, _, seq = event_id.partition("-")
+        if epoch != self._epoch or not seq.isdigit() or int(seq) > self._last_seq:
+            return None
+        return int(seq)
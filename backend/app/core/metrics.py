@@ -0,0 +1,243 @@
+"""
+Request timing and SQL instrumentation, exported in Prometheus text format.
+
+Per request (labelled by method and route template) we record latency, the
+number of SQL statements, time spent inside cursor execution and time spent
+serializing the response.  Counters live in a per-request object reached
+through a context variable; SQLAlchemy's greenlets and tasks started with
+``asyncio.gather`` inherit the context, so concurrent reads are counted too.
+
+No client library: the registry is a few dicts rendered on scrape.
+"""
+
+import time
+from bisect import bisect_left
+from collections.abc import Callable
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass
+
+from fastapi import FastAPI
+from fastapi.responses import PlainTextResponse
+from fastapi.routing import APIRoute
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from app.core.config import settings
+
+_LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+_COUNT_BUCKETS = (0, 1, 2, 3, 5, 10, 25, 50, 100)
+
+
+@dataclass
+class RequestStats:
+    sql_statements: int = 0
+    db_seconds: float = 0.0
+    serialize_seconds: float = 0.0
+
+
+_current: ContextVar[RequestStats | None] = ContextVar("request_stats", default=None)
+
+
+# ---------------------------------------------------------------------------
+# Registry
+# ---------------------------------------------------------------------------
+
+
+class Histogram:
+    def __init__(self, name: str, help_text: str, buckets: tuple[float, ...]):
+        self.name = name
+        self.help_text = help_text
+        self.buckets = buckets
+        # labels -> [per-bucket counts..., +Inf count], sum
+        self._series: dict[tuple[tuple[str, str], ...], tuple[list[int], list[float]]] = {}
+
+    def observe(self, labels: dict[str, str], value: float) -> None:
+        key = tuple(sorted(labels.items()))
+        series = self._series.get(key)
+        if series is None:
+            series = self._series[key] = ([0] * (len(self.buckets) + 1), [0.0])
+        series[0][bisect_left(self.buckets, value)] += 1
+        series[1][0] += value
+
+    def render(self) -> list[str]:
+        lines = [f"# HELP {self.name} {self.help_text}", f"# TYPE {self.name} histogram"]
+        for key, (counts, total) in sorted(self._series.items()):
+            base = ",".join(f'{k}="{v}"' for k, v in key)
+            running = 0
+            for bound, n in zip((*self.buckets, "+Inf"), counts):
+                running += n
+                lines.append(f'{self.name}_bucket{{{base},le="{bound}"}} {running}')
+            lines.append(f"{self.name}_sum{{{base}}} {total[0]}")
+            lines.append(f"{self.name}_count{{{base}}} {running}")
+        return lines
+
+
+request_duration = Histogram(
+    "http_request_duration_seconds", "Request latency by route.", _LATENCY_BUCKETS
+)
+request_sql_statements = Histogram(
+    "http_request_sql_statements", "SQL statements executed per request.", _COUNT_BUCKETS
+)
+request_db_time = Histogram(
+    "http_request_db_seconds", "Time inside SQL execution per request.", _LATENCY_BUCKETS
+)
+request_serialize_time = Histogram(
+    "http_request_serialize_seconds", "Response serialization time per request.", _LATENCY_BUCKETS
+)
+_HISTOGRAMS = (request_duration, request_sql_statements, request_db_time, request_serialize_time)
+
+# name -> (help, collector returning {label value: gauge value}, label name)
+_gauges: dict[str, tuple[str, Callable[[], dict[str, float]], str]] = {}
+
+
+def register_gauge(
+    name: str, help_text: str, collect: Callable[[], dict[str, float]], label: str
+) -> None:
+    """Gauges are read from ``collect()`` at scrape time."""
+    _gauges[name] = (help_text, collect, label)
+
+
+def render() -> str:
+    lines: list[str] = []
+    for histogram in _HISTOGRAMS:
+        lines.extend(histogram.render())
+    for name, (help_text, collect, label) in _gauges.items():
+        lines += [f"# HELP {name} {help_text}", f"# TYPE {name} gauge"]
+        lines += [f'{name}{{{label}="{k}"}} {v}' for k, v in collect().items()]
+    return "\n".join(lines) + "\n"
+
+
+# ---------------------------------------------------------------------------
+# Collection points
+# ---------------------------------------------------------------------------
+
+
+@contextmanager
+def serialization_timer():
+    """Charge the enclosed block to the current request's serialization time."""
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        stats = _current.get()
+        if stats is not None:
+            stats.serialize_seconds += time.perf_counter() - started
+
+
+def instrument_engine(engine: AsyncEngine) -> None:
+    sync_engine = engine.sync_engine
+
+    @event.listens_for(sync_engine, "before_cursor_execute")
+    def _before(conn, cursor, statement, parameters, context, executemany):
+        context._metrics_started = time.perf_counter()
+
+    @event.listens_for(sync_engine, "after_cursor_execute")
+    def _after(conn, cursor, statement, parameters, context, executemany):
+        stats = _current.get()
+        if stats is not None:
+            stats.sql_statements += 1
+            stats.db_seconds += time.perf_counter() - context._metrics_started
+
+
+class _TimedResponseField:
+    """A route's response_model field whose validate / serialize are timed."""
+
+    def __init__(self, field):
+        self._field = field
+
+    def __getattr__(self, name):
+        return getattr(self._field, name)
+
+    def validate(self, *args, **kwargs):
+        with serialization_timer():
+            return self._field.validate(*args, **kwargs)
+
+    def serialize(self, *args, **kwargs):
+        with serialization_timer():
+            return self._field.serialize(*args, **kwargs)
+
+
+class TimedRoute(APIRoute):
+    """
+    Route class that charges response_model validation and dumping to the
+    request's serialization time.  Set it as ``route_class`` on every
+    router; routes returning ``FastJSONResponse`` are timed in its render.
+    """
+
+    def get_route_handler(self):
+        field = self.secure_cloned_response_field
+        if field is None:
+            return super().get_route_handler()
+        # Only the handler gets the wrapper; OpenAPI keeps reading the field
+        self.secure_cloned_response_field = _TimedResponseField(field)
+        try:
+            return super().get_route_handler()
+        finally:
+            self.secure_cloned_response_field = field
+
+
+def _server_timing(stats: RequestStats, total: float) -> bytes:
+    return (
+        f'db;dur={stats.db_seconds * 1000:.2f};desc="{stats.sql_statements} queries", '
+        f"ser;dur={stats.serialize_seconds * 1000:.2f}, "
+        f"app;dur={total * 1000:.2f}"
+    ).encode()
+
+
+class MetricsMiddleware:
+    """
+    Pure ASGI middleware (no BaseHTTPMiddleware task hop).  Server-Timing can
+    only describe work done before the response headers go out, so for a
+    streamed body it covers the time to first byte.
+    """
+
+    def __init__(self, app, server_timing: bool = False):
+        self.app = app
+        self.server_timing = server_timing
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        stats = RequestStats()
+        token = _current.set(stats)
+        started = time.perf_counter()
+        status = 500
+
+        async def send_wrapper(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+                if self.server_timing:
+                    timing = _server_timing(stats, time.perf_counter() - started)
+                    message["headers"] = [*message.get("headers", []), (b"server-timing", timing)]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            _current.reset(token)
+            route = scope.get("route")
+            labels = {
+                "method": scope["method"],
+                "route": getattr(route, "path", "unmatched"),
+                "status": str(status),
+            }
+            request_duration.observe(labels, time.perf_counter() - started)
+            del labels["status"]
+            request_sql_statements.observe(labels, stats.sql_statements)
+            request_db_time.observe(labels, stats.db_seconds)
+            request_serialize_time.observe(labels, stats.serialize_seconds)
+
+
+def install(app: FastAPI, engines: list[AsyncEngine]) -> None:
+    """Wire the middleware, SQL events and ``GET /metrics`` into ``app``."""
+    for engine in {id(e): e for e in engines}.values():
+        instrument_engine(engine)
+    app.add_middleware(MetricsMiddleware, server_timing=settings.SERVER_TIMING_ENABLED)
+
+    @app.get("/metrics", include_in_schema=False)
+    async def metrics():
+        return PlainTextResponse(render(), media_type="text/plain; version=0.0.4")
@@ -0,0 +1,149 @@
+"""
+Forward-only schema migrations.
+
+``create_all`` only creates missing tables, so anything added to an existing
+table (columns, indexes, triggers) needs a step here.  Each step runs once,
+in order, inside ``init_db``'s transaction and is recorded in
+``schema_migrations``.  Steps must be idempotent because a fresh database
+already has everything ``create_all`` knows about.
+"""
+
+from collections.abc import Callable
+
+from sqlalchemy import Connection, inspect, text
+from sqlalchemy.schema import CreateIndex
+
+_MIGRATIONS: list[tuple[int, str, Callable[[Connection], None]]] = []
+
+
+def migration(version: int, description: str):
+    def register(fn: Callable[[Connection], None]):
+        _MIGRATIONS.append((version, description, fn))
+        return fn
+
+    return register
+
+
+def _create_indexes(conn: Connection, table, names: set[str] | None = None) -> None:
+    # IF NOT EXISTS rather than checkfirst: reflection can't see expression indexes
+    for index in table.indexes:
+        if names is None or index.name in names:
+            conn.execute(CreateIndex(index, if_not_exists=True))
+
+
+def _has_column(conn: Connection, table: str, name: str) -> bool:
+    return any(c["name"] == name for c in inspect(conn).get_columns(table))
+
+
+@migration(1, "watchlist composite and lower(platform_name) indexes")
+def _watchlist_query_indexes(conn: Connection) -> None:
+    from app.models.watchlist import WatchlistItem
+
+    # Only this step's indexes: later ones may cover columns not added yet
+    _create_indexes(
+        conn,
+        WatchlistItem.__table__,
+        {
+            "ix_watchlist_user_added",
+            "ix_watchlist_user_status_added",
+            "ix_watchlist_user_lower_platform",
+        },
+    )
+
+
+@migration(3, "watchlist_fts full-text index, sync triggers and backfill")
+def _watchlist_fts(conn: Connection) -> None:
+    from app.models.watchlist import WATCHLIST_FTS_DDL
+
+    if conn.dialect.name != "sqlite":
+        return  # search falls back to LIKE matching
+    for ddl in WATCHLIST_FTS_DDL:
+        conn.execute(text(ddl))
+    conn.execute(text("INSERT INTO watchlist_fts (watchlist_fts) VALUES ('rebuild')"))
+
+
+@migration(4, "watchlist.platform_id foreign key, backfill, and platform_stats rekeyed by it")
+def _watchlist_platform_id(conn: Connection) -> None:
+    from app.models.platform_stats import PlatformStats
+    from app.models.watchlist import WatchlistItem
+    from app.models.watchlist_event import WatchlistEvent
+    from app.services.platform_service import link_statements
+    from app.services.platform_stats_service import rebuild_statements
+
+    if not _has_column(conn, "watchlist", "platform_id"):
+        conn.execute(
+            text(
+                "ALTER TABLE watchlist ADD COLUMN platform_id INTEGER "
+                "REFERENCES platforms (id) ON DELETE SET NULL"
+            )
+        )
+    if not _has_column(conn, "watchlist_events", "platform_id"):
+        conn.execute(text("ALTER TABLE watchlist_events ADD COLUMN platform_id INTEGER"))
+    conn.execute(text("DROP INDEX IF EXISTS ix_watchlist_events_user_platform_time"))
+    _create_indexes(conn, WatchlistItem.__table__, {"ix_watchlist_user_platform_added"})
+    _create_indexes(conn, WatchlistEvent.__table__)
+
+    # Items whose name matches no platform stay NULL and keep platform_name
+    for stmt in link_statements():
+        conn.execute(stmt)
+
+    # A derived table with a new key and unique bucket indexes: cheaper to
+    # recreate than to alter
+    PlatformStats.__table__.drop(conn, checkfirst=True)
+    PlatformStats.__table__.create(conn)
+    for stmt in rebuild_statements():
+        conn.execute(stmt)
+
+
+@migration(5, "watchlist row versions, per-user version counter and tombstones for delta sync")
+def _watchlist_versions(conn: Connection) -> None:
+    from app.models.watchlist import WatchlistItem
+
+    for table, name in (
+        ("users", "watchlist_version"),
+        ("users", "watchlist_tombstone_floor"),
+        ("watchlist", "version"),
+    ):
+        if not _has_column(conn, table, name):
+            conn.execute(text(f"ALTER TABLE {table} ADD COLUMN {name} INTEGER NOT NULL DEFAULT 0"))
+    # Existing rows keep version 0, which a first sync (a snapshot) includes
+    _create_indexes(conn, WatchlistItem.__table__, {"ix_watchlist_user_version"})
+
+
+@migration(6, "platforms (user_id, lower(name)) index for linking items by name")
+def _platform_lower_name_index(conn: Connection) -> None:
+    from app.models.platform import Platform
+
+    _create_indexes(conn, Platform.__table__, {"ix_platforms_user_lower_name"})
+
+
+@migration(7, "watchlist_events (user_id, platform_id, status, item_id, occurred_at) index")
+def _watchlist_events_item_index(conn: Connection) -> None:
+    from app.models.watchlist_event import WatchlistEvent
+
+    _create_indexes(
+        conn, WatchlistEvent.__table__, {"ix_watchlist_events_user_platform_status_item"}
+    )
+
+
+def run_migrations(conn: Connection) -> list[int]:
+    """Apply pending steps on a sync connection; returns the versions applied."""
+    conn.execute(
+        text(
+            "CREATE TABLE IF NOT EXISTS schema_migrations ("
+            "version INTEGER PRIMARY KEY, description VARCHAR(200) NOT NULL)"
+        )
+    )
+    applied = set(conn.execute(text("SELECT version FROM schema_migrations")).scalars())
+
+    ran: list[int] = []
+    for version, description, fn in sorted(_MIGRATIONS, key=lambda m: m[0]):
+        if version in applied:
+            continue
+        fn(conn)
+        conn.execute(
+            text("INSERT INTO schema_migrations (version, description) VALUES (:v, :d)"),
+            {"v": version, "d": description},
+        )
+        ran.append(version)
+    return ran
@@ -0,0 +1,31 @@
+"""
+Fast JSON responses for trusted service output.
+
+When a route already holds plain rows straight from the database it can
+return ``FastJSONResponse`` instead of ORM objects: FastAPI skips
+response_model validation and serialization for any returned Response, so
+the payload is built once and encoded once by orjson.  Keep
+``response_model`` on the route — it still documents the shape in OpenAPI.
+
+Only use this for data whose shape the service guarantees (rows selected by
+the same columns the schema declares).  Anything built from client input
+should keep going through response_model.
+"""
+
+from typing import Any
+
+import orjson
+from fastapi.responses import JSONResponse
+
+from app.core.metrics import serialization_timer
+
+
+def dumps(content: Any) -> bytes:
+    # OPT_UTC_Z matches Pydantic's "Z" suffix for UTC datetimes
+    with serialization_timer():
+        return orjson.dumps(content, option=orjson.OPT_UTC_Z)
+
+
+class FastJSONResponse(JSONResponse):
+    def render(self, content: Any) -> bytes:
+        return dumps(content)
@@ -0,0 +1,136 @@
+import asyncio
+import logging
+import time
+from collections.abc import Awaitable, Callable, Hashable
+
+logger = logging.getLogger(__name__)
+
+
+class RefreshScheduler:
+    """
+    Debounced, coalescing background runner for per-key refresh jobs.
+
+    ``schedule(key)`` asks for ``job(key)`` to run soon.  Requests for the same
+    key coalesce: the run happens ``debounce`` seconds after the latest
+    request, but never later than ``max_delay`` after the first, and a key
+    never runs twice at once.  At most ``concurrency`` jobs run together and
+    at most ``max_pending`` keys wait; past that ``schedule`` refuses, and
+    callers either skip the refresh or do the work themselves.
+
+    Must be started and stopped from the event loop (see the app lifespan).
+    """
+
+    def __init__(
+        self,
+        job: Callable[[Hashable], Awaitable[None]],
+        *,
+        debounce: float,
+        max_delay: float,
+        concurrency: int,
+        max_pending: int,
+    ):
+        self._job = job
+        self._debounce = debounce
+        self._max_delay = max_delay
+        self._concurrency = concurrency
+        self._max_pending = max_pending
+
+        self._pending: dict[Hashable, tuple[float, float]] = {}  # key -> (first, due)
+        self._running: set[Hashable] = set()
+        self._jobs: set[asyncio.Task] = set()
+        self._dispatcher: asyncio.Task | None = None
+        self._wakeup: asyncio.Event | None = None
+        self._slots: asyncio.Semaphore | None = None
+        self._closing = False
+        self._stats = {"scheduled": 0, "coalesced": 0, "rejected": 0, "completed": 0, "failed": 0}
+
+    @property
+    def running(self) -> bool:
+        return self._dispatcher is not None and not self._closing
+
+    def stats(self) -> dict[str, int]:
+        return {**self._stats, "pending": len(self._pending), "running": len(self._running)}
+
+    def start(self) -> None:
+        if self._dispatcher is not None:
+            return
+        self._closing = False
+        self._wakeup = asyncio.Event()
+        self._slots = asyncio.Semaphore(self._concurrency)
+        self._dispatcher = asyncio.create_task(self._dispatch())
+
+    def schedule(self, key: Hashable) -> bool:
+        """Queue a refresh for ``key``; False if not running or the queue is full."""
+        if not self.running:
+            return False
+        now = time.monotonic()
+        entry = self._pending.get(key)
+        if entry is None:
+            if len(self._pending) >= self._max_pending:
+                self._stats["rejected"] += 1
+                return False
+            first = now
+            self._stats["scheduled"] += 1
+        else:
+            first = entry[0]
+            self._stats["coalesced"] += 1
+        self._pending[key] = (first, min(now + self._debounce, first + self._max_delay))
+        self._wakeup.set()
+        return True
+
+    async def stop(self, timeout: float = 10.0) -> None:
+        """
+        Stop taking work, drop what is still waiting, and give running jobs up
+        to ``timeout`` seconds to finish before cancelling them.
+        """
+        if self._dispatcher is None:
+            return
+        self._closing = True
+        self._dispatcher.cancel()
+        await asyncio.gather(self._dispatcher, return_exceptions=True)
+        self._pending.clear()
+        if self._jobs:
+            _, unfinished = await asyncio.wait(set(self._jobs), timeout=timeout)
+            for task in unfinished:
+                task.cancel()
+            await asyncio.gather(*unfinished, return_exceptions=True)
+        self._dispatcher = None
+
+    async def _dispatch(self) -> None:
+        while True:
+            self._wakeup.clear()
+            now = time.monotonic()
+            ready = [
+                key
+                for key, (_, due) in self._pending.items()
+                if due <= now and key not in self._running
+            ]
+            for key in ready:
+                # Waiting for a slot here is the backpressure on the queue
+                await self._slots.acquire()
+                if self._pending.pop(key, None) is None:
+                    self._slots.release()
+                    continue
+                self._running.add(key)
+                task = asyncio.create_task(self._run(key))
+                self._jobs.add(task)
+                task.add_done_callback(self._jobs.discard)
+
+            waiting = [due for key, (_, due) in self._pending.items() if key not in self._running]
+            timeout = max(0.0, min(waiting) - time.monotonic()) if waiting else None
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout)
+            except asyncio.TimeoutError:
+                pass
+
+    async def _run(self, key: Hashable) -> None:
+        try:
+            await self._job(key)
+            self._stats["completed"] += 1
+        except Exception:
+            self._stats["failed"] += 1
+            logger.exception("Background refresh failed for %r", key)
+        finally:
+            self._running.discard(key)
+            self._slots.release()
+            self._wakeup.set()
@@ -1,3 +1,5 @@
+import asyncio
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
 from datetime import datetime, timedelta, timezone
 
 from jose import JWTError, jwt
@@ -16,6 +18,73 @@ def verify_password(plain: str, hashed: str) -> bool:
     return pwd_context.verify(plain, hashed)
 
 
+# ---------------------------------------------------------------------------
+# Async hashing — bcrypt takes ~250 ms of CPU, so it must never run on the
+# event loop.  Calls are capped at PASSWORD_HASH_WORKERS in flight; anything
+# beyond that waits on the semaphore and is counted as queued.
+# ---------------------------------------------------------------------------
+
+_hash_executor: Executor | None = None
+_hash_slots: asyncio.Semaphore | None = None
+_hash_stats = {"queued": 0, "running": 0, "completed": 0, "max_queued": 0}
+
+
+def _get_hash_executor() -> Executor:
+    global _hash_executor
+    if _hash_executor is None:
+        workers = max(1, settings.PASSWORD_HASH_WORKERS)
+        if settings.PASSWORD_HASH_EXECUTOR == "process":
+            _hash_executor = ProcessPoolExecutor(max_workers=workers)
+        else:
+            _hash_executor = ThreadPoolExecutor(
+                max_workers=workers, thread_name_prefix="pwhash"
+            )
+    return _hash_executor
+
+
+async def _run_hash_job(fn, *args):
+    global _hash_slots
+    if _hash_slots is None:
+        _hash_slots = asyncio.Semaphore(max(1, settings.PASSWORD_HASH_WORKERS))
+
+    _hash_stats["queued"] += 1
+    _hash_stats["max_queued"] = max(_hash_stats["max_queued"], _hash_stats["queued"])
+    try:
+        await _hash_slots.acquire()
+    finally:
+        _hash_stats["queued"] -= 1
+
+    _hash_stats["running"] += 1
+    try:
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(_get_hash_executor(), fn, *args)
+    finally:
+        _hash_stats["running"] -= 1
+        _hash_stats["completed"] += 1
+        _hash_slots.release()
+
+
+async def hash_password_async(password: str) -> str:
+    return await _run_hash_job(hash_password, password)
+
+
+async def verify_password_async(plain: str, hashed: str) -> bool:
+    return await _run_hash_job(verify_password, plain, hashed)
+
+
+def password_hash_stats() -> dict[str, int]:
+    """Snapshot of the hashing pool: queued / running / completed / max_queued."""
+    return dict(_hash_stats)
+
+
+def shutdown_password_hasher() -> None:
+    global _hash_executor, _hash_slots
+    if _hash_executor is not None:
+        _hash_executor.shutdown(wait=True)
+    _hash_executor = None
+    _hash_slots = None
+
+
 def create_access_token(subject: str) -> str:
     expire = datetime.now(timezone.utc) + timedelta(
         minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES
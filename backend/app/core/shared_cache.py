@@ -0,0 +1,115 @@
+"""
+Cross-process result cache in a local SQLite file.
+
+For running several workers on one host without an external cache server:
+
+    RESULT_CACHE_BACKEND=app.core.shared_cache:SQLiteCacheBackend
+
+Every worker opens the same SHARED_CACHE_PATH.  WAL mode lets reads run
+alongside a writer, and versions live in the same file as the bodies they
+key, so a crash can never leave a body newer than its version.  Statements
+run on one dedicated thread: a writer in another worker can hold the file
+for up to SQLITE_BUSY_TIMEOUT_MS, and that wait must not stall the event
+loop.
+"""
+
+import asyncio
+import sqlite3
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from app.core.cache import CacheBackend
+from app.core.config import settings
+
+_SCHEMA = (
+    "CREATE TABLE IF NOT EXISTS cache_entries ("
+    "key TEXT PRIMARY KEY, value BLOB NOT NULL, expires_at REAL NOT NULL) WITHOUT ROWID",
+    "CREATE INDEX IF NOT EXISTS ix_cache_entries_expires ON cache_entries (expires_at)",
+    "CREATE TABLE IF NOT EXISTS cache_versions ("
+    "user_id INTEGER PRIMARY KEY, version INTEGER NOT NULL)",
+)
+
+# Expired entries are swept, and the size cap enforced, every this many sets
+_SWEEP_EVERY = 512
+
+
+class SQLiteCacheBackend(CacheBackend):
+    def __init__(self, path: str | None = None, max_entries: int | None = None):
+        self._max_entries = max_entries or settings.RESULT_CACHE_MAX_ENTRIES
+        # Autocommit: every statement is its own short transaction.  Only
+        # the executor's thread uses the connection after this.
+        self._conn = sqlite3.connect(
+            path or settings.SHARED_CACHE_PATH,
+            isolation_level=None,
+            timeout=settings.SQLITE_BUSY_TIMEOUT_MS / 1000,
+            check_same_thread=False,
+        )
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        for ddl in _SCHEMA:
+            self._conn.execute(ddl)
+        self._sets = 0
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="shared-cache")
+
+    async def _run(self, fn, *args):
+        return await asyncio.get_running_loop().run_in_executor(self._executor, fn, *args)
+
+    async def get(self, key: str) -> bytes | None:
+        return await self._run(self._get, key, time.time())
+
+    async def set(self, key: str, value: bytes, ttl: float) -> None:
+        if ttl <= 0:
+            return
+        self._sets += 1
+        await self._run(self._set, key, value, time.time(), ttl, self._sets % _SWEEP_EVERY == 0)
+
+    async def delete(self, key: str) -> None:
+        await self._run(self._conn.execute, "DELETE FROM cache_entries WHERE key = ?", (key,))
+
+    async def get_version(self, user_id: int) -> int:
+        return await self._run(self._get_version, user_id)
+
+    async def bump_version(self, user_id: int) -> int:
+        return await self._run(self._bump_version, user_id)
+
+    # Run on the executor's thread
+
+    def _get(self, key: str, now: float) -> bytes | None:
+        row = self._conn.execute(
+            "SELECT value FROM cache_entries WHERE key = ? AND expires_at > ?", (key, now)
+        ).fetchone()
+        return row[0] if row else None
+
+    def _set(self, key: str, value: bytes, now: float, ttl: float, sweep: bool) -> None:
+        self._conn.execute(
+            "INSERT OR REPLACE INTO cache_entries (key, value, expires_at) VALUES (?, ?, ?)",
+            (key, value, now + ttl),
+        )
+        if sweep:
+            self._sweep(now)
+
+    def _get_version(self, user_id: int) -> int:
+        row = self._conn.execute(
+            "SELECT version FROM cache_versions WHERE user_id = ?", (user_id,)
+        ).fetchone()
+        return row[0] if row else 0
+
+    def _bump_version(self, user_id: int) -> int:
+        # fetchall: the statement (and its write lock) ends only once drained
+        (version,), = self._conn.execute(
+            "INSERT INTO cache_versions (user_id, version) VALUES (?, 1) "
+            "ON CONFLICT (user_id) DO UPDATE SET version = version + 1 "
+            "RETURNING version",
+            (user_id,),
+        ).fetchall()
+        return version
+
+    def _sweep(self, now: float) -> None:
+        self._conn.execute("DELETE FROM cache_entries WHERE expires_at <= ?", (now,))
+        # Over the cap: drop whatever expires soonest
+        self._conn.execute(
+            "DELETE FROM cache_entries WHERE key IN ("
+            "SELECT key FROM cache_entries ORDER BY expires_at "
+            "LIMIT max(0, (SELECT count(*) FROM cache_entries) - ?))",
+            (self._max_entries,),
+        )
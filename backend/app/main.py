@@ -3,15 +3,23 @@ from contextlib import asynccontextmanager
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 
+from app.core import metrics
 from app.core.config import settings
-from app.core.database import init_db
-from app.api.routes import auth, discovery, insights, platforms, watchlist
+from app.core.database import engine, init_db, read_engine, replica_engine
+from app.core.security import password_hash_stats, shutdown_password_hasher
+from app.services import feed_service, import_service, precompute_service
+from app.api.routes import auth, discovery, feed, insights, platforms, watchlist
 
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     await init_db()
+    precompute_service.start()
     yield
+    feed_service.stop()
+    await import_service.stop()
+    await precompute_service.stop()
+    shutdown_password_hasher()
 
 
 app = FastAPI(
@@ -26,13 +34,47 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["ETag", "Age", "X-Stale", "X-Next-Cursor"],
 )
 
+if settings.METRICS_ENABLED:
+    pools = {"writer": engine, "reader": read_engine}
+    if replica_engine is not read_engine:
+        pools["replica"] = replica_engine
+    metrics.install(app, list(pools.values()))
+    metrics.register_gauge(
+        "db_pool_checked_out",
+        "Connections currently checked out, by pool.",
+        lambda: {
+            name: e.pool.checkedout()
+            for name, e in pools.items()
+            if hasattr(e.pool, "checkedout")  # StaticPool (in-memory SQLite) doesn't count
+        },
+        "pool",
+    )
+    metrics.register_gauge(
+        "password_hash_pool", "bcrypt pool queue state.", password_hash_stats, "state"
+    )
+    metrics.register_gauge(
+        "insights_refresh",
+        "Background insights scheduler state.",
+        precompute_service.insights_scheduler.stats,
+        "state",
+    )
+    metrics.register_gauge(
+        "change_feed",
+        "Server-Sent Events change feed state.",
+        feed_service.change_feed.stats,
+        "state",
+    )
+
 app.include_router(auth.router, prefix=settings.API_V1_PREFIX)
 app.include_router(platforms.router, prefix=settings.API_V1_PREFIX)
 app.include_router(watchlist.router, prefix=settings.API_V1_PREFIX)
 app.include_router(insights.router, prefix=settings.API_V1_PREFIX)
 app.include_router(discovery.router, prefix=settings.API_V1_PREFIX)
+if settings.FEED_ENABLED:
+    app.include_router(feed.router, prefix=settings.API_V1_PREFIX)
 
 
 @app.get("/health")
@@ -1,5 +1,17 @@
 from app.models.platform import Platform
+from app.models.platform_stats import PlatformStats
+from app.models.recommendation import PlatformRecommendation
 from app.models.user import User
 from app.models.watchlist import WatchlistItem
+from app.models.watchlist_event import WatchlistEvent
+from app.models.watchlist_tombstone import WatchlistTombstone
 
-__all__ = ["User", "Platform", "WatchlistItem"]
+__all__ = [
+    "User",
+    "Platform",
+    "WatchlistItem",
+    "WatchlistEvent",
+    "WatchlistTombstone",
+    "PlatformRecommendation",
+    "PlatformStats",
+]
@@ -0,0 +1,70 @@
+from datetime import datetime
+
+from sqlalchemy import DateTime, ForeignKey, Index, Integer, String, func
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.core.database import Base
+
+STATUSES = ("watched", "watching", "want_to_watch")
+TYPES = ("movie", "show")
+
+
+def cell_column(status: str, content_type: str) -> str:
+    """Name of the count column for one (status, type) combination."""
+    return f"{status}_{content_type}"
+
+
+class PlatformStats(Base):
+    """
+    Watchlist counts per user and platform, kept in step with the watchlist
+    by ``platform_stats_service``.
+
+    Items linked to a platform are counted under ``platform_id`` (with
+    ``platform_key`` NULL).  Items whose platform_name matches none of the
+    user's platforms are counted under ``platform_key`` = lower(name), and
+    items without a platform in the row where both are NULL.
+    """
+
+    __tablename__ = "platform_stats"
+    __table_args__ = (
+        Index("ix_platform_stats_user_platform", "user_id", "platform_id", "platform_key"),
+    )
+
+    id: Mapped[int] = mapped_column(primary_key=True)
+    user_id: Mapped[int] = mapped_column(
+        ForeignKey("users.id", ondelete="CASCADE"), nullable=False
+    )
+    platform_id: Mapped[int | None] = mapped_column(ForeignKey("platforms.id"), nullable=True)
+    platform_key: Mapped[str | None] = mapped_column(String(100), nullable=True)
+    total_items: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    watched_movie: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    watched_show: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    watching_movie: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    watching_show: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    want_to_watch_movie: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    want_to_watch_show: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    most_recent_added: Mapped[datetime | None] = mapped_column(
+        DateTime(timezone=True), nullable=True
+    )
+
+
+# One row per bucket.  A unique constraint over (user_id, platform_id,
+# platform_key) never fires: one of the two is always NULL, and NULLs are
+# distinct.  coalesce() also covers the row where both are NULL.
+_linked = PlatformStats.platform_id.is_not(None)
+Index(
+    "uq_platform_stats_user_platform",
+    PlatformStats.user_id,
+    PlatformStats.platform_id,
+    unique=True,
+    sqlite_where=_linked,
+    postgresql_where=_linked,
+)
+Index(
+    "uq_platform_stats_user_key",
+    PlatformStats.user_id,
+    func.coalesce(PlatformStats.platform_key, ""),
+    unique=True,
+    sqlite_where=~_linked,
+    postgresql_where=~_linked,
+)
@@ -1,6 +1,6 @@
 from datetime import datetime, timezone
 
-from sqlalchemy import DateTime, String
+from sqlalchemy import DateTime, Integer, String
 from sqlalchemy.orm import Mapped, mapped_column
 
 from app.core.database import Base
@@ -18,3 +18,9 @@ class User(Base):
         DateTime(timezone=True),
         default=lambda: datetime.now(timezone.utc),
     )
+    # Bumped once per watchlist write; stamped on the rows it touched (see
+    # sync_service).  Tombstones at or below the floor have been pruned.
+    watchlist_version: Mapped[int] = mapped_column(Integer, default=0, server_default="0")
+    watchlist_tombstone_floor: Mapped[int] = mapped_column(
+        Integer, default=0, server_default="0"
+    )
@@ -1,6 +1,17 @@
 from datetime import datetime, timezone
 
-from sqlalchemy import DateTime, Enum, ForeignKey, String, Text
+from sqlalchemy import (
+    DateTime,
+    Enum,
+    ForeignKey,
+    Index,
+    Integer,
+    String,
+    Text,
+    column,
+    func,
+    table,
+)
 from sqlalchemy.orm import Mapped, mapped_column
 
 from app.core.database import Base
@@ -8,12 +19,23 @@ from app.core.database import Base
 
 class WatchlistItem(Base):
     __tablename__ = "watchlist"
+    __table_args__ = (
+        # Listing / keyset paging (id rides along as the rowid)
+        Index("ix_watchlist_user_added", "user_id", "added_at"),
+        # Per-status sections and ?status= listing
+        Index("ix_watchlist_user_status_added", "user_id", "status", "added_at"),
+        # Per-platform reads and relinking when a platform changes
+        Index("ix_watchlist_user_platform_added", "user_id", "platform_id", "added_at"),
+        # Delta sync: everything a user changed after a version
+        Index("ix_watchlist_user_version", "user_id", "version"),
+    )
 
     id: Mapped[int] = mapped_column(primary_key=True, index=True)
     user_id: Mapped[int] = mapped_column(
         ForeignKey("users.id", ondelete="CASCADE"), nullable=False, index=True
     )
     title: Mapped[str] = mapped_column(String(200), nullable=False)
+    # Native ENUM types on PostgreSQL, plain VARCHAR on SQLite
     type: Mapped[str] = mapped_column(
         Enum("movie", "show", name="content_type"), default="movie"
     )
@@ -22,9 +44,74 @@ class WatchlistItem(Base):
         default="want_to_watch",
     )
     platform_name: Mapped[str | None] = mapped_column(String(100), nullable=True)
+    # The user's platform whose name matches platform_name (case-insensitive),
+    # set on write; NULL when no platform has that name.
+    platform_id: Mapped[int | None] = mapped_column(
+        ForeignKey("platforms.id", ondelete="SET NULL"), nullable=True
+    )
     poster_url: Mapped[str | None] = mapped_column(String(500), nullable=True)
     notes: Mapped[str | None] = mapped_column(Text, nullable=True)
     added_at: Mapped[datetime] = mapped_column(
         DateTime(timezone=True),
         default=lambda: datetime.now(timezone.utc),
     )
+    # users.watchlist_version of the write that last touched the row
+    version: Mapped[int] = mapped_column(Integer, default=0, server_default="0")
+
+
+# Per-platform aggregates group by lower(platform_name); the trailing columns
+# make it covering for the insights and discovery count queries.
+Index(
+    "ix_watchlist_user_lower_platform",
+    WatchlistItem.user_id,
+    func.lower(WatchlistItem.platform_name),
+    WatchlistItem.status,
+    WatchlistItem.type,
+    WatchlistItem.added_at,
+)
+
+
+# ---------------------------------------------------------------------------
+# Full-text search (SQLite FTS5)
+# ---------------------------------------------------------------------------
+#
+# An external-content index over the watchlist table: FTS5 stores only the
+# inverted index and reads column values back from ``watchlist`` by rowid.
+# Triggers keep it in step with every write, whichever code path makes it.
+# ``user_id`` is indexed as a token so a search is scoped to one user inside
+# the index rather than filtered afterwards.  Created by migration 3.
+
+WATCHLIST_FTS_DDL = (
+    """
+    CREATE VIRTUAL TABLE IF NOT EXISTS watchlist_fts USING fts5(
+        user_id, title, notes,
+        content='watchlist', content_rowid='id',
+        tokenize='unicode61 remove_diacritics 2', prefix='2 3'
+    )
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS watchlist_fts_insert AFTER INSERT ON watchlist BEGIN
+        INSERT INTO watchlist_fts (rowid, user_id, title, notes)
+        VALUES (new.id, new.user_id, new.title, new.notes);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS watchlist_fts_delete AFTER DELETE ON watchlist BEGIN
+        INSERT INTO watchlist_fts (watchlist_fts, rowid, user_id, title, notes)
+        VALUES ('delete', old.id, old.user_id, old.title, old.notes);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS watchlist_fts_update
+    AFTER UPDATE OF user_id, title, notes ON watchlist BEGIN
+        INSERT INTO watchlist_fts (watchlist_fts, rowid, user_id, title, notes)
+        VALUES ('delete', old.id, old.user_id, old.title, old.notes);
+        INSERT INTO watchlist_fts (rowid, user_id, title, notes)
+        VALUES (new.id, new.user_id, new.title, new.notes);
+    END
+    """,
+)
+
+watchlist_fts = table(
+    "watchlist_fts", column("rowid"), column("watchlist_fts"), column("rank")
+)
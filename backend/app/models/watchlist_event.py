@@ -0,0 +1,49 @@
+from datetime import datetime, timezone
+
+from sqlalchemy import DateTime, ForeignKey, Index, Integer, SmallInteger, String
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.core.database import Base
+
+# Stored instead of the status string to keep the log compact
+STATUS_CODES = {"want_to_watch": 0, "watching": 1, "watched": 2}
+
+
+class WatchlistEvent(Base):
+    """
+    Append-only log of watchlist status transitions.
+
+    ``item_id`` is deliberately not a foreign key: history outlives the item.
+    ``platform_key`` is lower(platform_name) and ``platform_id`` the item's
+    platform at the time of the transition.
+    """
+
+    __tablename__ = "watchlist_events"
+    __table_args__ = (
+        # Per-user, per-platform time ranges: last activity is one index seek,
+        # a trailing window is a bounded range scan.
+        Index("ix_watchlist_events_user_platform_id_time", "user_id", "platform_id", "occurred_at"),
+        # Distinct items per platform and status (insights' "watched recently")
+        # without a temp sort: a covering scan in item_id order.
+        Index(
+            "ix_watchlist_events_user_platform_status_item",
+            "user_id",
+            "platform_id",
+            "status",
+            "item_id",
+            "occurred_at",
+        ),
+    )
+
+    id: Mapped[int] = mapped_column(primary_key=True)
+    user_id: Mapped[int] = mapped_column(
+        ForeignKey("users.id", ondelete="CASCADE"), nullable=False
+    )
+    item_id: Mapped[int] = mapped_column(Integer, nullable=False)
+    platform_key: Mapped[str | None] = mapped_column(String(100), nullable=True)
+    platform_id: Mapped[int | None] = mapped_column(Integer, nullable=True)
+    status: Mapped[int] = mapped_column(SmallInteger, nullable=False)
+    occurred_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True),
+        default=lambda: datetime.now(timezone.utc),
+    )
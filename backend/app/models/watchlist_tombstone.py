@@ -0,0 +1,32 @@
+from datetime import datetime, timezone
+
+from sqlalchemy import DateTime, ForeignKey, Index, Integer
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.core.database import Base
+
+
+class WatchlistTombstone(Base):
+    """
+    A deleted watchlist item, kept so delta sync can tell clients to drop it.
+
+    Pruned after WATCHLIST_TOMBSTONE_RETENTION_DAYS; the user's
+    ``watchlist_tombstone_floor`` records how far, and older sync tokens get
+    a full resync instead.
+    """
+
+    __tablename__ = "watchlist_tombstones"
+    __table_args__ = (
+        Index("ix_watchlist_tombstones_user_version", "user_id", "version", "item_id"),
+    )
+
+    id: Mapped[int] = mapped_column(primary_key=True)
+    user_id: Mapped[int] = mapped_column(
+        ForeignKey("users.id", ondelete="CASCADE"), nullable=False
+    )
+    item_id: Mapped[int] = mapped_column(Integer, nullable=False)
+    version: Mapped[int] = mapped_column(Integer, nullable=False)
+    deleted_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True),
+        default=lambda: datetime.now(timezone.utc),
+    )
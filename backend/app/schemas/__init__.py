@@ -2,7 +2,15 @@ from app.schemas.auth import Token, TokenRefresh, UserCreate, UserLogin, UserOut
 from app.schemas.discovery import DiscoveryOut, PlatformBreakdown, WatchlistStats
 from app.schemas.insights import InsightsOut, PlatformFeatures, Recommendation
 from app.schemas.platform import PlatformCreate, PlatformOut, PlatformUpdate
-from app.schemas.watchlist import WatchlistItemCreate, WatchlistItemOut, WatchlistItemUpdate
+from app.schemas.watchlist import (
+    WatchlistBatchCreate,
+    WatchlistBatchDelete,
+    WatchlistBatchResult,
+    WatchlistBatchUpdate,
+    WatchlistItemCreate,
+    WatchlistItemOut,
+    WatchlistItemUpdate,
+)
 
 __all__ = [
     "UserCreate",
@@ -16,6 +24,10 @@ __all__ = [
     "WatchlistItemCreate",
     "WatchlistItemOut",
     "WatchlistItemUpdate",
+    "WatchlistBatchCreate",
+    "WatchlistBatchUpdate",
+    "WatchlistBatchDelete",
+    "WatchlistBatchResult",
     "InsightsOut",
     "PlatformFeatures",
     "Recommendation",
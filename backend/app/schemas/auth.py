@@ -27,5 +27,10 @@ class Token(BaseModel):
     token_type: str = "bearer"
 
 
+class PasswordChange(BaseModel):
+    current_password: str
+    new_password: str = Field(..., min_length=8)
+
+
 class TokenRefresh(BaseModel):
     refresh_token: str
@@ -24,7 +24,8 @@ class PlatformFeatures(BaseModel):
     want_count: int
     movie_count: int
     show_count: int
-    days_since_last_activity: int  # 365 if platform has no watchlist items
+    days_since_last_activity: int  # since last add or status change; 365 if none
+    watched_last_30d: int = 0  # distinct items marked watched in the last 30 days
 
     # Derived pre-normalization features
     completion_rate: float = Field(ge=0.0, le=1.0)
@@ -3,6 +3,8 @@ from typing import Literal
 
 from pydantic import BaseModel, Field
 
+from app.core.config import settings
+
 ContentType = Literal["movie", "show"]
 WatchStatus = Literal["want_to_watch", "watching", "watched"]
 
@@ -32,5 +34,79 @@ class WatchlistItemUpdate(BaseModel):
 class WatchlistItemOut(WatchlistItemBase):
     id: int
     added_at: datetime
+    platform_id: int | None = None  # the matching platform, if any
 
     model_config = {"from_attributes": True}
+
+
+class WatchlistChanges(BaseModel):
+    items: list[WatchlistItemOut]  # created or updated since the token
+    deleted: list[int]
+    next_token: str
+    has_more: bool
+    reset: bool  # token too old: this is a fresh snapshot, drop local state
+
+
+# ---------------------------------------------------------------------------
+# Batch operations
+# ---------------------------------------------------------------------------
+
+BatchItemStatus = Literal["created", "updated", "deleted", "not_found"]
+
+
+class WatchlistBatchCreate(BaseModel):
+    items: list[WatchlistItemCreate] = Field(
+        ..., min_length=1, max_length=settings.WATCHLIST_BATCH_MAX
+    )
+
+
+class WatchlistItemBatchUpdate(WatchlistItemUpdate):
+    id: int
+
+
+class WatchlistBatchUpdate(BaseModel):
+    items: list[WatchlistItemBatchUpdate] = Field(
+        ..., min_length=1, max_length=settings.WATCHLIST_BATCH_MAX
+    )
+
+
+class WatchlistBatchDelete(BaseModel):
+    ids: list[int] = Field(..., min_length=1, max_length=settings.WATCHLIST_BATCH_MAX)
+
+
+class BatchItemResult(BaseModel):
+    index: int  # position in the request list
+    id: int | None
+    status: BatchItemStatus
+
+
+class WatchlistBatchResult(BaseModel):
+    succeeded: int
+    failed: int
+    results: list[BatchItemResult]
+
+
+# ---------------------------------------------------------------------------
+# Import
+# ---------------------------------------------------------------------------
+
+ImportFormat = Literal["csv", "ndjson"]
+ImportStatus = Literal["running", "completed", "failed"]
+
+
+class ImportRowError(BaseModel):
+    line: int
+    message: str
+
+
+class ImportReport(BaseModel):
+    job_id: str
+    status: ImportStatus
+    format: ImportFormat
+    rows_read: int = 0
+    inserted: int = 0
+    duplicates: int = 0
+    invalid: int = 0
+    errors: list[ImportRowError] = []  # first WATCHLIST_IMPORT_MAX_ERRORS only
+    started_at: datetime
+    finished_at: datetime | None = None
@@ -1,3 +1,30 @@
-from app.services import discovery_service, insights_service, platform_service, user_service, watchlist_service
+from app.services import (
+    discovery_service,
+    import_service,
+    platform_service,
+    platform_stats_service,
+    precompute_service,
+    user_service,
+    watchlist_service,
+)
 
-__all__ = ["user_service", "platform_service", "watchlist_service", "insights_service", "discovery_service"]
+
+def __getattr__(name: str):
+    # The insights engine pulls in NumPy; load it on first access only.
+    if name == "insights_service":
+        import importlib
+
+        return importlib.import_module(f"{__name__}.insights_service")
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+__all__ = [
+    "user_service",
+    "platform_service",
+    "platform_stats_service",
+    "precompute_service",
+    "watchlist_service",
+    "import_service",
+    "insights_service",
+    "discovery_service",
+]
@@ -1,7 +1,9 @@
-from sqlalchemy import func, select
+from sqlalchemy import RowMapping, func, select, union_all
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.core.database import fetch_all_concurrently
 from app.models.platform import Platform
+from app.models.platform_stats import STATUSES, TYPES, PlatformStats, cell_column
 from app.models.watchlist import WatchlistItem
 from app.schemas.discovery import (
     DiscoveryOut,
@@ -13,54 +15,113 @@ from app.schemas.discovery import (
 # Rough viewing time estimates (hours per item)
 _HOURS = {"movie": 2.0, "show": 0.75}
 
-
-async def compute_discovery(db: AsyncSession, user_id: int) -> DiscoveryOut:
-    # ------------------------------------------------------------------ #
-    # 1. Fetch watchlist sections
-    # ------------------------------------------------------------------ #
-    async def _fetch(status: str, limit: int | None = None):
-        q = (
-            select(WatchlistItem)
+# Rows returned per discovery section (None = every item with that status)
+_SECTION_LIMITS = {"watching": None, "want_to_watch": 10, "watched": 5}
+
+
+def _sections_query(user_id: int):
+    """
+    Newest items per status in a single statement.
+
+    Each status is its own ORDER BY / LIMIT branch so SQLite can do a top-N
+    read per status instead of ranking the user's whole watchlist.  There is
+    no outer ORDER BY (it would force a temp sort); callers re-sort the few
+    rows per section.  ``id`` breaks ties in both places, so items added in
+    the same instant keep a stable order (on SQLite the index already ends in
+    the rowid, so it costs no sort).
+    """
+    columns = (
+        WatchlistItem.id,
+        WatchlistItem.title,
+        WatchlistItem.type,
+        WatchlistItem.status,
+        WatchlistItem.platform_name,
+        WatchlistItem.poster_url,
+        WatchlistItem.added_at,
+    )
+    branches = []
+    for status, limit in _SECTION_LIMITS.items():
+        branch = (
+            select(*columns)
             .where(WatchlistItem.user_id == user_id, WatchlistItem.status == status)
-            .order_by(WatchlistItem.added_at.desc())
+            .order_by(WatchlistItem.added_at.desc(), WatchlistItem.id.desc())
         )
         if limit:
-            q = q.limit(limit)
-        result = await db.execute(q)
-        return list(result.scalars().all())
+            branch = branch.limit(limit)
+        branches.append(select(branch.subquery()))
+
+    return union_all(*branches)
+
+
+def _counts_query(user_id: int):
+    """
+    Item counts by (platform, status, type) from platform_stats — one row per
+    platform rather than a scan of the watchlist — with the linked platform
+    joined on its id.  Feeds both stats and breakdown.  Unordered: callers
+    sort the few rows by ``sort_key`` rather than have SQLite build a temp
+    B-tree for them.
+    """
+    key = func.coalesce(func.lower(Platform.name), PlatformStats.platform_key)
+    return (
+        select(
+            PlatformStats.__table__,
+            key.label("sort_key"),
+            Platform.name,
+            Platform.color,
+            Platform.is_subscribed,
+        )
+        .outerjoin(Platform, Platform.id == PlatformStats.platform_id)
+        .where(PlatformStats.user_id == user_id)
+    )
+
+
+def _platforms_query(user_id: int):
+    return select(Platform.name, Platform.color, Platform.is_subscribed).where(
+        Platform.user_id == user_id
+    )
 
-    continue_watching = await _fetch("watching")
-    up_next = await _fetch("want_to_watch", limit=10)
-    recently_completed = await _fetch("watched", limit=5)
 
+async def compute_discovery(db: AsyncSession, user_id: int) -> DiscoveryOut:
     # ------------------------------------------------------------------ #
-    # 2. Aggregate stats
+    # 1. Fetch sections, grouped counts and platforms (independent reads)
     # ------------------------------------------------------------------ #
-    count_q = await db.execute(
-        select(
-            WatchlistItem.status,
-            WatchlistItem.type,
-            func.count().label("n"),
-        )
-        .where(WatchlistItem.user_id == user_id)
-        .group_by(WatchlistItem.status, WatchlistItem.type)
+    # In parallel these are three snapshots, so a write committing between
+    # them can show in one and not the others (e.g. a new item in a section
+    # but not yet in the counts).  That write also bumps the data version,
+    # so the response is not cached past it and the next one agrees.
+    section_rows, count_rows, all_platforms = await fetch_all_concurrently(
+        db,
+        _sections_query(user_id),
+        _counts_query(user_id),
+        _platforms_query(user_id),
     )
-    rows = count_q.mappings().all()
 
+    sections: dict[str, list[WatchlistItemSlim]] = {s: [] for s in _SECTION_LIMITS}
+    for row in section_rows:
+        sections[row["status"]].append(WatchlistItemSlim.model_validate(dict(row)))
+    for items in sections.values():
+        items.sort(key=lambda i: (i.added_at, i.id), reverse=True)
+
+    # ------------------------------------------------------------------ #
+    # 2. Aggregate stats and per-platform counts from the grouped rows
+    # ------------------------------------------------------------------ #
     counts: dict[str, int] = {"watched": 0, "watching": 0, "want_to_watch": 0}
+    pdata: list[tuple[RowMapping, dict[str, int]]] = []
     hours_remaining = 0.0
-    for row in rows:
-        counts[row["status"]] = counts.get(row["status"], 0) + row["n"]
-        if row["status"] in ("watching", "want_to_watch"):
-            hours_remaining += row["n"] * _HOURS.get(row["type"], 1.0)
+    for row in count_rows:
+        per_status = {"watched": 0, "watching": 0, "want_to_watch": 0}
+        if row["sort_key"] is not None:
+            pdata.append((row, per_status))
+        for status in STATUSES:
+            for content_type in TYPES:
+                n = row[cell_column(status, content_type)]
+                counts[status] += n
+                if status in ("watching", "want_to_watch"):
+                    hours_remaining += n * _HOURS.get(content_type, 1.0)
+                per_status[status] += n
 
     total_items = sum(counts.values())
-
-    platform_result = await db.execute(
-        select(Platform).where(Platform.user_id == user_id)
-    )
-    all_platforms = list(platform_result.scalars().all())
-    subscribed_count = sum(1 for p in all_platforms if p.is_subscribed)
+    subscribed_count = sum(1 for p in all_platforms if p["is_subscribed"])
 
     stats = WatchlistStats(
         total_items=total_items,
@@ -75,35 +136,18 @@ async def compute_discovery(db: AsyncSession, user_id: int) -> DiscoveryOut:
     # ------------------------------------------------------------------ #
     # 3. Per-platform breakdown
     # ------------------------------------------------------------------ #
-    breakdown_q = await db.execute(
-        select(
-            func.lower(WatchlistItem.platform_name).label("pname"),
-            WatchlistItem.status,
-            func.count().label("n"),
-        )
-        .where(WatchlistItem.user_id == user_id, WatchlistItem.platform_name.isnot(None))
-        .group_by(func.lower(WatchlistItem.platform_name), WatchlistItem.status)
-    )
-    breakdown_rows = breakdown_q.mappings().all()
-
-    pdata: dict[str, dict] = {}
-    for row in breakdown_rows:
-        key = row["pname"]
-        if key not in pdata:
-            pdata[key] = {"watched": 0, "watching": 0, "want_to_watch": 0}
-        pdata[key][row["status"]] = row["n"]
-
-    platform_map = {p.name.lower(): p for p in all_platforms}
-
+    # Rows for names that match no platform still get an entry
     breakdown: list[PlatformBreakdown] = []
-    for pname, d in pdata.items():
-        p = platform_map.get(pname)
+    # By name first, so platforms with equal totals keep a stable order
+    pdata.sort(key=lambda entry: entry[0]["sort_key"])
+    for row, d in pdata:
+        linked = row["platform_id"] is not None
         total = d["watched"] + d["watching"] + d["want_to_watch"]
         breakdown.append(
             PlatformBreakdown(
-                platform_name=p.name if p else pname.title(),
-                color=p.color if p else "#6366f1",
-                is_subscribed=p.is_subscribed if p else False,
+                platform_name=row["name"] if linked else row["platform_key"].title(),
+                color=row["color"] if linked else "#6366f1",
+                is_subscribed=row["is_subscribed"] if linked else False,
                 total=total,
                 watched=d["watched"],
                 watching=d["watching"],
@@ -116,13 +160,10 @@ async def compute_discovery(db: AsyncSession, user_id: int) -> DiscoveryOut:
     # ------------------------------------------------------------------ #
     # 4. Build response
     # ------------------------------------------------------------------ #
-    def slim(items: list[WatchlistItem]) -> list[WatchlistItemSlim]:
-        return [WatchlistItemSlim.model_validate(i) for i in items]
-
     return DiscoveryOut(
-        continue_watching=slim(continue_watching),
-        up_next=slim(up_next),
-        recently_completed=slim(recently_completed),
+        continue_watching=sections["watching"],
+        up_next=sections["want_to_watch"],
+        recently_completed=sections["watched"],
         stats=stats,
         platform_breakdown=breakdown,
     )
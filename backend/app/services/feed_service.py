@@ -0,0 +1,82 @@
+"""
+Per-user change feed pushed to clients over Server-Sent Events.
+
+Services publish here after they commit, so clients can apply deltas
+instead of polling /watchlist and /discovery:
+
+- ``items_upserted`` — ``{"items": [<WatchlistItemOut>, ...]}``
+- ``items_deleted`` — ``{"ids": [...]}``
+- ``platform_upserted`` — ``<PlatformOut>``
+- ``platform_deleted`` — ``{"id": ...}``
+- ``resync`` — ``{"reason": ...}``: reload the watchlist and platforms.
+  Sent when a platform change relinked items, when a reconnect cursor is no
+  longer covered by the replay buffer, and when a client falls too far
+  behind.
+
+Payloads are encoded once per publish, and only for users with a feed open
+(or one that closed within FEED_REPLAY_TTL_SECONDS).
+"""
+
+from collections.abc import Iterable
+from typing import Any
+
+from app.core.config import settings
+from app.core.feed import ChangeFeed
+from app.core.responses import dumps
+from app.schemas.platform import PlatformOut
+from app.schemas.watchlist import WatchlistItemOut
+
+# Feed payloads carry exactly the listing fields, so clients can merge them
+ITEM_FIELDS = list(WatchlistItemOut.model_fields)
+_PLATFORM_FIELDS = list(PlatformOut.model_fields)
+
+change_feed = ChangeFeed(
+    subscriber_buffer=settings.FEED_SUBSCRIBER_BUFFER,
+    replay_size=settings.FEED_REPLAY_EVENTS,
+    replay_ttl=settings.FEED_REPLAY_TTL_SECONDS,
+    max_keys=settings.FEED_MAX_USERS,
+)
+
+
+def wants(user_id: int) -> bool:
+    """Cheap check before building payloads for a large batch."""
+    return change_feed.wants(user_id)
+
+
+def _publish(user_id: int, name: str, payload: Any) -> None:
+    if change_feed.wants(user_id):
+        change_feed.publish(user_id, name, dumps(payload))
+
+
+def items_upserted(user_id: int, items: Iterable[Any]) -> None:
+    """``items`` are ORM objects or rows with every WatchlistItemOut field."""
+    if change_feed.wants(user_id):
+        payload = [{f: getattr(item, f) for f in ITEM_FIELDS} for item in items]
+        if payload:
+            change_feed.publish(user_id, "items_upserted", dumps({"items": payload}))
+
+
+def items_deleted(user_id: int, ids: Iterable[int]) -> None:
+    ids = list(ids)
+    if ids:
+        _publish(user_id, "items_deleted", {"ids": ids})
+
+
+def platform_upserted(platform) -> None:
+    _publish(
+        platform.user_id,
+        "platform_upserted",
+        {f: getattr(platform, f) for f in _PLATFORM_FIELDS},
+    )
+
+
+def platform_deleted(user_id: int, platform_id: int) -> None:
+    _publish(user_id, "platform_deleted", {"id": platform_id})
+
+
+def resync(user_id: int, reason: str) -> None:
+    _publish(user_id, "resync", {"reason": reason})
+
+
+def stop() -> None:
+    change_feed.close_all()
@@ -0,0 +1,345 @@
+"""
+Watchlist import pipeline.
+
+Uploads are parsed incrementally from an async byte stream, validated against
+``WatchlistItemCreate`` a batch at a time, de-duplicated on
+(lower(title), type) against the user's existing items and the file itself,
+and inserted one transaction per batch.  Progress lives in an in-process job
+registry so large imports can run in the background and be polled.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import codecs
+import csv
+import json
+import tempfile
+import uuid
+from collections.abc import AsyncIterator
+from datetime import datetime, timezone
+from typing import IO
+
+from pydantic import ValidationError
+from sqlalchemy import insert, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.cache import TTLCache, bump_data_version
+from app.core.config import settings
+from app.core.database import AsyncSessionLocal
+from app.models.watchlist import WatchlistItem
+from app.schemas.watchlist import (
+    ImportFormat,
+    ImportReport,
+    ImportRowError,
+    WatchlistItemCreate,
+)
+from app.services import feed_service, platform_service, platform_stats_service, sync_service
+from app.services.platform_stats_service import item_key
+
+_JOB_TTL_SECONDS = 3600
+# Inserted rows come back whole for the change feed; this covers KEY_COLUMNS
+_RETURNED_COLUMNS = [getattr(WatchlistItem, f) for f in feed_service.ITEM_FIELDS]
+_SPOOL_MAX_MEMORY = 8 * 1024 * 1024
+_READ_CHUNK = 64 * 1024
+_CSV_FIELDS = set(WatchlistItemCreate.model_fields)
+
+
+
+class UploadTooLarge(Exception):
+    pass
+
+
+# job_id -> (user_id, ImportReport); reports are updated in place while running
+_jobs = TTLCache(1000)
+_background: set[asyncio.Task] = set()
+
+
+# ---------------------------------------------------------------------------
+# Parsing
+# ---------------------------------------------------------------------------
+
+async def _iter_lines(chunks: AsyncIterator[bytes], max_chars: int) -> AsyncIterator[str | None]:
+    """Lines without their terminator; None for one longer than ``max_chars``."""
+    decoder = codecs.getincrementaldecoder("utf-8-sig")()
+    pending = ""
+    skipping = False  # inside an overlong line, already reported
+    async for chunk in chunks:
+        pending += decoder.decode(chunk)
+        *lines, pending = pending.split("\n")
+        for line in lines:
+            if skipping:
+                skipping = False  # the end of the overlong line
+            elif len(line) > max_chars:
+                yield None
+            else:
+                yield line.rstrip("\r")
+        if len(pending) > max_chars:
+            if not skipping:
+                yield None
+                skipping = True
+            pending = ""
+    pending += decoder.decode(b"", final=True)
+    if pending and not skipping:
+        yield pending.rstrip("\r") if len(pending) <= max_chars else None
+
+
+async def _iter_records(
+    chunks: AsyncIterator[bytes], fmt: ImportFormat
+) -> AsyncIterator[tuple[int, dict | str]]:
+    """
+    Yield (line_number, record) pairs.  A record is a dict of raw values, or
+    an error message string if the line itself could not be parsed.
+    """
+    max_chars = settings.WATCHLIST_IMPORT_MAX_RECORD_CHARS
+    too_long = f"Record longer than {max_chars} characters"
+
+    if fmt == "ndjson":
+        line_no = 0
+        async for line in _iter_lines(chunks, max_chars):
+            line_no += 1
+            if line is None:
+                yield line_no, too_long
+                continue
+            if not line.strip():
+                continue
+            try:
+                record = json.loads(line)
+            except json.JSONDecodeError as exc:
+                yield line_no, f"Invalid JSON: {exc.msg}"
+                continue
+            yield line_no, record if isinstance(record, dict) else "Expected a JSON object"
+        return
+
+    # CSV: csv.reader decides where a record ends, so a quote inside an
+    # unquoted field stays literal and quoted fields may span lines.  A
+    # record that grows past max_chars (say, an opening quote never closed)
+    # is dropped, and parsing starts afresh on the next line.
+    header: list[str] | None = None
+    record: list[str] = []
+    size = 0
+    line_no = record_start = 0
+    async for line in _iter_lines(chunks, max_chars):
+        line_no += 1
+        if not record:
+            record_start = line_no
+        if line is None or size + len(line) > max_chars:
+            yield record_start, too_long
+            record, size = [], 0
+            continue
+        record.append(line + "\n")
+        size += len(line) + 1
+        row = _parse_csv_record(record)
+        if row is None:
+            continue
+        record, size = [], 0
+        if isinstance(row, str):
+            yield record_start, row
+        elif not row:
+            continue
+        elif header is None:
+            header = [h.strip() for h in row]
+        else:
+            yield record_start, {
+                k: (v if v != "" else None)
+                for k, v in zip(header, row)
+                if k in _CSV_FIELDS
+            }
+    if record:
+        yield record_start, "Unterminated quoted field"
+
+
+def _parse_csv_record(lines: list[str]) -> list[str] | str | None:
+    """
+    The fields of the CSV record made of ``lines``, an error message, or None
+    if the record goes on past them (a quoted field spans the last newline).
+    """
+    starved = False
+
+    def feed():
+        nonlocal starved
+        yield from lines
+        starved = True  # the reader wanted another line
+
+    try:
+        row = next(csv.reader(feed()), [])
+    except csv.Error as exc:
+        return f"Invalid CSV: {exc}"
+    return None if starved else row
+
+
+# ---------------------------------------------------------------------------
+# Pipeline
+# ---------------------------------------------------------------------------
+
+async def _existing_keys(db: AsyncSession, user_id: int) -> set[tuple[str, str]]:
+    # Lower-cased in Python: SQLite's lower() only folds ASCII
+    result = await db.execute(
+        select(WatchlistItem.title, WatchlistItem.type).where(
+            WatchlistItem.user_id == user_id
+        )
+    )
+    return {(title.lower(), ctype) for title, ctype in result.all()}
+
+
+def _add_error(report: ImportReport, line: int, message: str) -> None:
+    report.invalid += 1
+    if len(report.errors) < settings.WATCHLIST_IMPORT_MAX_ERRORS:
+        report.errors.append(ImportRowError(line=line, message=message))
+
+
+async def _insert_batch(db: AsyncSession, user_id: int, rows: list[dict]) -> None:
+    platform_ids = await platform_service.resolve_ids(
+        db, user_id, (r["platform_name"] for r in rows)
+    )
+    version = await sync_service.next_version(db, user_id)
+    result = await db.execute(
+        insert(WatchlistItem).returning(*_RETURNED_COLUMNS),
+        [
+            {
+                **r,
+                "user_id": user_id,
+                "platform_id": platform_ids.get(r["platform_name"]),
+                "version": version,
+            }
+            for r in rows
+        ],
+    )
+    created = result.all()
+    await platform_stats_service.apply_changes(
+        db, user_id, added=[item_key(row) for row in created]
+    )
+    await db.commit()
+    feed_service.items_upserted(user_id, created)
+
+
+async def run_import(
+    db: AsyncSession,
+    user_id: int,
+    chunks: AsyncIterator[bytes],
+    report: ImportReport,
+) -> ImportReport:
+    """Consume ``chunks`` and fill in ``report`` as batches are committed."""
+    batch_size = settings.WATCHLIST_IMPORT_BATCH_SIZE
+    try:
+        seen = await _existing_keys(db, user_id)
+        await db.commit()  # end the read transaction before the first write
+
+        batch: list[dict] = []
+        async for line_no, record in _iter_records(chunks, report.format):
+            report.rows_read += 1
+            if isinstance(record, str):
+                _add_error(report, line_no, record)
+                continue
+            try:
+                item = WatchlistItemCreate.model_validate(record)
+            except ValidationError as exc:
+                err = exc.errors()[0]
+                field = ".".join(str(p) for p in err["loc"])
+                _add_error(report, line_no, f"{field}: {err['msg']}" if field else err["msg"])
+                continue
+
+            key = (item.title.lower(), item.type)
+            if key in seen:
+                report.duplicates += 1
+                continue
+            seen.add(key)
+
+            batch.append(item.model_dump())
+            if len(batch) >= batch_size:
+                await _insert_batch(db, user_id, batch)
+                report.inserted += len(batch)
+                batch = []
+
+        if batch:
+            await _insert_batch(db, user_id, batch)
+            report.inserted += len(batch)
+        report.status = "completed"
+    except Exception:
+        await db.rollback()
+        report.status = "failed"
+        raise
+    finally:
+        report.finished_at = datetime.now(timezone.utc)
+        if report.inserted:
+            await bump_data_version(user_id)
+    return report
+
+
+# ---------------------------------------------------------------------------
+# Job registry
+# ---------------------------------------------------------------------------
+
+def new_job(user_id: int, fmt: ImportFormat) -> ImportReport:
+    report = ImportReport(
+        job_id=uuid.uuid4().hex,
+        status="running",
+        format=fmt,
+        started_at=datetime.now(timezone.utc),
+    )
+    _jobs.set(report.job_id, (user_id, report), _JOB_TTL_SECONDS)
+    return report
+
+
+def get_job(job_id: str, user_id: int) -> ImportReport | None:
+    entry = _jobs.get(job_id)
+    if entry is None or entry[0] != user_id:
+        return None
+    return entry[1]
+
+
+async def spool(chunks: AsyncIterator[bytes], max_bytes: int) -> IO[bytes]:
+    """
+    Copy an upload to a temp file (in memory up to 8 MB) so it outlives the
+    request.  Raises ``UploadTooLarge`` past ``max_bytes``.  Past 8 MB the
+    file is on disk, so writes run off the event loop.
+    """
+    file = tempfile.SpooledTemporaryFile(max_size=_SPOOL_MAX_MEMORY)
+    size = 0
+    try:
+        async for chunk in chunks:
+            size += len(chunk)
+            if size > max_bytes:
+                raise UploadTooLarge(f"Upload is larger than {max_bytes} bytes")
+            if size > _SPOOL_MAX_MEMORY:
+                await asyncio.to_thread(file.write, chunk)
+            else:
+                file.write(chunk)
+    except BaseException:
+        file.close()
+        raise
+    file.seek(0)
+    return file
+
+
+async def _read_file(file: IO[bytes]) -> AsyncIterator[bytes]:
+    # Off the event loop: a spooled upload past 8 MB is a disk file
+    while chunk := await asyncio.to_thread(file.read, _READ_CHUNK):
+        yield chunk
+
+
+def start_background_import(user_id: int, file: IO[bytes], report: ImportReport) -> None:
+    async def _run():
+        try:
+            async with AsyncSessionLocal() as db:
+                await run_import(db, user_id, _read_file(file), report)
+        except Exception as exc:
+            report.errors.append(ImportRowError(line=0, message=f"Import aborted: {exc}"))
+        except asyncio.CancelledError:
+            report.status = "failed"
+            report.errors.append(ImportRowError(line=0, message="Import cancelled by shutdown"))
+            raise
+        finally:
+            file.close()
+
+    task = asyncio.create_task(_run())
+    _background.add(task)
+    task.add_done_callback(_background.discard)
+
+
+async def stop() -> None:
+    """Cancel running background imports and wait for them to unwind."""
+    tasks = list(_background)
+    for task in tasks:
+        task.cancel()
+    await asyncio.gather(*tasks, return_exceptions=True)
@@ -3,7 +3,7 @@ ML-based subscription churn prediction and recommendation service.
 
 Approach:
   - Extract 5 features per subscribed platform from existing watchlist data
-  - Normalize with MinMaxScaler (scikit-learn) so platforms are compared fairly
+  - Min-max normalize each feature so platforms are compared fairly
   - Compute a weighted value score and churn risk
   - Produce keep / review / cancel recommendations with natural-language reasons
 
@@ -13,16 +13,17 @@ tiny (≤50 items/platform) and recomputed fresh on each request.
 
 from __future__ import annotations
 
-from datetime import datetime, timezone
+from datetime import datetime, timedelta, timezone
 from typing import Any
 
 import numpy as np
-from sklearn.preprocessing import MinMaxScaler
-from sqlalchemy import case, func, select
+from sqlalchemy import delete, func, insert, select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.models.platform import Platform
-from app.models.watchlist import WatchlistItem
+from app.models.platform_stats import PlatformStats
+from app.models.recommendation import PlatformRecommendation
+from app.models.watchlist_event import STATUS_CODES, WatchlistEvent
 from app.schemas.insights import (
     ActionType,
     ConfidenceLevel,
@@ -48,35 +49,43 @@ CANCEL_THRESHOLD = 0.70
 REVIEW_THRESHOLD = 0.45
 REVIEW_VALUE_MAX = 40.0  # even with lower churn risk, low value → review
 
+# Trailing window for "watched recently" (PlatformFeatures.watched_last_30d)
+ACTIVITY_WINDOW_DAYS = 30
+
 
 # ---------------------------------------------------------------------------
 # Step 1: Fetch raw aggregates
 # ---------------------------------------------------------------------------
 
-async def _fetch_aggregates(db: AsyncSession, user_id: int) -> dict[str, dict[str, Any]]:
+def _stats_columns() -> list:
+    """Per-platform aggregates from platform_stats, shared by the per-user and batch paths."""
+    stats = PlatformStats
+    return [
+        stats.total_items,
+        (stats.watched_movie + stats.watched_show).label("watched_count"),
+        (stats.watching_movie + stats.watching_show).label("watching_count"),
+        (stats.want_to_watch_movie + stats.want_to_watch_show).label("want_count"),
+        (stats.watched_movie + stats.watching_movie + stats.want_to_watch_movie).label("movie_count"),
+        (stats.watched_show + stats.watching_show + stats.want_to_watch_show).label("show_count"),
+        stats.most_recent_added,
+    ]
+
+
+async def _fetch_aggregates(db: AsyncSession, user_id: int) -> dict[int, dict[str, Any]]:
     """
-    Query watchlist table, group by lower(platform_name), and return raw counts.
-    Returns dict keyed by lowercase platform name.
+    Read the user's platform_stats rows for linked items — maintained on
+    every watchlist write, so no scan of the watchlist itself.  Returns dict
+    keyed by platform id.
     """
-    stmt = (
-        select(
-            func.lower(WatchlistItem.platform_name).label("pname"),
-            func.count().label("total_items"),
-            func.count(case((WatchlistItem.status == "watched", 1))).label("watched_count"),
-            func.count(case((WatchlistItem.status == "watching", 1))).label("watching_count"),
-            func.count(case((WatchlistItem.status == "want_to_watch", 1))).label("want_count"),
-            func.count(case((WatchlistItem.type == "movie", 1))).label("movie_count"),
-            func.count(case((WatchlistItem.type == "show", 1))).label("show_count"),
-            func.max(WatchlistItem.added_at).label("most_recent_added"),
-        )
-        .where(WatchlistItem.user_id == user_id, WatchlistItem.platform_name.isnot(None))
-        .group_by(func.lower(WatchlistItem.platform_name))
+    stmt = select(PlatformStats.platform_id, *_stats_columns()).where(
+        PlatformStats.user_id == user_id,
+        PlatformStats.platform_id.isnot(None),
     )
     result = await db.execute(stmt)
     rows = result.mappings().all()
 
     return {
-        row["pname"]: {
+        row["platform_id"]: {
             "total_items": row["total_items"],
             "watched_count": row["watched_count"],
             "watching_count": row["watching_count"],
@@ -89,6 +98,78 @@ async def _fetch_aggregates(db: AsyncSession, user_id: int) -> dict[str, dict[st
     }
 
 
+def _same_platform_events():
+    # Correlated on the outer Platform row; served by
+    # ix_watchlist_events_user_platform_id_time, so each value is an index
+    # seek or a bounded range scan rather than an aggregate over the whole log.
+    return (WatchlistEvent.user_id == Platform.user_id) & (
+        WatchlistEvent.platform_id == Platform.id
+    )
+
+
+def _last_status_change_column():
+    return (
+        select(func.max(WatchlistEvent.occurred_at))
+        .where(_same_platform_events())
+        .scalar_subquery()
+        .label("last_status_change")
+    )
+
+
+def _watched_since_column(since: datetime):
+    # Distinct items as a GROUP BY over ix_watchlist_events_user_platform_status_item,
+    # which yields them in item_id order: count(DISTINCT) would sort in a temp B-tree
+    watched = (
+        select(WatchlistEvent.item_id)
+        .where(
+            _same_platform_events(),
+            WatchlistEvent.status == STATUS_CODES["watched"],
+            WatchlistEvent.occurred_at >= since,
+        )
+        .group_by(WatchlistEvent.item_id)
+        .correlate(Platform)
+        .subquery()
+    )
+    return (
+        select(func.count())
+        .select_from(watched)
+        .scalar_subquery()
+        .label("watched_recent")
+    )
+
+
+async def _fetch_activity(
+    db: AsyncSession, user_id: int, now: datetime
+) -> dict[int, dict[str, Any]]:
+    """Last status change and items watched in the window, keyed by platform id."""
+    since = now - timedelta(days=ACTIVITY_WINDOW_DAYS)
+    stmt = select(
+        Platform.id, _last_status_change_column(), _watched_since_column(since)
+    ).where(
+        Platform.user_id == user_id, Platform.is_subscribed.is_(True)
+    )
+    result = await db.execute(stmt)
+    return {
+        row["id"]: {
+            "last_status_change": row["last_status_change"],
+            "watched_recent": row["watched_recent"],
+        }
+        for row in result.mappings()
+    }
+
+
+def _as_utc(value: datetime | None) -> datetime | None:
+    if value is not None and value.tzinfo is None:
+        return value.replace(tzinfo=timezone.utc)
+    return value
+
+
+def _last_activity(*moments: datetime | None) -> datetime | None:
+    """Latest of the given timestamps (added / status changed), ignoring None."""
+    known = [_as_utc(m) for m in moments if m is not None]
+    return max(known) if known else None
+
+
 # ---------------------------------------------------------------------------
 # Step 2: Compute raw (pre-normalization) features per platform
 # ---------------------------------------------------------------------------
@@ -104,7 +185,8 @@ def _compute_raw_features(
     want = agg["want_count"]
     movie_count = agg["movie_count"]
     show_count = agg["show_count"]
-    most_recent: datetime | None = agg["most_recent_added"]
+    # Last activity: newest of "added" and "status changed"
+    most_recent = _last_activity(agg["most_recent_added"], agg.get("last_status_change"))
 
     # Completion rate: of consumed content, how much is finished
     consumed = watched + watching
@@ -115,9 +197,6 @@ def _compute_raw_features(
 
     # Recency: how recently was content added/interacted with
     if most_recent is not None:
-        # Ensure timezone-aware comparison
-        if most_recent.tzinfo is None:
-            most_recent = most_recent.replace(tzinfo=timezone.utc)
         days_since = max(0, (now - most_recent).days)
     else:
         days_since = 365
@@ -142,6 +221,7 @@ def _compute_raw_features(
         movie_count=movie_count,
         show_count=show_count,
         days_since_last_activity=days_since,
+        watched_last_30d=agg.get("watched_recent", 0),
         completion_rate=round(completion_rate, 4),
         engagement_rate=round(engagement_rate, 4),
         recency_score=round(recency_score, 4),
@@ -168,9 +248,21 @@ def _build_feature_matrix(features: list[PlatformFeatures]) -> np.ndarray:
     return np.array(rows, dtype=np.float64)
 
 
+def _min_max(matrix: np.ndarray, col_min: np.ndarray, col_max: np.ndarray) -> np.ndarray:
+    """
+    Min-max scale with MinMaxScaler's arithmetic (X * scale + min) so scores
+    are unchanged from the scikit-learn version.  Near-zero spans get a scale
+    of 1, so zero-variance columns come out as 0.0 rather than NaN.
+    """
+    span = col_max - col_min
+    span = np.where(span < 10 * np.finfo(np.float64).eps, 1.0, span)
+    scale = 1.0 / span
+    return matrix * scale + (0.0 - col_min * scale)
+
+
 def _safe_scale(matrix: np.ndarray) -> np.ndarray:
     """
-    MinMaxScaler column-wise.  Zero-variance columns become 0.0 (not NaN).
+    Min-max scale column-wise.  Zero-variance columns become 0.0 (not NaN).
     Single-row case: bypass scaler — use the clamped [0,1] values directly
     for features that are already bounded, or 0.0 for volume/cost_eff.
     """
@@ -185,18 +277,26 @@ def _safe_scale(matrix: np.ndarray) -> np.ndarray:
         scaled[0, 4] = 0.0  # cost_efficiency: unknown relative size
         return np.clip(scaled, 0.0, 1.0)
 
-    scaler = MinMaxScaler()
-    scaled = scaler.fit_transform(matrix)
-
-    # Guard: replace NaN (zero-variance columns) with 0.0
-    scaled = np.where(np.isnan(scaled), 0.0, scaled)
-    return scaled
+    return _min_max(matrix, matrix.min(axis=0), matrix.max(axis=0))
 
 
 # ---------------------------------------------------------------------------
 # Step 4: Score one platform
 # ---------------------------------------------------------------------------
 
+def _weighted_sum(scaled: np.ndarray) -> np.ndarray:
+    """
+    Weighted feature sum over the last axis, accumulated left to right.
+
+    Not np.dot: BLAS picks its summation order by array shape, and the
+    per-user and batch paths have to agree to the last bit.
+    """
+    total = scaled[..., 0] * WEIGHTS[0]
+    for i in range(1, len(WEIGHTS)):
+        total = total + scaled[..., i] * WEIGHTS[i]
+    return total
+
+
 def _score_platform(
     scaled_row: np.ndarray,
     platform: Platform,
@@ -209,7 +309,7 @@ def _score_platform(
         name: float(round(scaled_row[i] * WEIGHTS[i], 4))
         for i, name in enumerate(FEATURE_NAMES)
     }
-    weighted = float(np.dot(scaled_row, WEIGHTS))
+    weighted = float(_weighted_sum(scaled_row))
     value_score = round(min(100.0, max(0.0, weighted * 100)), 1)
 
     base_risk = 1.0 - weighted
@@ -328,14 +428,14 @@ async def compute_insights(db: AsyncSession, user_id: int) -> InsightsOut:
             platform_features=[],
         )
 
-    # Fetch watchlist aggregates for this user
+    # Fetch watchlist aggregates and status-change activity for this user
     aggregates = await _fetch_aggregates(db, user_id)
+    activity = await _fetch_activity(db, user_id, now)
 
     # Build raw features for each subscribed platform
     raw_features: list[PlatformFeatures] = []
     for platform in subscribed:
-        key = platform.name.lower()
-        agg = aggregates.get(key, {
+        agg = aggregates.get(platform.id, {
             "total_items": 0,
             "watched_count": 0,
             "watching_count": 0,
@@ -344,6 +444,7 @@ async def compute_insights(db: AsyncSession, user_id: int) -> InsightsOut:
             "show_count": 0,
             "most_recent_added": None,
         })
+        agg = {**agg, **activity.get(platform.id, {})}
         raw_features.append(_compute_raw_features(platform, agg, now))
 
     # Build and scale feature matrix
@@ -405,3 +506,145 @@ async def compute_insights(db: AsyncSession, user_id: int) -> InsightsOut:
         recommendations=recommendations,
         platform_features=raw_features,
     )
+
+
+# ---------------------------------------------------------------------------
+# Batch mode: every user in one vectorized pass
+# ---------------------------------------------------------------------------
+
+def _round(values: np.ndarray, ndigits: int) -> np.ndarray:
+    """Python's correctly rounded ``round`` — np.round can differ in the last digit."""
+    return np.array([round(v, ndigits) for v in values.tolist()], dtype=np.float64)
+
+
+def _segment_scale(matrix: np.ndarray, starts: np.ndarray, counts: np.ndarray) -> np.ndarray:
+    """
+    ``_safe_scale`` applied to each user's block of rows at once.
+
+    Rows are grouped by user; ``starts``/``counts`` describe the segments.
+    Min/max come from ufunc.reduceat, so there is no per-user Python loop.
+    """
+    col_min = np.repeat(np.minimum.reduceat(matrix, starts, axis=0), counts, axis=0)
+    col_max = np.repeat(np.maximum.reduceat(matrix, starts, axis=0), counts, axis=0)
+    scaled = _min_max(matrix, col_min, col_max)
+
+    # Single-platform users: clamped raw values, no relative volume / cost info
+    single = np.repeat(counts == 1, counts)
+    single_rows = np.clip(matrix[single], 0.0, 1.0)
+    single_rows[:, 3:] = 0.0
+    scaled[single] = single_rows
+    return scaled
+
+
+async def compute_all_insights(db: AsyncSession) -> int:
+    """
+    Score every subscribed platform of every user and replace the contents of
+    ``platform_recommendations``.  Returns the number of rows written.
+
+    Produces the same value_score / churn_risk / action / confidence as
+    ``compute_insights`` but from one grouped query and array arithmetic.
+    """
+    now = datetime.now(timezone.utc)
+
+    agg = select(PlatformStats.platform_id, *_stats_columns()).subquery()
+    count_cols = ["total_items", "watched_count", "watching_count", "want_count"]
+    stmt = (
+        select(
+            Platform.id,
+            Platform.user_id,
+            Platform.monthly_cost,
+            *(func.coalesce(agg.c[c], 0).label(c) for c in count_cols),
+            agg.c.most_recent_added,
+            _last_status_change_column(),
+        )
+        .outerjoin(agg, agg.c.platform_id == Platform.id)
+        .where(Platform.is_subscribed.is_(True))
+        .order_by(Platform.user_id, Platform.name)
+    )
+    rows = (await db.execute(stmt)).all()
+    if not rows:
+        await db.execute(delete(PlatformRecommendation))
+        await db.commit()
+        return 0
+
+    platform_id, user_id, cost, total, watched, watching, _want, added, changed = zip(*rows)
+    user_id = np.asarray(user_id)
+    cost = np.asarray(cost, dtype=np.float64)
+    total = np.asarray(total, dtype=np.float64)
+    watched = np.asarray(watched, dtype=np.float64)
+    watching = np.asarray(watching, dtype=np.float64)
+
+    # --- raw features (rounded like PlatformFeatures) ----------------------
+    consumed = watched + watching
+    completion = np.divide(watched, consumed, out=np.zeros_like(consumed), where=consumed > 0)
+    engagement = np.divide(consumed, total, out=np.zeros_like(total), where=total > 0)
+
+    now_naive = np.datetime64(now.replace(tzinfo=None), "us")
+    last = np.array(
+        [
+            m.replace(tzinfo=None) if (m := _last_activity(a, c)) else None
+            for a, c in zip(added, changed)
+        ],
+        dtype="datetime64[us]",
+    )
+    with np.errstate(invalid="ignore"):  # NaT rows are replaced just below
+        elapsed_days = (now_naive - last) // np.timedelta64(1, "D")
+    days = np.where(np.isnat(last), 365, np.maximum(0, elapsed_days))
+    recency = np.maximum(0.0, 1.0 - days / 365.0)
+    cost_eff = np.divide(watched, cost, out=watched * 2.0, where=cost > 0)
+
+    matrix = np.column_stack([
+        _round(completion, 4),
+        _round(engagement, 4),
+        _round(recency, 4),
+        total,
+        _round(cost_eff, 4),
+    ])
+
+    # --- per-user scaling and scoring --------------------------------------
+    _, starts, counts = np.unique(user_id, return_index=True, return_counts=True)
+    scaled = _segment_scale(matrix, starts, counts)
+
+    weighted = _weighted_sum(scaled)
+    value_score = _round(np.clip(weighted * 100, 0.0, 100.0), 1)
+
+    max_cost = np.repeat(np.maximum.reduceat(cost, starts), counts)
+    norm_cost = np.divide(cost, max_cost, out=np.zeros_like(cost), where=max_cost > 0)
+    penalty = np.where((cost > 0) & (matrix[:, 1] < 0.25), norm_cost * 0.15, 0.0)
+    churn_risk = _round(np.minimum(1.0, (1.0 - weighted) + penalty), 3)
+
+    action = np.where(
+        churn_risk >= CANCEL_THRESHOLD,
+        "cancel",
+        np.where(
+            (churn_risk >= REVIEW_THRESHOLD) | (value_score < REVIEW_VALUE_MAX),
+            "review",
+            "keep",
+        ),
+    )
+    high = ((action == "cancel") & (churn_risk >= 0.85)) | (
+        (action == "keep") & (value_score >= 70.0)
+    )
+    confidence = np.where(high, "high", "medium")
+
+    # --- replace the stored snapshot ---------------------------------------
+    await db.execute(delete(PlatformRecommendation))
+    await db.execute(
+        insert(PlatformRecommendation),
+        [
+            {
+                "user_id": int(u),
+                "platform_id": p,
+                "value_score": float(v),
+                "churn_risk": float(c),
+                "action": str(a),
+                "confidence": str(conf),
+                "computed_at": now,
+            }
+            for u, p, v, c, a, conf in zip(
+                user_id, platform_id, value_score, churn_risk, action, confidence
+            )
+        ],
+    )
+    await db.commit()
+    return len(rows)
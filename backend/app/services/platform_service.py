@@ -1,8 +1,24 @@
-from sqlalchemy import select
+from collections.abc import Iterable
+
+from sqlalchemy import (
+    Executable,
+    String,
+    delete as sa_delete,
+    func,
+    literal,
+    select,
+    union_all,
+    update as sa_update,
+)
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.core.cache import bump_data_version
 from app.models.platform import Platform
+from app.models.platform_stats import PlatformStats
+from app.models.watchlist import WatchlistItem
+from app.models.watchlist_event import WatchlistEvent
 from app.schemas.platform import PlatformCreate, PlatformUpdate
+from app.services import feed_service, platform_stats_service, sync_service
 
 
 async def get_all(db: AsyncSession, user_id: int) -> list[Platform]:
@@ -18,24 +34,177 @@ async def get_by_id(db: AsyncSession, platform_id: int) -> Platform | None:
     return await db.get(Platform, platform_id)
 
 
+# ---------------------------------------------------------------------------
+# Linking watchlist items to platforms
+# ---------------------------------------------------------------------------
+#
+# An item belongs to the user's platform whose name equals its platform_name
+# under SQL lower() — the lowest id wins if case variants exist.  Matching is
+# always done in SQL so write-time resolution, relinking and the migration
+# backfill agree (SQLite's lower() folds ASCII only).
+
+
+def _matching_platform_id(user_id, name):
+    return (
+        select(func.min(Platform.id))
+        .where(Platform.user_id == user_id, func.lower(Platform.name) == func.lower(name))
+        .scalar_subquery()
+    )
+
+
+# SQLite caps a compound SELECT at 500 terms
+_RESOLVE_CHUNK = 500
+
+
+async def resolve_ids(
+    db: AsyncSession, user_id: int, names: Iterable[str | None]
+) -> dict[str, int]:
+    """
+    Map platform names to the user's platform ids, one query per 500
+    distinct names.  Names that match no platform are left out; their items
+    keep platform_id NULL.
+    """
+    distinct_names = sorted({name for name in names if name is not None})
+    resolved: dict[str, int] = {}
+    for start in range(0, len(distinct_names), _RESOLVE_CHUNK):
+        branches = [
+            select(literal(name, String), _matching_platform_id(user_id, literal(name, String)))
+            for name in distinct_names[start:start + _RESOLVE_CHUNK]
+        ]
+        stmt = branches[0] if len(branches) == 1 else union_all(*branches)
+        result = await db.execute(stmt)
+        resolved.update(
+            (name, platform_id) for name, platform_id in result if platform_id is not None
+        )
+    return resolved
+
+
+def link_statements(
+    user_id: int | None = None, version: int | None = None
+) -> list[Executable]:
+    """
+    UPDATEs that (re)point unlinked items and status events at the platform
+    their name now matches — after a platform is added or renamed, and for
+    the migration backfill.  ``version`` is stamped on the items changed.
+    """
+    item_match = _matching_platform_id(WatchlistItem.user_id, WatchlistItem.platform_name)
+    items = (
+        sa_update(WatchlistItem)
+        .where(
+            WatchlistItem.platform_id.is_(None),
+            WatchlistItem.platform_name.isnot(None),
+            item_match.isnot(None),
+        )
+        .values(platform_id=item_match)
+        .execution_options(synchronize_session=False)
+    )
+    # Event platform_key is already lowered
+    event_match = _matching_platform_id(WatchlistEvent.user_id, WatchlistEvent.platform_key)
+    events = (
+        sa_update(WatchlistEvent)
+        .where(
+            WatchlistEvent.platform_id.is_(None),
+            WatchlistEvent.platform_key.isnot(None),
+            event_match.isnot(None),
+        )
+        .values(platform_id=event_match)
+        .execution_options(synchronize_session=False)
+    )
+    if version is not None:
+        items = items.values(version=version)
+    if user_id is not None:
+        items = items.where(WatchlistItem.user_id == user_id)
+        events = events.where(WatchlistEvent.user_id == user_id)
+    return [items, events]
+
+
+async def _relink(db: AsyncSession, user_id: int, version: int) -> int:
+    """
+    Link what now matches and recount the user's platform_stats.  Returns
+    how many items were linked.
+    """
+    items_stmt, events_stmt = link_statements(user_id, version)
+    linked = (await db.execute(items_stmt)).rowcount
+    await db.execute(events_stmt)
+    for stmt in platform_stats_service.rebuild_statements(user_id):
+        await db.execute(stmt)
+    return linked
+
+
+# ---------------------------------------------------------------------------
+# Writes
+# ---------------------------------------------------------------------------
+
+
 async def create(db: AsyncSession, data: PlatformCreate, user_id: int) -> Platform:
+    version = await sync_service.next_version(db, user_id)
     platform = Platform(**data.model_dump(), user_id=user_id)
     db.add(platform)
+    await db.flush()
+    linked = await _relink(db, user_id, version)
     await db.commit()
     await db.refresh(platform)
+    await bump_data_version(platform.user_id)
+    feed_service.platform_upserted(platform)
+    if linked:
+        feed_service.resync(user_id, "platform_relinked")
     return platform
 
 
 async def update(
     db: AsyncSession, platform: Platform, data: PlatformUpdate
 ) -> Platform:
+    old_name = platform.name
+    items_changed = 0
     for field, value in data.model_dump(exclude_none=True).items():
         setattr(platform, field, value)
+    if platform.name != old_name:
+        version = await sync_service.next_version(db, platform.user_id)
+        await db.flush()
+        # Linked items follow the rename; items named after the new name join
+        renamed = await db.execute(
+            sa_update(WatchlistItem)
+            .where(WatchlistItem.platform_id == platform.id)
+            .values(platform_name=platform.name, version=version)
+            .execution_options(synchronize_session=False)
+        )
+        items_changed = renamed.rowcount + await _relink(db, platform.user_id, version)
     await db.commit()
     await db.refresh(platform)
+    await bump_data_version(platform.user_id)
+    feed_service.platform_upserted(platform)
+    if items_changed:
+        feed_service.resync(platform.user_id, "platform_relinked")
     return platform
 
 
 async def delete(db: AsyncSession, platform: Platform) -> None:
+    # Not left to ON DELETE SET NULL: SQLite only enforces it with
+    # PRAGMA foreign_keys, and the stats rows have to move anyway.
+    version = await sync_service.next_version(db, platform.user_id)
+    unlinked = await db.execute(
+        sa_update(WatchlistItem)
+        .where(WatchlistItem.platform_id == platform.id)
+        .values(platform_id=None, version=version)
+        .execution_options(synchronize_session=False)
+    )
+    items_changed = unlinked.rowcount
+    await db.execute(
+        sa_update(WatchlistEvent)
+        .where(WatchlistEvent.platform_id == platform.id)
+        .values(platform_id=None)
+        .execution_options(synchronize_session=False)
+    )
+    await db.execute(
+        sa_delete(PlatformStats)
+        .where(PlatformStats.platform_id == platform.id)
+        .execution_options(synchronize_session=False)
+    )
     await db.delete(platform)
+    await db.flush()
+    items_changed += await _relink(db, platform.user_id, version)
     await db.commit()
+    await bump_data_version(platform.user_id)
+    feed_service.platform_deleted(platform.user_id, platform.id)
+    if items_changed:
+        feed_service.resync(platform.user_id, "platform_relinked")
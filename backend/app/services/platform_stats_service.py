@@ -0,0 +1,202 @@
+"""
+Incremental maintenance of the ``platform_stats`` summary table.
+
+Watchlist write paths describe every item they add or remove as an
+``ItemKey`` — a status / type / platform change is a removal of the old key
+plus an addition of the new one — and call ``apply_changes`` after their own
+DML, before committing, so the summary commits or rolls back with the items.
+``rebuild`` recomputes the table from the watchlist for repair, and after
+platform changes that relink items.
+"""
+
+from collections import defaultdict
+from collections.abc import Iterable
+from datetime import datetime
+from typing import NamedTuple
+
+from sqlalchemy import Executable, case, delete, func, insert, literal, or_, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.platform_stats import STATUSES, TYPES, PlatformStats, cell_column
+from app.models.watchlist import WatchlistItem
+
+
+class ItemKey(NamedTuple):
+    platform_id: int | None
+    platform_name: str | None
+    status: str
+    type: str
+    added_at: datetime
+
+
+# Select these (e.g. in RETURNING) to build an ItemKey with item_key()
+KEY_COLUMNS = (
+    WatchlistItem.platform_id,
+    WatchlistItem.platform_name,
+    WatchlistItem.status,
+    WatchlistItem.type,
+    WatchlistItem.added_at,
+)
+
+
+def item_key(item) -> ItemKey:
+    """Works for ORM objects and result rows that include ``KEY_COLUMNS``."""
+    return ItemKey(
+        item.platform_id, item.platform_name, item.status, item.type, item.added_at
+    )
+
+
+# Which stats row an item is counted in: (platform_id, None) when linked,
+# otherwise (None, platform_name) — lowered in SQL, like the stored key.
+_Bucket = tuple[int | None, str | None]
+
+
+def _bucket(key: ItemKey) -> _Bucket:
+    if key.platform_id is not None:
+        return key.platform_id, None
+    return None, key.platform_name
+
+
+def _stats_row(bucket: _Bucket):
+    platform_id, name = bucket
+    if platform_id is not None:
+        return PlatformStats.platform_id == platform_id
+    if name is None:
+        return PlatformStats.platform_id.is_(None) & PlatformStats.platform_key.is_(None)
+    return PlatformStats.platform_key == func.lower(name)
+
+
+def _latest_added(user_id: int, bucket: _Bucket):
+    """max(added_at) over the watchlist rows that feed one stats row."""
+    platform_id, name = bucket
+    if platform_id is not None:
+        match = WatchlistItem.platform_id == platform_id
+    elif name is None:
+        match = WatchlistItem.platform_id.is_(None) & WatchlistItem.platform_name.is_(None)
+    else:
+        match = WatchlistItem.platform_id.is_(None) & (
+            func.lower(WatchlistItem.platform_name) == func.lower(name)
+        )
+    return (
+        select(func.max(WatchlistItem.added_at))
+        .where(WatchlistItem.user_id == user_id, match)
+        .scalar_subquery()
+    )
+
+
+async def apply_changes(
+    db: AsyncSession,
+    user_id: int,
+    added: Iterable[ItemKey] = (),
+    removed: Iterable[ItemKey] = (),
+) -> None:
+    """
+    Fold item additions / removals into the user's stats rows.
+
+    Counts are adjusted in place.  most_recent_added only moves forward on
+    additions; a removal at or after the stored value recomputes it from the
+    watchlist, so call this after the item DML has been executed.
+    """
+    deltas: dict[_Bucket, dict[str, int]] = defaultdict(lambda: defaultdict(int))
+    latest_added: dict[_Bucket, datetime] = {}
+    latest_removed: dict[_Bucket, datetime] = {}
+    for sign, keys, latest in ((1, added, latest_added), (-1, removed, latest_removed)):
+        for key in keys:
+            bucket = _bucket(key)
+            deltas[bucket][cell_column(key.status, key.type)] += sign
+            if bucket not in latest or key.added_at > latest[bucket]:
+                latest[bucket] = key.added_at
+
+    stats = PlatformStats
+    recent_type = stats.most_recent_added.type
+    emptied = False
+    for bucket, cells in deltas.items():
+        cells = {column: n for column, n in cells.items() if n}
+        if not cells:
+            continue
+        total = sum(cells.values())
+        emptied = emptied or total < 0
+
+        recent = stats.most_recent_added
+        if bucket in latest_added:
+            newest = literal(latest_added[bucket], recent_type)
+            recent = case(
+                (or_(stats.most_recent_added.is_(None), stats.most_recent_added < newest), newest),
+                else_=recent,
+            )
+        if bucket in latest_removed:
+            removed_at = literal(latest_removed[bucket], recent_type)
+            recent = case(
+                (stats.most_recent_added <= removed_at, _latest_added(user_id, bucket)),
+                else_=recent,
+            )
+
+        values = {column: getattr(stats, column) + n for column, n in cells.items()}
+        result = await db.execute(
+            update(stats)
+            .where(stats.user_id == user_id, _stats_row(bucket))
+            .values(total_items=stats.total_items + total, most_recent_added=recent, **values)
+            .execution_options(synchronize_session=False)
+        )
+        if result.rowcount == 0 and total > 0:
+            platform_id, name = bucket
+            await db.execute(
+                insert(stats).values(
+                    user_id=user_id,
+                    platform_id=platform_id,
+                    platform_key=None if name is None else func.lower(name),
+                    total_items=total,
+                    most_recent_added=latest_added.get(bucket),
+                    **cells,
+                )
+            )
+
+    if emptied:
+        await db.execute(
+            delete(stats)
+            .where(stats.user_id == user_id, stats.total_items <= 0)
+            .execution_options(synchronize_session=False)
+        )
+
+
+def rebuild_statements(user_id: int | None = None) -> list[Executable]:
+    """DELETE + INSERT ... SELECT that recompute stats rows from the watchlist."""
+    key = case((WatchlistItem.platform_id.is_(None), func.lower(WatchlistItem.platform_name)))
+    source = select(
+        WatchlistItem.user_id,
+        WatchlistItem.platform_id,
+        key,
+        func.count(),
+        *(
+            func.count(case(((WatchlistItem.status == s) & (WatchlistItem.type == t), 1)))
+            for s in STATUSES
+            for t in TYPES
+        ),
+        func.max(WatchlistItem.added_at),
+    ).group_by(WatchlistItem.user_id, WatchlistItem.platform_id, key)
+    clear = delete(PlatformStats).execution_options(synchronize_session=False)
+    if user_id is not None:
+        source = source.where(WatchlistItem.user_id == user_id)
+        clear = clear.where(PlatformStats.user_id == user_id)
+
+    columns = [
+        "user_id",
+        "platform_id",
+        "platform_key",
+        "total_items",
+        *(cell_column(s, t) for s in STATUSES for t in TYPES),
+        "most_recent_added",
+    ]
+    return [clear, insert(PlatformStats).from_select(columns, source)]
+
+
+async def rebuild(db: AsyncSession, user_id: int | None = None) -> int:
+    """Recompute stats for one user (or everyone); returns the rows written."""
+    for stmt in rebuild_statements(user_id):
+        await db.execute(stmt)
+    count = select(func.count()).select_from(PlatformStats)
+    if user_id is not None:
+        count = count.where(PlatformStats.user_id == user_id)
+    written = (await db.execute(count)).scalar_one()
+    await db.commit()
+    return written
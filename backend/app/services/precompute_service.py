@@ -0,0 +1,62 @@
+"""
+Background precompute of insights.
+
+Users who opened insights recently are remembered; any change to their data
+schedules a debounced recompute, and a stale read schedules one too.  The
+result is stored with ``store_latest`` and served by
+``stale_while_revalidate_response``, so requests rarely pay compute latency.
+"""
+
+from app.core.cache import TTLCache, get_data_version, on_data_change, store_latest
+from app.core.config import settings
+from app.core.database import AsyncSessionLocal
+from app.core.scheduler import RefreshScheduler
+
+_READER_TTL_SECONDS = 24 * 3600
+
+# user_id -> True for users who have requested insights within the TTL
+_readers = TTLCache(settings.RESULT_CACHE_MAX_ENTRIES)
+
+
+async def _refresh_insights(user_id: int) -> None:
+    from app.services import insights_service  # lazy: keeps NumPy out of startup
+
+    # Read the version first: a write landing mid-compute leaves this result
+    # tagged stale, and that write schedules another run anyway.
+    version = await get_data_version(user_id)
+    async with AsyncSessionLocal() as db:
+        out = await insights_service.compute_insights(db, user_id)
+    await store_latest("insights", user_id, version, out.model_dump_json().encode())
+
+
+insights_scheduler = RefreshScheduler(
+    _refresh_insights,
+    debounce=settings.INSIGHTS_REFRESH_DEBOUNCE_SECONDS,
+    max_delay=settings.INSIGHTS_REFRESH_MAX_DELAY_SECONDS,
+    concurrency=settings.INSIGHTS_REFRESH_CONCURRENCY,
+    max_pending=settings.INSIGHTS_REFRESH_MAX_PENDING,
+)
+
+
+def track_reader(user_id: int) -> None:
+    _readers.set(user_id, True, _READER_TTL_SECONDS)
+
+
+def request_insights_refresh(user_id: int) -> bool:
+    return insights_scheduler.schedule(user_id)
+
+
+def _on_data_change(user_id: int) -> None:
+    if _readers.get(user_id):
+        insights_scheduler.schedule(user_id)
+
+
+on_data_change(_on_data_change)
+
+
+def start() -> None:
+    insights_scheduler.start()
+
+
+async def stop() -> None:
+    await insights_scheduler.stop()
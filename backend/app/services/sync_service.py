@@ -0,0 +1,189 @@
+"""
+Delta sync for the watchlist.
+
+Every write that changes a user's items first takes the next
+``users.watchlist_version`` (``next_version``) and stamps it on the rows it
+inserts or updates; deleted rows leave a ``watchlist_tombstones`` row with
+it.  The UPDATE that bumps the counter holds the user's row until commit, so
+versions become visible strictly in order: once version N is readable,
+every change up to N is too.
+
+``changes`` returns what changed after a sync token, ordered by
+(version, id) and paged.  A token older than the pruned tombstones can no
+longer be patched forward; the client gets a fresh snapshot flagged
+``reset`` instead.
+"""
+
+import base64
+from collections.abc import Iterable
+from datetime import datetime
+
+from sqlalchemy import delete as sa_delete, func, insert, select, tuple_, update as sa_update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.user import User
+from app.models.watchlist import WatchlistItem
+from app.models.watchlist_tombstone import WatchlistTombstone
+from app.schemas.watchlist import WatchlistItemOut
+
+_ITEM_COLUMNS = [getattr(WatchlistItem, f) for f in WatchlistItemOut.model_fields]
+
+
+async def next_version(db: AsyncSession, user_id: int) -> int:
+    """Bump and return the user's watchlist version, inside the caller's transaction."""
+    result = await db.execute(
+        sa_update(User)
+        .where(User.id == user_id)
+        .values(watchlist_version=User.watchlist_version + 1)
+        .returning(User.watchlist_version)
+        .execution_options(synchronize_session=False)
+    )
+    return result.scalar_one()
+
+
+async def record_deletions(
+    db: AsyncSession, user_id: int, item_ids: Iterable[int], version: int
+) -> None:
+    rows = [
+        {"user_id": user_id, "item_id": item_id, "version": version} for item_id in item_ids
+    ]
+    if rows:
+        await db.execute(insert(WatchlistTombstone), rows)
+
+
+async def prune_tombstones(db: AsyncSession, before: datetime) -> int:
+    """
+    Delete tombstones older than ``before``, raising each affected user's
+    tombstone floor past them first.  Returns how many were deleted.
+    """
+    pruned = (
+        select(func.max(WatchlistTombstone.version))
+        .where(WatchlistTombstone.user_id == User.id, WatchlistTombstone.deleted_at < before)
+        .scalar_subquery()
+    )
+    await db.execute(
+        sa_update(User)
+        .where(pruned > User.watchlist_tombstone_floor)
+        .values(watchlist_tombstone_floor=pruned)
+        .execution_options(synchronize_session=False)
+    )
+    result = await db.execute(
+        sa_delete(WatchlistTombstone).where(WatchlistTombstone.deleted_at < before)
+    )
+    await db.commit()
+    return result.rowcount
+
+
+# ---------------------------------------------------------------------------
+# Reading changes
+# ---------------------------------------------------------------------------
+#
+# A token is (version, id, floor): the client holds every change up to
+# (version, id) — id None meaning all of that version — and needs no
+# tombstone at or below ``floor``.  A first sync pages through a snapshot
+# of live rows with floor set to the version it started from, so old
+# tombstones are never sent to a client that never saw those items.
+
+
+def encode_token(version: int, item_id: int | None, floor: int) -> str:
+    raw = f"sync|{version}|{'' if item_id is None else item_id}|{floor}"
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def decode_token(token: str) -> tuple[int, int | None, int]:
+    """Raises ValueError if the token was not produced by encode_token."""
+    try:
+        raw = base64.urlsafe_b64decode(token + "=" * (-len(token) % 4)).decode()
+        tag, version, item_id, floor = raw.split("|")
+        if tag != "sync":
+            raise ValueError
+        return int(version), int(item_id) if item_id else None, int(floor)
+    except (ValueError, UnicodeDecodeError) as exc:
+        raise ValueError("Invalid sync token") from exc
+
+
+def _after(version_column, id_column, version: int, item_id: int | None):
+    if item_id is None:
+        return version_column > version
+    return tuple_(version_column, id_column) > tuple_(version, item_id)
+
+
+async def changes(
+    db: AsyncSession, user_id: int, token: str | None, limit: int
+) -> dict:
+    """
+    Items created or updated and ids deleted after ``token`` (None: a full
+    snapshot), at most ``limit`` of them.  Items are WatchlistItemOut-shaped
+    dicts.  Keep calling with ``next_token`` while ``has_more``.
+    """
+    current, pruned = (
+        await db.execute(
+            select(User.watchlist_version, User.watchlist_tombstone_floor).where(
+                User.id == user_id
+            )
+        )
+    ).one()
+
+    reset = False
+    if token is not None:
+        version, item_id, floor = decode_token(token)
+        # Tokens from the future belong to another database (e.g. a restore)
+        reset = max(version, floor) < pruned or version > current
+    if token is None or reset:
+        # From -1: rows written before versioning, or by bulk loads that
+        # bypass the services, keep version 0
+        version, item_id, floor = -1, None, current
+
+    # Capped at the version read above: both queries then see the same set
+    # even if a write commits between them.
+    items_query = (
+        select(WatchlistItem.version, *_ITEM_COLUMNS)
+        .where(
+            WatchlistItem.user_id == user_id,
+            _after(WatchlistItem.version, WatchlistItem.id, version, item_id),
+            WatchlistItem.version <= current,
+        )
+        .order_by(WatchlistItem.version, WatchlistItem.id)
+        .limit(limit + 1)
+    )
+    tombstones_query = (
+        select(WatchlistTombstone.version, WatchlistTombstone.item_id)
+        .where(
+            WatchlistTombstone.user_id == user_id,
+            _after(WatchlistTombstone.version, WatchlistTombstone.item_id, version, item_id),
+            WatchlistTombstone.version > floor,
+            WatchlistTombstone.version <= current,
+        )
+        .order_by(WatchlistTombstone.version, WatchlistTombstone.item_id)
+        .limit(limit + 1)
+    )
+    rows = [(row.version, row.id, row) for row in (await db.execute(items_query))]
+    if floor < current:
+        rows += [(row.version, row.item_id, None) for row in (await db.execute(tombstones_query))]
+    rows.sort(key=lambda r: (r[0], r[1]))
+
+    has_more = len(rows) > limit
+    rows = rows[:limit]
+    # Later entries win: an id can be deleted and then reused by a new row
+    latest: dict[int, object] = {}
+    for _, row_id, row in rows:
+        latest.pop(row_id, None)
+        latest[row_id] = row
+    items = [
+        {c.key: getattr(row, c.key) for c in _ITEM_COLUMNS}
+        for row in latest.values()
+        if row is not None
+    ]
+    deleted = [row_id for row_id, row in latest.items() if row is None]
+
+    if has_more:
+        next_token = encode_token(rows[-1][0], rows[-1][1], floor)
+    else:
+        next_token = encode_token(current, None, floor)
+    return {
+        "items": items,
+        "deleted": deleted,
+        "next_token": next_token,
+        "has_more": has_more,
+        "reset": reset,
+    }
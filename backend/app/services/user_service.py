@@ -1,10 +1,30 @@
-from sqlalchemy import select
+from sqlalchemy import delete as sa_delete, select
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.core.security import hash_password, verify_password
-from app.models.user import User
+from app.core.cache import bump_data_version
+from app.core.deps import invalidate_principal
+from app.core.security import hash_password_async, verify_password_async
+from app.models import (
+    Platform,
+    PlatformRecommendation,
+    PlatformStats,
+    User,
+    WatchlistEvent,
+    WatchlistItem,
+    WatchlistTombstone,
+)
 from app.schemas.auth import UserCreate
 
+# Everything an account owns, children before parents
+_OWNED = (
+    PlatformRecommendation,
+    PlatformStats,
+    WatchlistEvent,
+    WatchlistTombstone,
+    WatchlistItem,
+    Platform,
+)
+
 
 async def get_by_email(db: AsyncSession, email: str) -> User | None:
     result = await db.execute(
@@ -20,7 +40,7 @@ async def get_by_id(db: AsyncSession, user_id: int) -> User | None:
 async def create(db: AsyncSession, data: UserCreate) -> User:
     user = User(
         email=data.email.lower(),
-        hashed_password=hash_password(data.password),
+        hashed_password=await hash_password_async(data.password),
     )
     db.add(user)
     await db.commit()
@@ -28,12 +48,48 @@ async def create(db: AsyncSession, data: UserCreate) -> User:
     return user
 
 
+# ``user`` in these is usually the principal from get_current_user: a cached
+# instance that no session tracks (or, with AUTH_CACHE_SHARED, rebuilt from
+# the cache), so the row itself is loaded into ``db`` before it is changed.
+
+
+async def set_password(db: AsyncSession, user: User, password: str) -> None:
+    hashed = await hash_password_async(password)
+    row = await db.get(User, user.id)
+    if row is None:
+        return
+    row.hashed_password = hashed
+    await db.commit()
+    await invalidate_principal(row.email)
+
+
+async def delete(db: AsyncSession, user: User) -> None:
+    """
+    Delete the account and everything it owns.  Explicit deletes: SQLite
+    only honours ON DELETE CASCADE with foreign key enforcement turned on.
+    """
+    row = await db.get(User, user.id)
+    if row is None:
+        return
+    for model in _OWNED:
+        await db.execute(
+            sa_delete(model)
+            .where(model.user_id == row.id)
+            .execution_options(synchronize_session=False)
+        )
+    await db.delete(row)
+    await db.commit()
+    await invalidate_principal(row.email)
+    # A reused id must not be served this account's cached analytics
+    await bump_data_version(row.id)
+
+
 async def authenticate(
     db: AsyncSession, email: str, password: str
 ) -> User | None:
     user = await get_by_email(db, email)
     if not user:
         return None
-    if not verify_password(password, user.hashed_password):
+    if not await verify_password_async(password, user.hashed_password):
         return None
     return user
@@ -1,8 +1,36 @@
-from sqlalchemy import select
+import base64
+import csv
+import io
+import json
+import re
+from collections.abc import AsyncIterator
+from datetime import datetime, timezone
+
+from sqlalchemy import (
+    bindparam,
+    delete as sa_delete,
+    func,
+    insert,
+    or_,
+    select,
+    tuple_,
+    update as sa_update,
+)
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.models.watchlist import WatchlistItem
-from app.schemas.watchlist import WatchlistItemCreate, WatchlistItemUpdate
+from app.core.cache import bump_data_version
+from app.models.watchlist import WatchlistItem, watchlist_fts
+from app.models.watchlist_event import STATUS_CODES, WatchlistEvent
+from app.schemas.watchlist import (
+    BatchItemResult,
+    WatchlistBatchResult,
+    WatchlistItemBatchUpdate,
+    WatchlistItemCreate,
+    WatchlistItemOut,
+    WatchlistItemUpdate,
+)
+from app.services import feed_service, platform_service, platform_stats_service, sync_service
+from app.services.platform_stats_service import KEY_COLUMNS, ItemKey, item_key
 
 
 async def get_all(
@@ -19,30 +47,507 @@ async def get_all(
     return list(result.scalars().all())
 
 
+# Columns a client may ask for with ?fields=; id and added_at always come back
+# because the keyset cursor is built from them.
+PROJECTABLE_FIELDS = {
+    "id", "title", "type", "status", "platform_name", "poster_url", "notes", "added_at",
+}
+_CURSOR_FIELDS = ("id", "added_at")
+# Full listing rows: exactly WatchlistItemOut's fields, in its order
+_OUT_FIELDS = list(WatchlistItemOut.model_fields)
+_OUT_COLUMNS = [getattr(WatchlistItem, f) for f in _OUT_FIELDS]
+
+
+def parse_fields(fields: str | None) -> list[str] | None:
+    """Turn ``"title,status"`` into a column list. Raises ValueError on unknown names."""
+    if not fields:
+        return None
+    requested = [f.strip() for f in fields.split(",") if f.strip()]
+    unknown = set(requested) - PROJECTABLE_FIELDS
+    if unknown:
+        raise ValueError(f"Unknown field(s): {', '.join(sorted(unknown))}")
+    return list(_CURSOR_FIELDS) + [f for f in requested if f not in _CURSOR_FIELDS]
+
+
+def encode_cursor(added_at: datetime, item_id: int) -> str:
+    raw = f"{added_at.isoformat()}|{item_id}".encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> tuple[datetime, int]:
+    """Raises ValueError if the cursor was not produced by encode_cursor."""
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)).decode()
+        added_at, item_id = raw.split("|")
+        return datetime.fromisoformat(added_at), int(item_id)
+    except (ValueError, UnicodeDecodeError) as exc:
+        raise ValueError("Invalid cursor") from exc
+
+
+async def get_page(
+    db: AsyncSession,
+    user_id: int,
+    status: str | None = None,
+    limit: int | None = None,
+    cursor: str | None = None,
+    fields: list[str] | None = None,
+) -> tuple[list[dict], str | None]:
+    """
+    Keyset-paginated listing, newest first, ordered by (added_at, id).
+
+    Returns plain dicts, never ORM objects: without ``fields`` each one
+    carries exactly WatchlistItemOut's fields, so routes can encode them
+    directly.  The second element is the cursor for the next page, or None
+    when this page is the last.
+    """
+    columns = [getattr(WatchlistItem, f) for f in fields] if fields else _OUT_COLUMNS
+    query = (
+        select(*columns)
+        .where(WatchlistItem.user_id == user_id)
+        .order_by(WatchlistItem.added_at.desc(), WatchlistItem.id.desc())
+    )
+    if status:
+        query = query.where(WatchlistItem.status == status)
+    if cursor:
+        after_added_at, after_id = decode_cursor(cursor)
+        query = query.where(
+            tuple_(WatchlistItem.added_at, WatchlistItem.id)
+            < tuple_(after_added_at, after_id)
+        )
+    if limit:
+        query = query.limit(limit + 1)
+
+    result = await db.execute(query)
+    keys = list(result.keys())
+    rows = [dict(zip(keys, row)) for row in result.all()]
+
+    next_cursor = None
+    if limit and len(rows) > limit:
+        rows = rows[:limit]
+        next_cursor = encode_cursor(rows[-1]["added_at"], rows[-1]["id"])
+    return rows, next_cursor
+
+
+# ---------------------------------------------------------------------------
+# Full-text search
+# ---------------------------------------------------------------------------
+
+_SEARCH_MAX_TERMS = 8
+# Column weights for (user_id, title, notes): a title hit outranks a notes hit.
+# Set as the query's rank function, so FTS5 returns rows already in rank
+# order (ties by id) and SQLite needs no sort of its own.
+_SEARCH_RANK = "bm25(0.0, 4.0, 1.0)"
+
+
+def search_terms(q: str) -> list[str]:
+    """The words of ``q``, lowercased. Raises ValueError if there are none."""
+    terms = re.findall(r"\w+", q.lower())[:_SEARCH_MAX_TERMS]
+    if not terms:
+        raise ValueError("Search query has no words to match")
+    return terms
+
+
+def _match_expression(user_id: int, terms: list[str]) -> str:
+    # Terms are \w+ only, so quoting them is enough to keep FTS5 syntax out.
+    # Every word is a prefix and all must match, in the title or the notes.
+    words = " ".join(f'"{t}"*' for t in terms)
+    return f'user_id:"{user_id}" AND {{title notes}}:({words})'
+
+
+def _encode_offset(offset: int) -> str:
+    return base64.urlsafe_b64encode(f"search|{offset}".encode()).decode().rstrip("=")
+
+
+def _decode_offset(cursor: str) -> int:
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)).decode()
+        tag, offset = raw.split("|")
+        if tag != "search" or int(offset) < 0:
+            raise ValueError
+        return int(offset)
+    except (ValueError, UnicodeDecodeError) as exc:
+        raise ValueError("Invalid cursor") from exc
+
+
+async def search(
+    db: AsyncSession,
+    user_id: int,
+    q: str,
+    status: str | None = None,
+    platform: str | None = None,
+    limit: int = 20,
+    cursor: str | None = None,
+) -> tuple[list[dict], str | None]:
+    """
+    Items whose title or notes contain every word of ``q`` as a prefix,
+    best match first (BM25, title weighted over notes).  Rows are
+    WatchlistItemOut-shaped dicts, paged like ``get_page``.
+
+    On SQLite this reads the ``watchlist_fts`` index; other backends fall
+    back to case-insensitive substring matching, newest first.
+    """
+    terms = search_terms(q)
+    offset = _decode_offset(cursor) if cursor else 0
+
+    query = select(*_OUT_COLUMNS).where(
+        WatchlistItem.user_id == user_id
+    )
+    if db.get_bind().dialect.name == "sqlite":
+        query = (
+            query.select_from(watchlist_fts)
+            .join(WatchlistItem, WatchlistItem.id == watchlist_fts.c.rowid)
+            .where(
+                watchlist_fts.c.watchlist_fts.match(_match_expression(user_id, terms)),
+                watchlist_fts.c.rank.match(_SEARCH_RANK),
+            )
+            .order_by(watchlist_fts.c.rank)
+        )
+    else:
+        query = query.where(
+            *(
+                or_(
+                    WatchlistItem.title.icontains(t, autoescape=True),
+                    WatchlistItem.notes.icontains(t, autoescape=True),
+                )
+                for t in terms
+            )
+        ).order_by(WatchlistItem.added_at.desc(), WatchlistItem.id.desc())
+    if status:
+        query = query.where(WatchlistItem.status == status)
+    if platform:
+        query = query.where(func.lower(WatchlistItem.platform_name) == func.lower(platform))
+    query = query.limit(limit + 1).offset(offset)
+
+    result = await db.execute(query)
+    keys = list(result.keys())
+    rows = [dict(zip(keys, row)) for row in result.all()]
+
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        next_cursor = _encode_offset(offset + limit)
+    return rows, next_cursor
+
+
 async def get_by_id(db: AsyncSession, item_id: int) -> WatchlistItem | None:
     return await db.get(WatchlistItem, item_id)
 
 
+_EVENT_INSERT = insert(WatchlistEvent.__table__).values(
+    platform_key=func.lower(bindparam("platform_name"))
+)
+
+
+async def _record_status_changes(
+    db: AsyncSession, user_id: int, changes: list[tuple[int, ItemKey]]
+) -> None:
+    """Append a watchlist_events row per (item_id, key after the change)."""
+    if not changes:
+        return
+    now = datetime.now(timezone.utc)
+    await db.execute(
+        _EVENT_INSERT,
+        [
+            {
+                "user_id": user_id,
+                "item_id": item_id,
+                "platform_id": key.platform_id,
+                "platform_name": key.platform_name,
+                "status": STATUS_CODES[key.status],
+                "occurred_at": now,
+            }
+            for item_id, key in changes
+        ],
+    )
+
+
 async def create(
     db: AsyncSession, data: WatchlistItemCreate, user_id: int
 ) -> WatchlistItem:
-    item = WatchlistItem(**data.model_dump(), user_id=user_id)
+    platform_ids = await platform_service.resolve_ids(db, user_id, [data.platform_name])
+    item = WatchlistItem(
+        **data.model_dump(),
+        user_id=user_id,
+        platform_id=platform_ids.get(data.platform_name),
+        version=await sync_service.next_version(db, user_id),
+    )
     db.add(item)
+    await db.flush()
+    await platform_stats_service.apply_changes(db, user_id, added=[item_key(item)])
     await db.commit()
     await db.refresh(item)
+    await bump_data_version(item.user_id)
+    feed_service.items_upserted(item.user_id, [item])
     return item
 
 
+async def _reload(db: AsyncSession, item: WatchlistItem) -> bool:
+    """
+    Re-read ``item`` inside the write transaction; False if it is gone.
+
+    Call after ``next_version``, whose lock serializes the user's writers:
+    ``item`` may have been loaded before a concurrent write to it committed,
+    and stats deltas must start from the row as it is now.
+    """
+    result = await db.execute(
+        select(WatchlistItem)
+        .where(WatchlistItem.id == item.id)
+        .execution_options(populate_existing=True)
+    )
+    return result.scalar_one_or_none() is not None
+
+
 async def update(
     db: AsyncSession, item: WatchlistItem, data: WatchlistItemUpdate
-) -> WatchlistItem:
-    for field, value in data.model_dump(exclude_none=True).items():
+) -> WatchlistItem | None:
+    """Returns None if the item was deleted concurrently."""
+    values = data.model_dump(exclude_none=True)
+    if values:
+        values["version"] = await sync_service.next_version(db, item.user_id)
+        if not await _reload(db, item):
+            await db.rollback()
+            return None
+    before = item_key(item)
+    if "platform_name" in values:
+        platform_ids = await platform_service.resolve_ids(
+            db, item.user_id, [values["platform_name"]]
+        )
+        values["platform_id"] = platform_ids.get(values["platform_name"])
+    for field, value in values.items():
         setattr(item, field, value)
+    after = item_key(item)
+    if after != before:
+        await db.flush()
+        await platform_stats_service.apply_changes(
+            db, item.user_id, added=[after], removed=[before]
+        )
+    if after.status != before.status:
+        await _record_status_changes(db, item.user_id, [(item.id, after)])
     await db.commit()
     await db.refresh(item)
+    await bump_data_version(item.user_id)
+    feed_service.items_upserted(item.user_id, [item])
     return item
 
 
-async def delete(db: AsyncSession, item: WatchlistItem) -> None:
+async def delete(db: AsyncSession, item: WatchlistItem) -> bool:
+    """Returns False if the item was already deleted concurrently."""
+    version = await sync_service.next_version(db, item.user_id)
+    if not await _reload(db, item):
+        await db.rollback()
+        return False
+    await sync_service.record_deletions(db, item.user_id, [item.id], version)
     await db.delete(item)
+    await db.flush()
+    await platform_stats_service.apply_changes(db, item.user_id, removed=[item_key(item)])
+    await db.commit()
+    await bump_data_version(item.user_id)
+    feed_service.items_deleted(item.user_id, [item.id])
+    return True
+
+
+# ---------------------------------------------------------------------------
+# Batch operations — one transaction and one commit per call
+# ---------------------------------------------------------------------------
+
+def _batch_result(results: list[BatchItemResult]) -> WatchlistBatchResult:
+    failed = sum(1 for r in results if r.status == "not_found")
+    return WatchlistBatchResult(
+        succeeded=len(results) - failed, failed=failed, results=results
+    )
+
+
+async def _owned_keys(
+    db: AsyncSession, user_id: int, ids: list[int]
+) -> dict[int, ItemKey]:
+    result = await db.execute(
+        select(WatchlistItem.id, *KEY_COLUMNS).where(
+            WatchlistItem.user_id == user_id, WatchlistItem.id.in_(set(ids))
+        )
+    )
+    return {row.id: item_key(row) for row in result}
+
+
+async def create_many(
+    db: AsyncSession, items: list[WatchlistItemCreate], user_id: int
+) -> WatchlistBatchResult:
+    """Multi-row INSERT ... RETURNING, paged by the dialect's insertmanyvalues."""
+    platform_ids = await platform_service.resolve_ids(
+        db, user_id, (item.platform_name for item in items)
+    )
+    version = await sync_service.next_version(db, user_id)
+    rows = [
+        {
+            **item.model_dump(),
+            "user_id": user_id,
+            "platform_id": platform_ids.get(item.platform_name),
+            "version": version,
+        }
+        for item in items
+    ]
+    # The full rows come back for the change feed; they include KEY_COLUMNS.
+    # sort_by_parameter_order=True degrades to one INSERT per row on SQLite,
+    # where ids are allocated in VALUES order behind the single writer, so
+    # sorting them restores request order there.  Elsewhere (PostgreSQL
+    # assigns ids however its plan reads the VALUES) the dialect sorts.
+    sqlite = db.get_bind().dialect.name == "sqlite"
+    result = await db.execute(
+        insert(WatchlistItem).returning(
+            *_OUT_COLUMNS, sort_by_parameter_order=not sqlite
+        ),
+        rows,
+    )
+    created = result.all()
+    await platform_stats_service.apply_changes(
+        db, user_id, added=[item_key(row) for row in created]
+    )
+    new_ids = [row.id for row in created]
+    if sqlite:
+        new_ids.sort()
     await db.commit()
+    await bump_data_version(user_id)
+    feed_service.items_upserted(user_id, created)
+    return _batch_result([
+        BatchItemResult(index=i, id=item_id, status="created")
+        for i, item_id in enumerate(new_ids)
+    ])
+
+
+async def update_many(
+    db: AsyncSession, items: list[WatchlistItemBatchUpdate], user_id: int
+) -> WatchlistBatchResult:
+    """Bulk UPDATE by primary key, limited to items the user owns."""
+    requested = [item.model_dump(exclude_none=True) for item in items]
+    # Lock before reading the current keys, so the stats deltas start from
+    # committed rows no concurrent write can change before ours
+    version = None
+    if any(len(values) > 1 for values in requested):  # more than just the id
+        version = await sync_service.next_version(db, user_id)
+    keys = await _owned_keys(db, user_id, [item.id for item in items])
+    platform_ids = await platform_service.resolve_ids(
+        db, user_id, (item.platform_name for item in items if item.id in keys)
+    )
+
+    params = []
+    added: list[ItemKey] = []
+    removed: list[ItemKey] = []
+    transitions: list[tuple[int, ItemKey]] = []
+    results: list[BatchItemResult] = []
+    for i, (item, values) in enumerate(zip(items, requested)):
+        if item.id not in keys:
+            results.append(BatchItemResult(index=i, id=item.id, status="not_found"))
+            continue
+        if len(values) > 1:
+            if "platform_name" in values:
+                values["platform_id"] = platform_ids.get(values["platform_name"])
+            params.append(values)
+            before = keys[item.id]
+            after = before._replace(
+                **{
+                    f: values[f]
+                    for f in ("platform_id", "platform_name", "status", "type")
+                    if f in values
+                }
+            )
+            if after != before:
+                removed.append(before)
+                added.append(after)
+                keys[item.id] = after
+            if after.status != before.status:
+                transitions.append((item.id, after))
+        results.append(BatchItemResult(index=i, id=item.id, status="updated"))
+
+    if params:
+        for values in params:
+            values["version"] = version
+        await db.execute(sa_update(WatchlistItem), params)
+        await platform_stats_service.apply_changes(db, user_id, added=added, removed=removed)
+        await _record_status_changes(db, user_id, transitions)
+    changed = []
+    if params and feed_service.wants(user_id):
+        result = await db.execute(
+            select(*_OUT_COLUMNS).where(WatchlistItem.id.in_({p["id"] for p in params}))
+        )
+        changed = result.all()
+    await db.commit()
+    if params:
+        await bump_data_version(user_id)
+        feed_service.items_upserted(user_id, changed)
+    return _batch_result(results)
+
+
+async def delete_many(
+    db: AsyncSession, ids: list[int], user_id: int
+) -> WatchlistBatchResult:
+    # Taken first, like every write: the counter row is locked before any item
+    version = await sync_service.next_version(db, user_id)
+    result = await db.execute(
+        sa_delete(WatchlistItem)
+        .where(WatchlistItem.user_id == user_id, WatchlistItem.id.in_(set(ids)))
+        .returning(WatchlistItem.id, *KEY_COLUMNS)
+    )
+    rows = result.all()
+    await sync_service.record_deletions(db, user_id, (row.id for row in rows), version)
+    await platform_stats_service.apply_changes(
+        db, user_id, removed=[item_key(row) for row in rows]
+    )
+    deleted = {row.id for row in rows}
+    await db.commit()
+    if deleted:
+        await bump_data_version(user_id)
+        feed_service.items_deleted(user_id, sorted(deleted))
+    # Each row is deleted once; a repeated id finds nothing the second time
+    results = []
+    pending = set(deleted)
+    for i, item_id in enumerate(ids):
+        status = "deleted" if item_id in pending else "not_found"
+        pending.discard(item_id)
+        results.append(BatchItemResult(index=i, id=item_id, status=status))
+    return _batch_result(results)
+
+
+# ---------------------------------------------------------------------------
+# Export — streamed in bounded chunks straight off a server-side cursor
+# ---------------------------------------------------------------------------
+
+EXPORT_FIELDS = ["id", "title", "type", "status", "platform_name", "poster_url", "notes", "added_at"]
+_EXPORT_CHUNK_ROWS = 500
+
+
+def _export_value(value):
+    return value.isoformat() if isinstance(value, datetime) else value
+
+
+async def export_chunks(
+    db: AsyncSession, user_id: int, fmt: str
+) -> AsyncIterator[str]:
+    """
+    Yield the user's watchlist as NDJSON or CSV text, one chunk per
+    ``_EXPORT_CHUNK_ROWS`` rows.  Only one chunk is ever held in memory.
+    """
+    if fmt == "csv":
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+        writer.writerow(EXPORT_FIELDS)
+        yield buffer.getvalue()
+
+    query = (
+        select(*(getattr(WatchlistItem, f) for f in EXPORT_FIELDS))
+        .where(WatchlistItem.user_id == user_id)
+        .order_by(WatchlistItem.added_at.desc(), WatchlistItem.id.desc())
+        .execution_options(yield_per=_EXPORT_CHUNK_ROWS)
+    )
+    result = await db.stream(query)
+    async for partition in result.partitions():
+        if fmt == "csv":
+            buffer = io.StringIO()
+            writer = csv.writer(buffer)
+            writer.writerows([_export_value(v) for v in row] for row in partition)
+            yield buffer.getvalue()
+        else:
+            yield "".join(
+                json.dumps(
+                    {f: _export_value(v) for f, v in zip(EXPORT_FIELDS, row)}
+                ) + "\n"
+                for row in partition
+            )
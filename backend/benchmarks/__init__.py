@@ -0,0 +1,6 @@
+"""
+Load benchmarks for the API.
+
+    python -m benchmarks run --users 50 --max-items 50000 --out bench.json
+    python -m benchmarks compare base.json bench.json
+"""
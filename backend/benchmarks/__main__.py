@@ -0,0 +1,343 @@
+import argparse
+import asyncio
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from dataclasses import asdict
+from datetime import datetime, timezone
+
+SCENARIOS = ("login", "watchlist", "discovery", "insights", "search")
+# Not run by default: unpaged listing, dominated by serialization on big lists
+EXTRA_SCENARIOS = ("watchlist_all",)
+# GETs only, for the multi-worker scaling run
+READ_SCENARIOS = ("watchlist", "discovery", "insights", "search")
+COMPARED_METRICS = ("p50_ms", "p95_ms", "p99_ms", "cpu_ms_per_request")
+_DATABASE_URL_HELP = (
+    "Seed this empty database instead of a temp SQLite file, "
+    "e.g. postgresql+asyncpg://localhost/streamtracker_bench"
+)
+
+
+def _git_commit() -> str | None:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True, text=True, check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def _scenario_requests(name: str):
+    from benchmarks.driver import json_body
+    from benchmarks.seed import TITLE_WORDS
+
+    api = "/api/v1"
+
+    def auth(user):
+        return {"authorization": f"Bearer {user['token']}"}
+
+    if name == "login":
+        def request(rnd, user):
+            headers, body = json_body({"email": user["email"], "password": user["password"]})
+            return "POST", f"{api}/auth/login", headers, body
+    elif name == "watchlist":
+        def request(rnd, user):
+            return "GET", f"{api}/watchlist/?limit=50", auth(user), b""
+    elif name == "watchlist_all":
+        def request(rnd, user):
+            return "GET", f"{api}/watchlist/", auth(user), b""
+    elif name == "search":
+        def request(rnd, user):
+            # One full word plus the prefix of another, as typed in a search box
+            q = f"{rnd.choice(TITLE_WORDS)} {rnd.choice(TITLE_WORDS)[:3]}"
+            return "GET", f"{api}/watchlist/search?q={q.replace(' ', '+')}", auth(user), b""
+    else:
+        def request(rnd, user):
+            return "GET", f"{api}/{name}/", auth(user), b""
+    return request
+
+
+def _fresh_sqlite_url(db_path: str | None) -> str:
+    db_path = db_path or os.path.join(tempfile.mkdtemp(prefix="bench-"), "bench.db")
+    if os.path.exists(db_path):
+        sys.exit(f"{db_path} already exists; benchmarks always seed a fresh database")
+    return f"sqlite+aiosqlite:///{db_path}"
+
+
+async def _run(args: argparse.Namespace) -> dict:
+    # Settings are read at import time, so configure before touching app.*
+    os.environ["DATABASE_URL"] = args.database_url or _fresh_sqlite_url(args.db)
+    os.environ["SERVER_TIMING_ENABLED"] = "false"
+    if args.cold:
+        os.environ["RESULT_CACHE_BACKEND"] = "benchmarks.nocache:NullCacheBackend"
+
+    from app.main import app
+    from benchmarks.driver import Scenario, call, json_body, run_scenario
+    from benchmarks.seed import SeedConfig, seed
+
+    config = SeedConfig(
+        users=args.users,
+        min_items=args.min_items,
+        max_items=args.max_items,
+        skew=args.skew,
+        seed=args.seed,
+    )
+    started = time.perf_counter()
+    users = await seed(config)
+    seeded_in = time.perf_counter() - started
+    sizes = [u["items"] for u in users]
+    print(f"Seeded {len(users)} users / {sum(sizes)} items in {seeded_in:.1f}s", file=sys.stderr)
+
+    results = {}
+    async with app.router.lifespan_context(app):
+        for user in users:
+            headers, body = json_body({"email": user["email"], "password": user["password"]})
+            reply = await call(app, "POST", "/api/v1/auth/login", headers, body)
+            user["token"] = json.loads(reply.body)["access_token"]
+
+        for i, name in enumerate(args.scenarios):
+            request = _scenario_requests(name)
+            warmup = Scenario(name, request, args.warmup, args.concurrency)
+            await run_scenario(app, warmup, users, seed=args.seed + 1000 + i)
+            scenario = Scenario(name, request, args.requests, args.concurrency)
+            results[name] = await run_scenario(app, scenario, users, seed=args.seed + i)
+            print(f"{name:>10}: {json.dumps(results[name])}", file=sys.stderr)
+
+    return {
+        "meta": _meta(
+            requests=args.requests,
+            warmup=args.warmup,
+            concurrency=args.concurrency,
+            cold=args.cold,
+            seed_config=asdict(config),
+        ),
+        "population": {
+            "users": len(users),
+            "items": sum(sizes),
+            "median_items": statistics.median(sizes) if sizes else 0,
+            "max_items": max(sizes, default=0),
+            "seed_seconds": round(seeded_in, 2),
+        },
+        "scenarios": results,
+    }
+
+
+def run(args: argparse.Namespace) -> None:
+    _write_report(asyncio.run(_run(args)), args.out)
+
+
+def _meta(**extra) -> dict:
+    return {
+        "commit": _git_commit(),
+        "created_at": datetime.now(timezone.utc).isoformat(),
+        "python": platform.python_version(),
+        "machine": platform.platform(),
+        "cpus": os.cpu_count(),
+        "database": os.environ["DATABASE_URL"].split(":", 1)[0],
+        **extra,
+    }
+
+
+def _write_report(report: dict, out: str | None) -> None:
+    text = json.dumps(report, indent=2)
+    if out:
+        with open(out, "w") as f:
+            f.write(text + "\n")
+    else:
+        print(text)
+
+
+def scale(args: argparse.Namespace) -> None:
+    """Throughput of read routes at each worker count, served over real HTTP."""
+    import multiprocessing
+    import random
+
+    workdir = tempfile.mkdtemp(prefix="bench-scale-")
+    os.environ["DATABASE_URL"] = args.database_url or _fresh_sqlite_url(
+        os.path.join(workdir, "bench.db")
+    )
+
+    from app.core.security import create_access_token
+    from benchmarks import scale as driver
+    from benchmarks.seed import SeedConfig, seed
+
+    config = SeedConfig(
+        users=args.users,
+        min_items=args.min_items,
+        max_items=args.max_items,
+        skew=args.skew,
+        seed=args.seed,
+    )
+    users = asyncio.run(seed(config))
+    for user in users:
+        user["token"] = create_access_token(user["email"])
+    print(f"Seeded {len(users)} users / {sum(u['items'] for u in users)} items", file=sys.stderr)
+
+    # Every worker count gets the same shared backend, so only the count varies
+    env = {
+        "DATABASE_URL": os.environ["DATABASE_URL"],
+        "RESULT_CACHE_BACKEND": "app.core.shared_cache:SQLiteCacheBackend",
+        "AUTH_CACHE_SHARED": "true",
+        "SERVER_TIMING_ENABLED": "false",
+    }
+    clients = args.clients or max(args.workers)
+    context = multiprocessing.get_context("spawn")
+    runs: dict[str, dict] = {}
+    for workers in args.workers:
+        cache_path = os.path.join(workdir, f"cache-{workers}.db")
+        server = driver.start_server(workers, args.port, {**env, "SHARED_CACHE_PATH": cache_path})
+        try:
+            runs[str(workers)] = {}
+            for i, name in enumerate(args.scenarios):
+                request = _scenario_requests(name)
+                plans = []
+                for c in range(clients):
+                    rnd = random.Random(args.seed * 1000 + i * 100 + c)
+                    plans.append([
+                        driver.render_get(path, headers)
+                        for _, path, headers, _ in (
+                            request(rnd, rnd.choice(users)) for _ in range(2000)
+                        )
+                    ])
+                with context.Pool(clients) as pool:
+                    for seconds, record in ((args.warmup_seconds, False), (args.seconds, True)):
+                        results = pool.starmap(
+                            driver.run_client,
+                            [(args.port, plan, seconds, args.connections) for plan in plans],
+                        )
+                summary = driver.summarize(results, args.seconds, clients * args.connections)
+                runs[str(workers)][name] = summary
+                print(f"{workers:>3} workers {name:>10}: {json.dumps(summary)}", file=sys.stderr)
+        finally:
+            driver.stop_server(server)
+
+    base = runs[str(args.workers[0])]
+    speedup = {
+        name: {
+            w: round(runs[w][name]["throughput_rps"] / base[name]["throughput_rps"], 2)
+            if base[name]["throughput_rps"] else 0.0
+            for w in runs
+        }
+        for name in args.scenarios
+    }
+    _write_report(
+        {
+            "meta": _meta(
+                seconds=args.seconds,
+                clients=clients,
+                connections_per_client=args.connections,
+                seed_config=asdict(config),
+            ),
+            "workers": runs,
+            "speedup": speedup,
+        },
+        args.out,
+    )
+
+
+def compare(args: argparse.Namespace) -> None:
+    """Exit 1 if any latency percentile grew by more than ``--tolerance``."""
+    with open(args.base) as f:
+        base = json.load(f)
+    with open(args.new) as f:
+        new = json.load(f)
+
+    for key in ("requests", "concurrency", "cold", "seed_config"):
+        if base["meta"].get(key) != new["meta"].get(key):
+            print(f"warning: runs differ in {key}; comparison may not be meaningful")
+
+    regressions = 0
+    print(f"{'scenario':>10} {'metric':>14} {'base':>10} {'new':>10} {'change':>8}")
+    for name, before in base["scenarios"].items():
+        after = new["scenarios"].get(name)
+        if after is None:
+            continue
+        for metric in (*COMPARED_METRICS, "throughput_rps"):
+            if metric not in before or metric not in after:
+                continue  # report from an older version of the suite
+            old, cur = before[metric], after[metric]
+            change = (cur - old) / old if old else 0.0
+            worse = change < -args.tolerance if metric == "throughput_rps" else change > args.tolerance
+            regressions += worse
+            flag = "  REGRESSION" if worse else ""
+            print(f"{name:>10} {metric:>14} {old:>10.2f} {cur:>10.2f} {change:>+8.1%}{flag}")
+    if regressions:
+        sys.exit(1)
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(prog="python -m benchmarks")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    r = sub.add_parser("run", help="Seed a fresh database and drive the app in-process")
+    r.add_argument("--users", type=int, default=50)
+    r.add_argument("--min-items", type=int, default=10)
+    r.add_argument("--max-items", type=int, default=50_000)
+    r.add_argument("--skew", type=float, default=1.2, help="Pareto shape for watchlist sizes")
+    r.add_argument("--seed", type=int, default=42)
+    r.add_argument("--requests", type=int, default=500, help="Measured requests per scenario")
+    r.add_argument("--warmup", type=int, default=50)
+    r.add_argument("--concurrency", type=int, default=8)
+    r.add_argument(
+        "--scenarios",
+        type=lambda s: [x for x in s.split(",") if x],
+        default=list(SCENARIOS),
+        help=f"Comma-separated, from {','.join(SCENARIOS + EXTRA_SCENARIOS)}",
+    )
+    r.add_argument("--cold", action="store_true", help="Disable the result cache")
+    target = r.add_mutually_exclusive_group()
+    target.add_argument("--db", help="SQLite file to create (default: a temp dir)")
+    target.add_argument("--database-url", help=_DATABASE_URL_HELP)
+    r.add_argument("--out", help="Write the JSON report here instead of stdout")
+    r.set_defaults(func=run)
+
+    s = sub.add_parser("scale", help="Throughput of read routes at several worker counts")
+    s.add_argument(
+        "--workers",
+        type=lambda v: [int(x) for x in v.split(",") if x],
+        default=[1, 2, 4],
+        help="Comma-separated worker counts (default: 1,2,4)",
+    )
+    s.add_argument("--users", type=int, default=50)
+    s.add_argument("--min-items", type=int, default=10)
+    s.add_argument("--max-items", type=int, default=5_000)
+    s.add_argument("--skew", type=float, default=1.2)
+    s.add_argument("--seed", type=int, default=42)
+    s.add_argument("--seconds", type=float, default=10.0, help="Measured time per scenario")
+    s.add_argument("--warmup-seconds", type=float, default=2.0)
+    s.add_argument("--clients", type=int, help="Client processes (default: max workers)")
+    s.add_argument("--connections", type=int, default=8, help="Keep-alive sockets per client")
+    s.add_argument("--port", type=int, default=8765)
+    s.add_argument("--database-url", help=_DATABASE_URL_HELP)
+    s.add_argument(
+        "--scenarios",
+        type=lambda v: [x for x in v.split(",") if x],
+        default=list(READ_SCENARIOS),
+        help=f"Comma-separated, from {','.join(READ_SCENARIOS)}",
+    )
+    s.add_argument("--out", help="Write the JSON report here instead of stdout")
+    s.set_defaults(func=scale)
+
+    c = sub.add_parser("compare", help="Diff two reports; exit 1 on regressions")
+    c.add_argument("base")
+    c.add_argument("new")
+    c.add_argument("--tolerance", type=float, default=0.15, help="Allowed relative change")
+    c.set_defaults(func=compare)
+
+    args = parser.parse_args(argv)
+    if args.command in ("run", "scale"):
+        allowed = SCENARIOS + EXTRA_SCENARIOS if args.command == "run" else READ_SCENARIOS
+        unknown = set(args.scenarios) - set(allowed)
+        if unknown:
+            parser.error(f"unknown scenario(s): {', '.join(sorted(unknown))}")
+    args.func(args)
+
+
+if __name__ == "__main__":
+    main()
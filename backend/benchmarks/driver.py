@@ -0,0 +1,127 @@
+"""
+In-process load driver: calls the ASGI app directly (no sockets, no HTTP
+client library) so results measure the application, not the transport.
+"""
+
+import asyncio
+import json
+import random
+import time
+from collections.abc import Callable
+from dataclasses import dataclass, field
+
+
+@dataclass
+class Reply:
+    status: int
+    body: bytes
+
+
+async def call(
+    app,
+    method: str,
+    path: str,
+    headers: dict[str, str] | None = None,
+    body: bytes = b"",
+) -> Reply:
+    path, _, query = path.partition("?")
+    scope = {
+        "type": "http",
+        "asgi": {"version": "3.0"},
+        "http_version": "1.1",
+        "method": method,
+        "scheme": "http",
+        "path": path,
+        "raw_path": path.encode(),
+        "query_string": query.encode(),
+        "root_path": "",
+        "headers": [(k.lower().encode(), v.encode()) for k, v in (headers or {}).items()],
+        "client": ("127.0.0.1", 50000),
+        "server": ("bench", 80),
+    }
+    sent = False
+    status = 0
+    chunks: list[bytes] = []
+
+    async def receive():
+        nonlocal sent
+        if sent:
+            await asyncio.Event().wait()  # nothing more; like an idle client
+        sent = True
+        return {"type": "http.request", "body": body, "more_body": False}
+
+    async def send(message):
+        nonlocal status
+        if message["type"] == "http.response.start":
+            status = message["status"]
+        elif message["type"] == "http.response.body":
+            chunks.append(message.get("body", b""))
+
+    await app(scope, receive, send)
+    return Reply(status, b"".join(chunks))
+
+
+def json_body(payload) -> tuple[dict[str, str], bytes]:
+    return {"content-type": "application/json"}, json.dumps(payload).encode()
+
+
+@dataclass
+class Scenario:
+    name: str
+    # (rnd, user) -> (method, path, headers, body)
+    request: Callable[[random.Random, dict], tuple[str, str, dict[str, str], bytes]]
+    requests: int
+    concurrency: int
+    latencies: list[float] = field(default_factory=list)
+    errors: int = 0
+    elapsed: float = 0.0
+    cpu: float = 0.0  # process CPU seconds across the whole run
+
+
+def percentile(sorted_values: list[float], pct: float) -> float:
+    """Nearest-rank percentile of an ascending list."""
+    if not sorted_values:
+        return 0.0
+    rank = max(1, -(-len(sorted_values) * pct // 100))
+    return sorted_values[int(rank) - 1]
+
+
+def _ms(seconds: float) -> float:
+    return round(seconds * 1000, 3)
+
+
+def summarize(scenario: Scenario) -> dict:
+    ordered = sorted(scenario.latencies)
+    return {
+        "requests": len(ordered),
+        "errors": scenario.errors,
+        "concurrency": scenario.concurrency,
+        "throughput_rps": round(len(ordered) / scenario.elapsed, 2) if scenario.elapsed else 0.0,
+        "mean_ms": _ms(sum(ordered) / len(ordered)) if ordered else 0.0,
+        "p50_ms": _ms(percentile(ordered, 50)),
+        "p95_ms": _ms(percentile(ordered, 95)),
+        "p99_ms": _ms(percentile(ordered, 99)),
+        "max_ms": _ms(ordered[-1]) if ordered else 0.0,
+        "cpu_ms_per_request": _ms(scenario.cpu / len(ordered)) if ordered else 0.0,
+    }
+
+
+async def run_scenario(app, scenario: Scenario, users: list[dict], seed: int) -> dict:
+    """Fire ``scenario.requests`` calls from ``scenario.concurrency`` workers."""
+    rnd = random.Random(seed)
+    plan = [scenario.request(rnd, rnd.choice(users)) for _ in range(scenario.requests)]
+    queue = iter(plan)
+
+    async def worker():
+        for method, path, headers, body in queue:
+            started = time.perf_counter()
+            reply = await call(app, method, path, headers, body)
+            scenario.latencies.append(time.perf_counter() - started)
+            if reply.status >= 400:
+                scenario.errors += 1
+
+    started, cpu_started = time.perf_counter(), time.process_time()
+    await asyncio.gather(*(worker() for _ in range(scenario.concurrency)))
+    scenario.elapsed = time.perf_counter() - started
+    scenario.cpu = time.process_time() - cpu_started
+    return summarize(scenario)
@@ -0,0 +1,20 @@
+from app.core.cache import CacheBackend
+
+
+class NullCacheBackend(CacheBackend):
+    """Stores nothing, so every analytics request recomputes (``--cold``)."""
+
+    async def get(self, key: str) -> bytes | None:
+        return None
+
+    async def set(self, key: str, value: bytes, ttl: float) -> None:
+        pass
+
+    async def delete(self, key: str) -> None:
+        pass
+
+    async def get_version(self, user_id: int) -> int:
+        return 0
+
+    async def bump_version(self, user_id: int) -> int:
+        return 0
@@ -0,0 +1,123 @@
+"""
+Multi-worker scaling: serve the app with ``python -m app.cli serve`` at each
+worker count and load it over real HTTP from several client processes.
+
+Clients speak minimal HTTP/1.1 over keep-alive sockets (no client library)
+and replay pre-rendered GET requests for a fixed time, so a client process
+costs little CPU per request.  Leave cores for them: with W workers and C
+client processes the host needs W + C cores for the numbers to mean
+anything.
+"""
+
+import asyncio
+import os
+import signal
+import socket
+import subprocess
+import sys
+import time
+
+from benchmarks.driver import percentile
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def render_get(path: str, headers: dict[str, str]) -> bytes:
+    lines = [f"GET {path} HTTP/1.1", "Host: bench", *(f"{k}: {v}" for k, v in headers.items())]
+    return ("\r\n".join(lines) + "\r\n\r\n").encode()
+
+
+async def _connection(port: int, requests: list[bytes], offset: int, deadline: float, out: dict):
+    reader, writer = await asyncio.open_connection("127.0.0.1", port)
+    i = offset
+    try:
+        while time.perf_counter() < deadline:
+            started = time.perf_counter()
+            writer.write(requests[i % len(requests)])
+            i += 1
+            head = await reader.readuntil(b"\r\n\r\n")
+            status_line, *header_lines = head.decode("latin-1").split("\r\n")
+            length = 0
+            for line in header_lines:
+                name, _, value = line.partition(":")
+                if name.lower() == "content-length":
+                    length = int(value)
+            await reader.readexactly(length)
+            out["latencies"].append(time.perf_counter() - started)
+            if int(status_line.split()[1]) >= 400:
+                out["errors"] += 1
+    finally:
+        writer.close()
+
+
+def run_client(port: int, requests: list[bytes], seconds: float, connections: int) -> dict:
+    """One client process: ``connections`` keep-alive sockets for ``seconds``."""
+    out = {"latencies": [], "errors": 0}
+
+    async def main():
+        deadline = time.perf_counter() + seconds
+        await asyncio.gather(
+            *(
+                _connection(port, requests, n * 997, deadline, out)
+                for n in range(connections)
+            )
+        )
+
+    asyncio.run(main())
+    return out
+
+
+def wait_until_up(port: int, timeout: float = 60.0) -> None:
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            with socket.create_connection(("127.0.0.1", port), timeout=1) as sock:
+                sock.sendall(b"GET /health HTTP/1.1\r\nHost: bench\r\n\r\n")
+                if sock.recv(64).startswith(b"HTTP/1.1 200"):
+                    return
+        except OSError:
+            pass
+        time.sleep(0.2)
+    raise RuntimeError(f"server on port {port} did not come up within {timeout}s")
+
+
+def start_server(workers: int, port: int, env: dict[str, str]) -> subprocess.Popen:
+    process = subprocess.Popen(
+        [
+            sys.executable, "-m", "app.cli", "serve",
+            "--workers", str(workers), "--port", str(port), "--no-access-log",
+        ],
+        cwd=BACKEND_DIR,
+        env={**os.environ, **env},
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+    )
+    try:
+        wait_until_up(port)
+    except RuntimeError:
+        process.kill()
+        raise
+    return process
+
+
+def stop_server(process: subprocess.Popen) -> None:
+    process.send_signal(signal.SIGINT)
+    try:
+        process.wait(timeout=30)
+    except subprocess.TimeoutExpired:
+        process.kill()
+        process.wait()
+
+
+def summarize(results: list[dict], seconds: float, connections: int) -> dict:
+    ordered = sorted(latency for r in results for latency in r["latencies"])
+    return {
+        "requests": len(ordered),
+        "errors": sum(r["errors"] for r in results),
+        "connections": connections,
+        "throughput_rps": round(len(ordered) / seconds, 2),
+        **{
+            f"p{pct}_ms": round(percentile(ordered, pct) * 1000, 3)
+            for pct in (50, 95, 99)
+        },
+    }
@@ -0,0 +1,139 @@
+"""
+Synthetic population generator.
+
+Everything is drawn from one ``random.Random(seed)``, so a given config
+always produces the same database.
+"""
+
+import math
+import random
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+
+from sqlalchemy import insert
+
+from app.core.database import AsyncSessionLocal, init_db
+from app.core.security import hash_password
+from app.models import Platform, User, WatchlistItem
+from app.services import platform_service, platform_stats_service
+
+PASSWORD = "benchmark-password"
+
+# (name, monthly cost, share of users subscribed)
+PLATFORM_MIX = [
+    ("Netflix", 15.49, 0.75),
+    ("Prime Video", 8.99, 0.60),
+    ("Disney+", 13.99, 0.45),
+    ("Max", 15.99, 0.35),
+    ("Hulu", 7.99, 0.35),
+    ("Apple TV+", 9.99, 0.25),
+    ("Peacock", 5.99, 0.20),
+    ("Paramount+", 7.99, 0.20),
+]
+STATUS_WEIGHTS = {"want_to_watch": 0.45, "watching": 0.10, "watched": 0.45}
+TYPE_WEIGHTS = {"movie": 0.6, "show": 0.4}
+NO_PLATFORM_SHARE = 0.1
+# Titles are two of these words, derived from the item's position alone so
+# they do not consume the random stream (earlier populations stay identical).
+TITLE_WORDS = [
+    "silent", "river", "broken", "empire", "midnight", "garden", "crimson", "harbor",
+    "lost", "kingdom", "iron", "summer", "hidden", "signal", "golden", "frontier",
+    "last", "witness", "northern", "lights", "shadow", "protocol", "wild", "horizon",
+    "glass", "city", "burning", "orchard", "quiet", "storm", "paper", "moon",
+    "velvet", "circuit", "distant", "shore", "electric", "heart", "winter", "station",
+]
+HISTORY_DAYS = 730
+
+_INSERT_CHUNK = 10_000
+
+
+@dataclass
+class SeedConfig:
+    users: int = 50
+    min_items: int = 10
+    max_items: int = 50_000
+    # Larger = more users near min_items; sizes are Pareto-like between the bounds
+    skew: float = 1.2
+    seed: int = 42
+
+
+def watchlist_sizes(config: SeedConfig, rnd: random.Random) -> list[int]:
+    """Heavy-tailed sizes: most users are small, a few hit max_items."""
+    lo, hi = config.min_items, config.max_items
+    sizes = []
+    for _ in range(config.users):
+        # Inverse CDF of a Pareto truncated to [lo, hi]
+        u = rnd.random()
+        a = config.skew
+        size = lo / (1 - u * (1 - (lo / hi) ** a)) ** (1 / a)
+        sizes.append(min(hi, max(lo, int(math.floor(size)))))
+    if config.users and hi > lo:
+        sizes[rnd.randrange(config.users)] = hi  # always include one worst case
+    return sizes
+
+
+def title(n: int) -> str:
+    k = len(TITLE_WORDS)
+    return f"{TITLE_WORDS[n % k]} {TITLE_WORDS[(n // k) % k]} {n // (k * k) + 1}".title()
+
+
+def _choose(rnd: random.Random, weights: dict[str, float]) -> str:
+    return rnd.choices(list(weights), list(weights.values()))[0]
+
+
+async def seed(config: SeedConfig) -> list[dict]:
+    """
+    Create the schema and populate it.  Returns one dict per user with
+    ``email``, ``password`` and ``items`` for the load driver.
+    """
+    rnd = random.Random(config.seed)
+    now = datetime.now(timezone.utc)
+    hashed = hash_password(PASSWORD)  # one bcrypt call, shared by every user
+    sizes = watchlist_sizes(config, rnd)
+
+    await init_db()
+    async with AsyncSessionLocal() as db:
+        users = [
+            {"email": f"bench{i}@example.com", "hashed_password": hashed}
+            for i in range(config.users)
+        ]
+        user_ids = (
+            await db.execute(insert(User).returning(User.id), users)
+        ).scalars().all()
+
+        platforms, items = [], []
+        for user_id, size in zip(sorted(user_ids), sizes):
+            subscribed = [p for p in PLATFORM_MIX if rnd.random() < p[2]] or [PLATFORM_MIX[0]]
+            for name, cost, _ in subscribed:
+                platforms.append(
+                    {"user_id": user_id, "name": name, "monthly_cost": cost, "is_subscribed": True}
+                )
+            names = [name for name, _, _ in subscribed]
+            for n in range(size):
+                platform = None if rnd.random() < NO_PLATFORM_SHARE else rnd.choice(names)
+                items.append({
+                    "user_id": user_id,
+                    "title": title(n),
+                    "type": _choose(rnd, TYPE_WEIGHTS),
+                    "status": _choose(rnd, STATUS_WEIGHTS),
+                    "platform_name": platform,
+                    "added_at": now - timedelta(minutes=rnd.randrange(HISTORY_DAYS * 24 * 60)),
+                })
+                if len(items) >= _INSERT_CHUNK:
+                    await db.execute(insert(WatchlistItem), items)
+                    items = []
+        if items:
+            await db.execute(insert(WatchlistItem), items)
+        await db.execute(insert(Platform), platforms)
+        await db.commit()
+
+        # Bulk inserts bypass the service layer, so link items to platforms
+        # and build the summaries once
+        for stmt in platform_service.link_statements():
+            await db.execute(stmt)
+        await platform_stats_service.rebuild(db)
+
+    return [
+        {"email": u["email"], "password": PASSWORD, "items": size}
+        for u, size in zip(users, sizes)
+    ]
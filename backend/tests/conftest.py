@@ -0,0 +1,61 @@
+"""
+Settings are read when ``app`` is first imported, so the database is chosen
+here, before any test module imports it.
+
+A PostgreSQL ``DATABASE_URL`` in the environment is kept and the suite runs
+against it; its data is left in place, so point it at a scratch database.  Anything else (including a ``.env`` file) is
+replaced by a fresh SQLite file per session.
+"""
+
+import os
+import tempfile
+
+if not os.environ.get("DATABASE_URL", "").startswith("postgresql"):
+    os.environ["DATABASE_URL"] = "sqlite+aiosqlite:///" + os.path.join(
+        tempfile.mkdtemp(prefix="streamtracker-test-"), "test.db"
+    )
+
+import pytest  # noqa: E402
+
+
+@pytest.fixture(scope="session")
+def anyio_backend():
+    # One event loop for the whole session: pooled connections belong to it
+    return "asyncio"
+
+
+PASSWORD = "correct-horse-battery"
+
+
+@pytest.fixture(scope="session")
+async def client():
+    """An HTTP client for the app, with its lifespan running."""
+    import httpx
+    from sqlalchemy.exc import SQLAlchemyError
+
+    from app.core.database import engine
+    from app.main import app
+
+    try:
+        async with engine.connect():
+            pass
+    except (OSError, SQLAlchemyError) as exc:
+        pytest.skip(f"Database not reachable: {exc}")
+    async with app.router.lifespan_context(app):
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as c:
+            yield c
+
+
+@pytest.fixture
+async def user(client):
+    """Auth headers and id of a newly registered user."""
+    import uuid
+
+    email = f"{uuid.uuid4().hex}@example.com"
+    reply = await client.post("/api/v1/auth/register", json={"email": email, "password": PASSWORD})
+    assert reply.status_code == 201, reply.text
+    reply = await client.post("/api/v1/auth/login", json={"email": email, "password": PASSWORD})
+    headers = {"Authorization": f"Bearer {reply.json()['access_token']}"}
+    me = await client.get("/api/v1/auth/me", headers=headers)
+    return {"headers": headers, "id": me.json()["id"]}
@@ -0,0 +1,62 @@
+import uuid
+
+import pytest
+from sqlalchemy import func, select
+
+from app.core.config import settings
+from app.core.database import AsyncSessionLocal
+from app.models import WatchlistItem
+
+pytestmark = pytest.mark.anyio
+
+PASSWORD = "correct-horse-battery"
+
+
+async def _account(client) -> tuple[str, dict]:
+    email = f"{uuid.uuid4().hex}@example.com"
+    reply = await client.post("/api/v1/auth/register", json={"email": email, "password": PASSWORD})
+    assert reply.status_code == 201, reply.text
+    return email, await _login(client, email, PASSWORD)
+
+
+async def _login(client, email: str, password: str) -> dict | None:
+    reply = await client.post("/api/v1/auth/login", json={"email": email, "password": password})
+    if reply.status_code != 200:
+        return None
+    return {"Authorization": f"Bearer {reply.json()['access_token']}"}
+
+
+@pytest.mark.parametrize("shared", [False, True])
+async def test_change_password(client, monkeypatch, shared):
+    # Shared, the principal is rebuilt from the cache rather than loaded
+    monkeypatch.setattr(settings, "AUTH_CACHE_SHARED", shared)
+    email, headers = await _account(client)
+    assert (await client.get("/api/v1/auth/me", headers=headers)).status_code == 200
+
+    wrong = {"current_password": "not-the-password", "new_password": "another-horse"}
+    reply = await client.put("/api/v1/auth/password", json=wrong, headers=headers)
+    assert reply.status_code == 400
+
+    change = {"current_password": PASSWORD, "new_password": "another-horse"}
+    reply = await client.put("/api/v1/auth/password", json=change, headers=headers)
+    assert reply.status_code == 204, reply.text
+    assert await _login(client, email, PASSWORD) is None
+    assert await _login(client, email, "another-horse") is not None
+
+
+@pytest.mark.parametrize("shared", [False, True])
+async def test_delete_account(client, monkeypatch, shared):
+    monkeypatch.setattr(settings, "AUTH_CACHE_SHARED", shared)
+    email, headers = await _account(client)
+    me = (await client.get("/api/v1/auth/me", headers=headers)).json()
+    reply = await client.post("/api/v1/watchlist/", json={"title": "Heat"}, headers=headers)
+    assert reply.status_code == 201, reply.text
+
+    assert (await client.delete("/api/v1/auth/me", headers=headers)).status_code == 204
+    assert (await client.get("/api/v1/auth/me", headers=headers)).status_code == 401
+    assert await _login(client, email, PASSWORD) is None
+    async with AsyncSessionLocal() as db:
+        left = await db.scalar(
+            select(func.count()).select_from(WatchlistItem).where(WatchlistItem.user_id == me["id"])
+        )
+    assert left == 0
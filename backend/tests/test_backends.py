@@ -0,0 +1,268 @@
+"""
+End-to-end checks of the service code on whichever database the session
+uses: CRUD, the batch routes, delta sync and incremental platform_stats
+against a rebuild.  That is a temp SQLite file unless ``DATABASE_URL``
+names a PostgreSQL database, e.g.
+
+    DATABASE_URL=postgresql+asyncpg://localhost/streamtracker_test python -m pytest
+
+which also runs the PostgreSQL-only checks: the enum types, the expression
+index and the migrations from the original schema.  Each run registers its
+own users, so existing rows don't get in the way.
+"""
+
+import uuid
+from datetime import datetime, timezone
+
+import pytest
+from sqlalchemy import (
+    Boolean,
+    Column,
+    DateTime,
+    Enum,
+    Float,
+    ForeignKey,
+    Integer,
+    MetaData,
+    String,
+    Table,
+    Text,
+    UniqueConstraint,
+    inspect,
+    select,
+    text,
+)
+
+from app.core.database import AsyncSessionLocal, Base, engine
+from app.core.migrations import _MIGRATIONS, run_migrations
+from app.models import PlatformStats
+from app.services import platform_stats_service
+
+pytestmark = pytest.mark.anyio
+
+postgresql_only = pytest.mark.skipif(
+    engine.dialect.name != "postgresql", reason="DATABASE_URL is not PostgreSQL"
+)
+
+
+async def _add(client, user, **fields) -> dict:
+    reply = await client.post("/api/v1/watchlist/", json=fields, headers=user["headers"])
+    assert reply.status_code == 201, reply.text
+    return reply.json()
+
+
+async def test_watchlist_crud(client, user):
+    h = user["headers"]
+    await client.post("/api/v1/platforms/", json={"name": "Netflix"}, headers=h)
+    item = await _add(client, user, title="Heat", platform_name="netflix")
+    assert item["platform_id"] is not None
+
+    reply = await client.patch(
+        f"/api/v1/watchlist/{item['id']}", json={"status": "watched"}, headers=h
+    )
+    assert reply.status_code == 200 and reply.json()["status"] == "watched"
+
+    listed = (await client.get("/api/v1/watchlist/", headers=h)).json()
+    assert [(i["id"], i["status"]) for i in listed] == [(item["id"], "watched")]
+    found = (await client.get("/api/v1/watchlist/search", params={"q": "hea"}, headers=h)).json()
+    assert [i["id"] for i in found] == [item["id"]]
+
+    assert (await client.delete(f"/api/v1/watchlist/{item['id']}", headers=h)).status_code == 204
+    assert (await client.delete(f"/api/v1/watchlist/{item['id']}", headers=h)).status_code == 404
+    assert (await client.get("/api/v1/watchlist/", headers=h)).json() == []
+
+
+async def test_batch_routes(client, user):
+    h = user["headers"]
+    reply = await client.post(
+        "/api/v1/watchlist/batch",
+        json={"items": [{"title": "Alien"}, {"title": "Dark", "type": "show"}]},
+        headers=h,
+    )
+    assert reply.status_code == 201
+    created = reply.json()
+    assert created["succeeded"] == 2
+    ids = [r["id"] for r in created["results"]]
+    listed = (await client.get("/api/v1/watchlist/", headers=h)).json()
+    titles = {i["id"]: i["title"] for i in listed}
+    assert [titles[i] for i in ids] == ["Alien", "Dark"]
+
+    reply = await client.request(
+        "PATCH",
+        "/api/v1/watchlist/batch",
+        json={"items": [{"id": ids[0], "status": "watching"}, {"id": -1, "status": "watched"}]},
+        headers=h,
+    )
+    assert [r["status"] for r in reply.json()["results"]] == ["updated", "not_found"]
+
+    reply = await client.request(
+        "DELETE", "/api/v1/watchlist/batch", json={"ids": [ids[1], -1, ids[1]]}, headers=h
+    )
+    statuses = [r["status"] for r in reply.json()["results"]]
+    assert statuses == ["deleted", "not_found", "not_found"]
+    assert reply.json()["succeeded"] == 1
+
+    listed = (await client.get("/api/v1/watchlist/", headers=h)).json()
+    assert [(i["id"], i["status"]) for i in listed] == [(ids[0], "watching")]
+
+
+async def test_sync_changes(client, user):
+    h = user["headers"]
+    kept = await _add(client, user, title="Arrival")
+    dropped = await _add(client, user, title="Solaris")
+
+    snapshot = (await client.get("/api/v1/watchlist/changes", headers=h)).json()
+    assert {i["id"] for i in snapshot["items"]} == {kept["id"], dropped["id"]}
+    assert not snapshot["has_more"]
+
+    await client.patch(f"/api/v1/watchlist/{kept['id']}", json={"notes": "again"}, headers=h)
+    added = await _add(client, user, title="Stalker")
+    await client.delete(f"/api/v1/watchlist/{dropped['id']}", headers=h)
+
+    delta = (
+        await client.get(
+            "/api/v1/watchlist/changes", params={"since": snapshot["next_token"]}, headers=h
+        )
+    ).json()
+    assert {i["id"] for i in delta["items"]} == {kept["id"], added["id"]}
+    assert delta["deleted"] == [dropped["id"]]
+    assert not delta["reset"]
+
+
+async def _stats_rows(user_id: int) -> list[tuple]:
+    async with AsyncSessionLocal() as db:
+        rows = await db.execute(
+            select(PlatformStats.__table__).where(PlatformStats.user_id == user_id)
+        )
+        return sorted(
+            (tuple(v for k, v in row._mapping.items() if k != "id") for row in rows),
+            key=repr,
+        )
+
+
+async def test_stats_match_rebuild(client, user):
+    h = user["headers"]
+    reply = await client.post("/api/v1/platforms/", json={"name": "Hulu"}, headers=h)
+    hulu = reply.json()
+    items = [
+        await _add(client, user, title=f"Title {n}", platform_name=name, type=kind)
+        for n, (name, kind) in enumerate(
+            [("Hulu", "movie"), ("hulu", "show"), ("Mubi", "movie"), (None, "show"), ("MUBI", "show")]
+        )
+    ]
+    await client.patch(f"/api/v1/watchlist/{items[0]['id']}", json={"status": "watched"}, headers=h)
+    await client.patch(
+        f"/api/v1/watchlist/{items[2]['id']}", json={"platform_name": "Hulu"}, headers=h
+    )
+    await client.request(
+        "PATCH",
+        "/api/v1/watchlist/batch",
+        json={"items": [{"id": items[3]["id"], "status": "watching", "platform_name": "mubi"}]},
+        headers=h,
+    )
+    await client.delete(f"/api/v1/watchlist/{items[1]['id']}", headers=h)
+    await client.patch(f"/api/v1/platforms/{hulu['id']}", json={"name": "Hulu+"}, headers=h)
+
+    incremental = await _stats_rows(user["id"])
+    async with AsyncSessionLocal() as db:
+        await platform_stats_service.rebuild(db, user["id"])
+    assert incremental and incremental == await _stats_rows(user["id"])
+
+    for path in ("/api/v1/discovery/", "/api/v1/insights/"):
+        assert (await client.get(path, headers=h)).status_code == 200
+
+
+@postgresql_only
+async def test_postgres_schema(client):
+    async with engine.connect() as conn:
+        enums = await conn.execute(
+            text("SELECT typname FROM pg_type WHERE typname IN ('content_type', 'watch_status')")
+        )
+        assert set(enums.scalars()) == {"content_type", "watch_status"}
+        indexdef = await conn.scalar(
+            text("SELECT indexdef FROM pg_indexes WHERE indexname = 'ix_watchlist_user_lower_platform'")
+        )
+        assert "lower(" in indexdef
+        applied = await conn.execute(text("SELECT version FROM schema_migrations"))
+        assert set(applied.scalars()) == {version for version, _, _ in _MIGRATIONS}
+
+
+# The tables as they were before the first migration
+_legacy = MetaData()
+Table(
+    "users",
+    _legacy,
+    Column("id", Integer, primary_key=True),
+    Column("email", String(255), unique=True, nullable=False),
+    Column("hashed_password", String(255), nullable=False),
+    Column("created_at", DateTime(timezone=True)),
+)
+Table(
+    "platforms",
+    _legacy,
+    Column("id", Integer, primary_key=True),
+    Column("user_id", ForeignKey("users.id", ondelete="CASCADE"), nullable=False),
+    Column("name", String(100), nullable=False),
+    Column("color", String(7)),
+    Column("monthly_cost", Float),
+    Column("is_subscribed", Boolean),
+    Column("created_at", DateTime(timezone=True)),
+    UniqueConstraint("user_id", "name", name="uq_platform_user_name"),
+)
+Table(
+    "watchlist",
+    _legacy,
+    Column("id", Integer, primary_key=True),
+    Column("user_id", ForeignKey("users.id", ondelete="CASCADE"), nullable=False),
+    Column("title", String(200), nullable=False),
+    Column("type", Enum("movie", "show", name="content_type")),
+    Column("status", Enum("want_to_watch", "watching", "watched", name="watch_status")),
+    Column("platform_name", String(100)),
+    Column("poster_url", String(500)),
+    Column("notes", Text),
+    Column("added_at", DateTime(timezone=True)),
+)
+
+
+def _upgrade_legacy(conn) -> None:
+    """Create the original schema with data in it, then run init_db's steps."""
+    now = datetime.now(timezone.utc)
+    _legacy.create_all(conn)
+    conn.execute(_legacy.tables["users"].insert(), {"id": 1, "email": "a@example.com", "hashed_password": "x"})
+    conn.execute(_legacy.tables["platforms"].insert(), {"id": 1, "user_id": 1, "name": "Netflix"})
+    conn.execute(
+        _legacy.tables["watchlist"].insert(),
+        [
+            {"user_id": 1, "title": "Heat", "type": "movie", "status": "watched", "platform_name": "NETFLIX", "added_at": now},
+            {"user_id": 1, "title": "Dark", "type": "show", "status": "watching", "platform_name": "Mubi", "added_at": now},
+        ],
+    )
+
+    Base.metadata.create_all(conn)
+    assert run_migrations(conn) == sorted(version for version, _, _ in _MIGRATIONS)
+    assert run_migrations(conn) == []
+
+    columns = {c["name"] for c in inspect(conn).get_columns("watchlist")}
+    assert {"platform_id", "version"} <= columns
+    linked = conn.execute(text("SELECT title, platform_id FROM watchlist ORDER BY title"))
+    assert linked.all() == [("Dark", None), ("Heat", 1)]
+    stats = conn.execute(
+        text(
+            "SELECT platform_id, platform_key, total_items, watched_movie, watching_show "
+            "FROM platform_stats"
+        )
+    )
+    assert set(stats.all()) == {(1, None, 1, 1, 0), (None, "mubi", 1, 0, 1)}
+
+
+@postgresql_only
+async def test_migrations_from_legacy_schema(client):
+    # A throwaway schema, rolled back with everything created in it
+    async with engine.connect() as conn:
+        schema = f"migration_{uuid.uuid4().hex}"
+        await conn.execute(text(f'CREATE SCHEMA "{schema}"'))
+        await conn.execute(text(f'SET LOCAL search_path TO "{schema}"'))
+        try:
+            await conn.run_sync(_upgrade_legacy)
+        finally:
+            await conn.rollback()
@@ -0,0 +1,95 @@
+"""ChangeFeed: replay on resume, subscriber overflow and history expiry."""
+
+import time
+
+import pytest
+
+from app.core.feed import ChangeFeed
+
+pytestmark = pytest.mark.anyio
+
+
+def _feed(**overrides) -> ChangeFeed:
+    options = {"subscriber_buffer": 4, "replay_size": 3, "replay_ttl": 60, "max_keys": 10}
+    return ChangeFeed(**{**options, **overrides})
+
+
+def _names(events) -> list[str]:
+    return [e.name for e in events]
+
+
+def test_fresh_subscriber_gets_ready_at_the_cursor():
+    feed = _feed()
+    feed.publish("other", "item", b"{}")  # nobody listening: dropped
+    _, backlog = feed.subscribe(1)
+    assert _names(backlog) == ["ready"]
+    assert backlog[0].id == feed.cursor
+
+
+def test_resume_replays_exactly_what_was_missed():
+    feed = _feed()
+    sub, backlog = feed.subscribe(1)
+    feed.publish(1, "a", b"{}")
+    seen = feed.cursor
+    feed.unsubscribe(sub)
+    feed.publish(1, "b", b"{}")
+    feed.publish(2, "elsewhere", b"{}")
+    feed.publish(1, "c", b"{}")
+
+    _, backlog = feed.subscribe(1, seen)
+    assert _names(backlog) == ["b", "c"]
+    _, backlog = feed.subscribe(1, backlog[-1].id)
+    assert backlog == []
+
+
+def test_resume_past_the_replay_window_resyncs():
+    feed = _feed(replay_size=2)
+    sub, backlog = feed.subscribe(1)
+    first = backlog[0].id
+    for name in "abc":
+        feed.publish(1, name, b"{}")
+    feed.unsubscribe(sub)
+
+    _, backlog = feed.subscribe(1, first)
+    assert _names(backlog) == ["resync"]
+    assert backlog[0].id == feed.cursor
+
+
+def test_resume_after_the_history_expired_resyncs():
+    feed = _feed(replay_ttl=0.01)
+    sub, _ = feed.subscribe(1)
+    feed.publish(1, "a", b"{}")
+    seen = feed.cursor
+    feed.unsubscribe(sub)
+    time.sleep(0.02)
+    feed.publish(1, "deleted", b"{}")  # no history, no subscriber: dropped
+
+    _, backlog = feed.subscribe(1, seen)
+    assert _names(backlog) == ["resync"]
+
+
+def test_resume_with_an_unknown_id_resyncs():
+    feed = _feed()
+    feed.subscribe(1)
+    for last_id in ("deadbeef-1", "garbage", f"{feed.cursor}9"):
+        _, backlog = feed.subscribe(1, last_id)
+        assert _names(backlog) == ["resync"]
+
+
+async def test_live_events_and_overflow():
+    feed = _feed(subscriber_buffer=2)
+    sub, _ = feed.subscribe(1)
+    feed.publish(1, "a", b"{}")
+    assert (await sub.next(0.01)).name == "a"
+    assert await sub.next(0.01) is None  # idle: heartbeat
+
+    for name in "bcd":
+        feed.publish(1, name, b"{}")
+    # Fell behind: the backlog is replaced by one resync, then live again
+    assert (await sub.next(0.01)).name == "resync"
+    feed.publish(1, "e", b"{}")
+    assert (await sub.next(0.01)).name == "e"
+    assert feed.stats()["overflowed"] == 1
+
+    feed.close_all()
+    assert await sub.next(0.01) is None and sub.closed
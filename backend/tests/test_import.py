@@ -0,0 +1,131 @@
+"""Watchlist import: record parsing, and the report the import route returns."""
+
+import anyio
+import pytest
+
+from app.core.config import settings
+from app.services.import_service import _iter_records
+
+pytestmark = pytest.mark.anyio
+
+
+async def _records(data: str, fmt: str, chunk: int = 7) -> list:
+    async def chunks():
+        raw = data.encode()
+        for i in range(0, len(raw), chunk):
+            yield raw[i : i + chunk]  # splits lines and multi-byte characters
+
+    return [record async for record in _iter_records(chunks(), fmt)]
+
+
+async def test_csv_quotes_inside_unquoted_fields_are_literal():
+    data = 'title,type\n12" Vinyl,movie\nA,movie\nB,show\n7" Single,show\n'
+    assert await _records(data, "csv") == [
+        (2, {"title": '12" Vinyl', "type": "movie"}),
+        (3, {"title": "A", "type": "movie"}),
+        (4, {"title": "B", "type": "show"}),
+        (5, {"title": '7" Single', "type": "show"}),
+    ]
+
+
+async def test_csv_quoted_fields_span_lines():
+    data = 'title,notes,extra\r\n"Dark","line one\r\nsaid ""hi""",x\r\n\r\nÉté,,\r\n'
+    assert await _records(data, "csv") == [
+        (2, {"title": "Dark", "notes": 'line one\nsaid "hi"'}),
+        (5, {"title": "Été", "notes": None}),
+    ]
+
+
+async def test_csv_unclosed_quote_is_capped_and_parsing_resumes(monkeypatch):
+    monkeypatch.setattr(settings, "WATCHLIST_IMPORT_MAX_RECORD_CHARS", 40)
+    data = 'title\n"Never closed\n' + "Gone\n" * 6 + "Kept\n" + "x" * 100 + "\nAlso kept\n"
+    assert await _records(data, "csv") == [
+        (2, "Record longer than 40 characters"),  # dropped along with lines 3-8
+        (9, {"title": "Kept"}),
+        (10, "Record longer than 40 characters"),
+        (11, {"title": "Also kept"}),
+    ]
+
+
+async def test_csv_unterminated_at_end():
+    assert await _records('title\nA\n"B', "csv") == [
+        (2, {"title": "A"}),
+        (3, "Unterminated quoted field"),
+    ]
+
+
+async def test_ndjson_errors_are_reported_per_line(monkeypatch):
+    monkeypatch.setattr(settings, "WATCHLIST_IMPORT_MAX_RECORD_CHARS", 40)
+    data = '{"title": "A"}\n\n{"title": \n[1, 2]\n{"title": "' + "z" * 50 + '"}\n{"title": "B"}'
+    assert await _records(data, "ndjson") == [
+        (1, {"title": "A"}),
+        (3, "Invalid JSON: Expecting value"),
+        (4, "Expected a JSON object"),
+        (5, "Record longer than 40 characters"),
+        (6, {"title": "B"}),
+    ]
+
+
+async def test_import_report(client, user):
+    body = (
+        "title,type,status\n"
+        '12" Vinyl,movie,watched\n'
+        "Alien,movie,want_to_watch\n"
+        "alien,movie,watched\n"
+        "Dark,show,binged\n"
+        '7" Single,movie,watching\n'
+        '"Blade\nRunner",movie,want_to_watch\n'
+    )
+    reply = await client.post(
+        "/api/v1/watchlist/import", params={"format": "csv"}, content=body, headers=user["headers"]
+    )
+    assert reply.status_code == 201, reply.text
+    report = reply.json()
+    assert report["status"] == "completed"
+    counts = [report[k] for k in ("rows_read", "inserted", "duplicates", "invalid")]
+    assert counts == [6, 4, 1, 1]
+    assert [e["line"] for e in report["errors"]] == [5]
+
+    listed = (await client.get("/api/v1/watchlist/", headers=user["headers"])).json()
+    assert sorted(i["title"] for i in listed) == ['12" Vinyl', '7" Single', "Alien", "Blade\nRunner"]
+
+
+async def test_import_report_ndjson(client, user):
+    body = '{"title": "Heat"}\nnot json\n{"type": "movie"}\n'
+    reply = await client.post(
+        "/api/v1/watchlist/import",
+        params={"format": "ndjson"},
+        content=body,
+        headers=user["headers"],
+    )
+    report = reply.json()
+    assert (report["inserted"], report["invalid"]) == (1, 2)
+    assert [e["line"] for e in report["errors"]] == [2, 3]
+
+
+async def test_background_import(client, user, monkeypatch):
+    body = "title,type,status\nHeat,movie,watched\n"
+    monkeypatch.setattr(settings, "WATCHLIST_IMPORT_MAX_UPLOAD_BYTES", len(body) - 1)
+    reply = await client.post(
+        "/api/v1/watchlist/import",
+        params={"background": "true"},
+        content=body,
+        headers=user["headers"],
+    )
+    assert reply.status_code == 413
+
+    monkeypatch.setattr(settings, "WATCHLIST_IMPORT_MAX_UPLOAD_BYTES", len(body))
+    reply = await client.post(
+        "/api/v1/watchlist/import",
+        params={"background": "true"},
+        content=body,
+        headers=user["headers"],
+    )
+    assert reply.status_code == 202
+    job = f"/api/v1/watchlist/import/{reply.json()['job_id']}"
+    for _ in range(100):
+        report = (await client.get(job, headers=user["headers"])).json()
+        if report["status"] != "running":
+            break
+        await anyio.sleep(0.01)
+    assert (report["status"], report["inserted"]) == ("completed", 1)
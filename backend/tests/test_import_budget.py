@@ -0,0 +1,27 @@
+"""
+Startup stays cheap: a cold ``import app.main`` (what every worker and CLI
+command pays) must not load NumPy and friends, which the insights engine
+imports on first use.
+
+Wall time depends on the machine and its load, so it is only checked when
+``IMPORT_BUDGET_MS`` is set, e.g. ``IMPORT_BUDGET_MS=2000 python -m pytest``
+on a quiet runner.
+"""
+
+import os
+
+import pytest
+
+from app.cli import measure_import
+
+
+def test_heavy_modules_stay_lazy():
+    _, loaded = measure_import(runs=1)
+    assert not loaded, f"loaded at startup but should be lazy: {loaded}"
+
+
+@pytest.mark.skipif(not os.environ.get("IMPORT_BUDGET_MS"), reason="IMPORT_BUDGET_MS is not set")
+def test_import_budget():
+    budget = float(os.environ["IMPORT_BUDGET_MS"])
+    best, _ = measure_import(runs=3)
+    assert best <= budget, f"import app.main took {best:.0f} ms — see python -X importtime"
@@ -0,0 +1,152 @@
+"""
+Every SELECT on the read paths must be served by an index: no full scan of
+``watchlist`` and no temp B-tree for ORDER BY, GROUP BY or DISTINCT.
+
+Statements are recorded while the services run against a seeded database,
+then re-run under EXPLAIN QUERY PLAN with the parameters they were sent with.
+"""
+
+import re
+import sqlite3
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from sqlalchemy import event, insert, select
+
+from app.core.database import AsyncSessionLocal, engine, read_engine
+from app.models import Platform, WatchlistEvent
+from app.services import (
+    discovery_service,
+    platform_service,
+    sync_service,
+    user_service,
+    watchlist_service,
+)
+from benchmarks.seed import SeedConfig, seed
+
+pytestmark = [
+    pytest.mark.anyio,
+    pytest.mark.skipif(engine.dialect.name != "sqlite", reason="SQLite query plans"),
+]
+
+_FULL_SCAN = re.compile(r"\bSCAN watchlist\b")
+_TEMP_SORT = "USE TEMP B-TREE"
+
+
+async def _listing(db, user_id):
+    _, cursor = await watchlist_service.get_page(db, user_id, limit=20)
+    await watchlist_service.get_page(db, user_id, limit=20, cursor=cursor)
+    await watchlist_service.get_page(db, user_id, status="watched", limit=20, cursor=cursor)
+    await watchlist_service.get_page(db, user_id, fields=["id", "added_at", "title"])
+    await watchlist_service.get_page(db, user_id)
+
+
+async def _search(db, user_id):
+    _, cursor = await watchlist_service.search(db, user_id, "a", limit=5)
+    await watchlist_service.search(
+        db, user_id, "a", status="watched", platform="netflix", cursor=cursor
+    )
+
+
+async def _discovery(db, user_id):
+    await discovery_service.compute_discovery(db, user_id)
+
+
+async def _insights(db, user_id):
+    from app.services import insights_service
+
+    await insights_service.compute_insights(db, user_id)
+
+
+async def _insights_batch(db, user_id):
+    from app.services import insights_service
+
+    await insights_service.compute_all_insights(db)
+
+
+async def _sync(db, user_id):
+    page = await sync_service.changes(db, user_id, None, 50)
+    await sync_service.changes(db, user_id, page["next_token"], 50)
+
+
+async def _platforms(db, user_id):
+    await platform_service.get_all(db, user_id)
+    await platform_service.resolve_ids(db, user_id, ["Netflix", "hulu", "No Such Platform"])
+
+
+async def _auth(db, user_id):
+    await user_service.get_by_email(db, "bench0@example.com")
+
+
+async def _export(db, user_id):
+    async for _ in watchlist_service.export_chunks(db, user_id, "ndjson"):
+        pass
+
+
+READ_PATHS = {
+    "listing": _listing,
+    "search": _search,
+    "discovery": _discovery,
+    "insights": _insights,
+    "insights_batch": _insights_batch,
+    "sync": _sync,
+    "platforms": _platforms,
+    "auth": _auth,
+    "export": _export,
+}
+
+
+@pytest.fixture(scope="module")
+async def user_id():
+    await seed(SeedConfig(users=3, min_items=50, max_items=500, seed=7))
+    # Status history, so the insights subqueries have events to read
+    now = datetime.now(timezone.utc)
+    async with AsyncSessionLocal() as db:
+        platforms = (await db.execute(select(Platform.id, Platform.user_id))).all()
+        await db.execute(
+            insert(WatchlistEvent),
+            [
+                {
+                    "user_id": owner,
+                    "item_id": n,
+                    "platform_id": platform_id,
+                    "status": n % 3,
+                    "occurred_at": now - timedelta(days=n),
+                }
+                for platform_id, owner in platforms
+                for n in range(40)
+            ],
+        )
+        await db.commit()
+        user = await user_service.get_by_email(db, "bench0@example.com")
+    return user.id
+
+
+def _plan(statement: str, parameters) -> list[str]:
+    with sqlite3.connect(engine.url.database) as conn:
+        return [row[3] for row in conn.execute("EXPLAIN QUERY PLAN " + statement, parameters)]
+
+
+@pytest.mark.parametrize("path", list(READ_PATHS))
+async def test_reads_use_indexes(path, user_id):
+    statements: list[tuple[str, tuple]] = []
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        if statement.lstrip().upper().startswith("SELECT"):
+            statements.append((statement, parameters))
+
+    engines = {engine.sync_engine, read_engine.sync_engine}
+    for e in engines:
+        event.listen(e, "before_cursor_execute", record)
+    try:
+        async with AsyncSessionLocal() as db:
+            await READ_PATHS[path](db, user_id)
+    finally:
+        for e in engines:
+            event.remove(e, "before_cursor_execute", record)
+
+    assert statements
+    for statement, parameters in statements:
+        plan = _plan(statement, parameters)
+        bad = [step for step in plan if _FULL_SCAN.search(step) or _TEMP_SORT in step]
+        assert not bad, f"{' '.join(statement.split())}\n" + "\n".join(plan)